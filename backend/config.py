@@ -21,6 +21,46 @@ class Settings(BaseSettings):
     
     # Currency API
     currency_api_url: str = os.getenv("CURRENCY_API_URL", "https://api.exchangerate-api.com/v4/latest/USD")
+    rate_history_path: str = os.getenv("RATE_HISTORY_PATH", "data/rate_history.bin")
+    rate_history_days: int = int(os.getenv("RATE_HISTORY_DAYS", "730"))
+    
+    # AI response caching
+    cache_ttl_seconds: int = int(os.getenv("CACHE_TTL_SECONDS", "86400"))
+    cache_max_entries: int = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    cache_max_stale_seconds: int = int(os.getenv("CACHE_MAX_STALE_SECONDS", "604800"))
+    snapshot_path: str = os.getenv("SNAPSHOT_PATH", "data/guides_snapshot.bin")
+    draft_timeout_seconds: float = float(os.getenv("DRAFT_TIMEOUT_SECONDS", "2"))
+    
+    # Background jobs
+    job_workers: int = int(os.getenv("JOB_WORKERS", "2"))
+    job_queue_size: int = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+    job_result_ttl_seconds: int = int(os.getenv("JOB_RESULT_TTL_SECONDS", "3600"))
+    
+    # Itinerary generation
+    itinerary_shard_days: int = int(os.getenv("ITINERARY_SHARD_DAYS", "2"))
+    itinerary_shard_concurrency: int = int(os.getenv("ITINERARY_SHARD_CONCURRENCY", "4"))
+    itinerary_store_ttl_seconds: int = int(os.getenv("ITINERARY_STORE_TTL_SECONDS", "604800"))
+    itinerary_budget_band: float = float(os.getenv("ITINERARY_BUDGET_BAND", "0.3"))
+    
+    # Translation
+    translation_memory_path: str = os.getenv("TRANSLATION_MEMORY_PATH", "data/translation_memory.db")
+    translation_memory_max_entries: int = int(os.getenv("TRANSLATION_MEMORY_MAX_ENTRIES", "200000"))
+    translation_memory_fuzzy_threshold: float = float(os.getenv("TRANSLATION_MEMORY_FUZZY_THRESHOLD", "0.7"))
+    translation_batch_max_tokens: int = int(os.getenv("TRANSLATION_BATCH_MAX_TOKENS", "1500"))
+    translation_batch_max_items: int = int(os.getenv("TRANSLATION_BATCH_MAX_ITEMS", "50"))
+    translation_batch_window_ms: float = float(os.getenv("TRANSLATION_BATCH_WINDOW_MS", "20"))
+    language_detect_min_confidence: float = float(os.getenv("LANGUAGE_DETECT_MIN_CONFIDENCE", "0.98"))
+    
+    # Flight deals
+    flight_deals_ttl_seconds: int = int(os.getenv("FLIGHT_DEALS_TTL_SECONDS", "21600"))
+    flight_deals_max_stale_seconds: int = int(os.getenv("FLIGHT_DEALS_MAX_STALE_SECONDS", "86400"))
+    
+    # Calendar
+    calendar_store_ttl_seconds: int = int(os.getenv("CALENDAR_STORE_TTL_SECONDS", "2592000"))
+    reminder_db_path: str = os.getenv("REMINDER_DB_PATH", "data/reminders.db")
+    reminder_sink: str = os.getenv("REMINDER_SINK", "file")  # "file" or "webhook"
+    reminder_sink_path: str = os.getenv("REMINDER_SINK_PATH", "data/reminders.log")
+    reminder_webhook_url: str = os.getenv("REMINDER_WEBHOOK_URL", "")
     
     class Config:
         env_file = ".env"
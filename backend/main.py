@@ -1,12 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from config import settings
+from services.snapshot_store import snapshot_store
+from services.job_service import job_service
+from services.reminder_service import reminder_service
+from services.flight_service import flight_service
+from services.translation_memory import translation_memory
 
 # Import routers
 from routers import (
     relocation, culture, language, voice, currency, documents, packing,
     survival_plan, accommodation, rental_housing, itinerary, first_hours,
-    arrival_tasks, flights, calendar
+    arrival_tasks, flights, calendar, jobs
 )
 
 app = FastAPI(
@@ -55,6 +60,39 @@ app.include_router(first_hours.router)
 app.include_router(arrival_tasks.router)
 app.include_router(flights.router)
 app.include_router(calendar.router)
+app.include_router(jobs.router)
+
+# -------------------------
+# STARTUP
+# -------------------------
+
+@app.on_event("startup")
+async def load_snapshot():
+    # Precomputed guides (see precompute.py) keep caches warm right after a deploy
+    snapshot_store.load(settings.snapshot_path)
+    flight_service.load_content()
+
+@app.on_event("startup")
+async def load_translation_memory():
+    translation_memory.load()
+
+@app.on_event("startup")
+async def start_reminders():
+    # Recover pending reminders persisted before the last restart
+    await reminder_service.start()
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    await job_service.stop()
+
+@app.on_event("shutdown")
+async def stop_reminders():
+    await reminder_service.stop()
+
+@app.on_event("shutdown")
+async def flush_translation_memory():
+    # Write translations still queued for the store
+    await translation_memory.flush()
 
 # -------------------------
 # HEALTH ENDPOINTS
@@ -90,5 +128,6 @@ async def health_check():
     return {
         "status": "healthy",
         "gemini_configured": bool(settings.gemini_api_key),
-        "firebase_configured": bool(settings.firebase_project_id)
+        "firebase_configured": bool(settings.firebase_project_id),
+        "snapshot_records": len(snapshot_store)
     }
@@ -9,6 +9,8 @@ class AccommodationRequest(BaseModel):
     budget_max: float
     duration_days: int = None
     preferences: List[str] = []  # ["vegetarian", "quiet", "near_university", etc.]
+    page: int = 1
+    page_size: int = 5
 
 class AccommodationOption(BaseModel):
     name: str
@@ -16,6 +18,7 @@ class AccommodationOption(BaseModel):
     area: str
     price_range: str
     cost_per_night: str  # "$50-70"
+    nightly_price: Optional[float] = None  # Typical USD per night, used for budget filtering
     star_rating: Optional[str] = None  # "3-star", "4-star", etc.
     amenities: List[str]  # ["wifi", "breakfast", "gym", "pool"]
     nearby_attractions: List[str]  # ["museum", "shopping mall", "beach"]
@@ -35,3 +38,6 @@ class AccommodationResponse(BaseModel):
     general_tips: List[str]
     scam_warnings: List[str]
     area_safety_info: str
+    total_results: Optional[int] = None  # Matches across all pages
+    page: int = 1
+    page_size: Optional[int] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 class CurrencyConversionRequest(BaseModel):
     amount: float
@@ -25,3 +25,13 @@ class MoneyAdviceResponse(BaseModel):
     exchange_tips: str
     local_money_habits: str
     estimated_daily_budget: str
+
+class RateHistoryResponse(BaseModel):
+    base_currency: str
+    target_currency: str
+    dates: List[str]  # ISO dates, oldest first
+    rates: List[float]  # Units of target currency per 1 base currency
+    mean_rate: float
+    min_rate: float
+    max_rate: float
+    change_percent: float  # From the first to the last day shown
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 class ItineraryRequest(BaseModel):
     destination_country: str
@@ -35,3 +35,7 @@ class ItineraryResponse(BaseModel):
     total_estimated_cost: float
     cost_justification: str
     money_saving_tips: List[str]
+    itinerary_id: Optional[str] = None  # Set when the itinerary is stored for later edits
+
+class DayRegenerateRequest(BaseModel):
+    instructions: Optional[str] = None  # e.g. "more museums, less walking"
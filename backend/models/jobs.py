@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import Optional, Dict, Any
+
+class JobStatus(BaseModel):
+    job_id: str
+    kind: str
+    status: str  # "queued", "running", "done", "failed"
+    created_at: float
+    updated_at: float
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
@@ -12,6 +12,16 @@ class TranslationResponse(BaseModel):
     source_language: str
     target_language: str
 
+class BatchTranslationRequest(BaseModel):
+    texts: List[str]
+    source_language: str
+    target_language: str
+
+class BatchTranslationResponse(BaseModel):
+    translations: List[TranslationResponse]  # Same order as the request texts
+    source_language: str
+    target_language: str
+
 class LanguagePhraseCategory(BaseModel):
     category: str
     phrases: List[Dict[str, str]]  # [{"english": "Hello", "local": "Hola"}]
@@ -19,3 +19,8 @@ class RelocationPlan(BaseModel):
     timeline_description: str
     common_mistakes: List[str]
     country_specific_rules: List[str]
+
+class ProgressiveRelocationPlan(BaseModel):
+    plan: RelocationPlan
+    quality: str  # "draft" (Flash) or "refined" (Pro)
+    refine_job_id: Optional[str] = None  # poll /api/jobs/{id} for the refined plan
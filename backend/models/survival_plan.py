@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 class SurvivalPlanRequest(BaseModel):
     home_country: str
@@ -20,3 +20,8 @@ class SurvivalPlanResponse(BaseModel):
     week_4: WeekPlan
     overview: str
     emergency_contacts: List[str]
+
+class ProgressiveSurvivalPlan(BaseModel):
+    plan: SurvivalPlanResponse
+    quality: str  # "draft" (Flash) or "refined" (Pro)
+    refine_job_id: Optional[str] = None  # poll /api/jobs/{id} for the refined plan
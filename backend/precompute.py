@@ -0,0 +1,123 @@
+"""
+Pre-generate guides for the most popular destinations and write a snapshot
+that the API memory-maps at startup (see services/snapshot_store.py).
+
+Run from the backend directory:
+    python precompute.py --top 10 --output data/guides_snapshot.bin
+"""
+import argparse
+import asyncio
+import time
+
+from config import settings
+from services.canonical_registry import canonical_registry
+from services.cultural_guide import cultural_guide_service
+from services.language_service import language_service
+from services.rental_housing_service import rental_housing_service
+from services.arrival_tasks_service import arrival_tasks_service
+from services.first_hours_service import first_hours_service
+from services.flight_service import flight_service, STATIC_CONTENT
+from services.snapshot_store import write_snapshot
+
+# (country, main city) ordered by traffic
+TOP_DESTINATIONS = [
+    ("Germany", "Berlin"),
+    ("United States", "New York"),
+    ("United Kingdom", "London"),
+    ("Canada", "Toronto"),
+    ("Australia", "Sydney"),
+    ("France", "Paris"),
+    ("Netherlands", "Amsterdam"),
+    ("Ireland", "Dublin"),
+    ("Japan", "Tokyo"),
+    ("Singapore", "Singapore"),
+    ("United Arab Emirates", "Dubai"),
+    ("Spain", "Madrid"),
+    ("Italy", "Rome"),
+    ("Sweden", "Stockholm"),
+    ("New Zealand", "Auckland"),
+    ("South Korea", "Seoul"),
+    ("Switzerland", "Zurich"),
+    ("Portugal", "Lisbon"),
+    ("Poland", "Warsaw"),
+    ("Thailand", "Bangkok"),
+]
+
+DEFAULT_PURPOSES = ["Work", "Study", "Travel"]
+ARRIVAL_TIMES = ["daytime", "evening", "night"]
+
+SNAPSHOT_CACHES = [
+    cultural_guide_service._cache,
+    language_service._phrase_cache,
+    rental_housing_service._cache,
+    arrival_tasks_service._cache,
+    first_hours_service._cache,
+    flight_service._tips_cache,
+]
+
+
+def build_jobs(destinations, purposes):
+    """List the service calls to warm, using the same canonical inputs as the routers"""
+    jobs = []
+    for country, city in destinations:
+        country = canonical_registry.country(country)
+        language = canonical_registry.language_for_country(country) or "English"
+        jobs.append(lambda c=country: cultural_guide_service.get_cultural_guide(c, "all"))
+        jobs.append(lambda c=country, l=language: language_service.get_basic_phrases(c, l))
+        jobs.append(lambda c=country: rental_housing_service.get_rental_guide(c, None))
+        jobs.append(lambda c=country, ci=city: rental_housing_service.get_rental_guide(c, ci))
+        for purpose in purposes:
+            jobs.append(lambda c=country, p=purpose: arrival_tasks_service.get_arrival_tasks(c, p))
+        jobs.append(lambda c=country: flight_service.get_booking_tips(c, "relocation"))
+        for arrival_time in ARRIVAL_TIMES:
+            jobs.append(lambda c=country, t=arrival_time: first_hours_service.generate_checklist(c, None, t))
+    return jobs
+
+
+async def run(top: int, purposes, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    jobs = build_jobs(TOP_DESTINATIONS[:top], purposes)
+    done = 0
+
+    async def run_job(job):
+        nonlocal done
+        async with semaphore:
+            await job()
+        done += 1
+        print(f"  [{done}/{len(jobs)}] done")
+
+    await asyncio.gather(*(run_job(job) for job in jobs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute guides for the top destinations")
+    parser.add_argument("--top", type=int, default=10, help="number of destinations to precompute")
+    parser.add_argument("--output", default=settings.snapshot_path, help="snapshot file to write")
+    parser.add_argument("--purposes", nargs="+", default=DEFAULT_PURPOSES, help="purposes for arrival tasks")
+    parser.add_argument("--concurrency", type=int, default=4, help="parallel Gemini requests")
+    parser.add_argument("--version", default=time.strftime("%Y%m%d-%H%M%S"), help="content version label")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"PRECOMPUTING GUIDES FOR TOP {args.top} DESTINATIONS")
+    print("=" * 60)
+
+    started = time.time()
+    asyncio.run(run(args.top, args.purposes, args.concurrency))
+
+    # Fallbacks are never cached, so only real AI output ends up in the snapshot
+    entries = [
+        (f"{cache.name}:{key}", value)
+        for cache in SNAPSHOT_CACHES
+        for key, value, _ in cache.items()
+    ]
+    entries += [(f"flight_content:{name}", content) for name, content in STATIC_CONTENT.items()]
+    count = write_snapshot(args.output, entries, content_version=args.version)
+
+    print()
+    print(f"✅ Wrote {count} records to {args.output} in {time.time() - started:.1f}s")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
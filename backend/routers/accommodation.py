@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from models.accommodation import AccommodationRequest, AccommodationResponse
 from services.accommodation_service import accommodation_service
+from services.canonical_registry import canonical_registry, clean_text
 
 router = APIRouter(
     prefix="/api/accommodation",
@@ -14,13 +15,15 @@ async def find_accommodation(request: AccommodationRequest):
     """Find accommodation recommendations for travelers or students"""
     try:
         return await accommodation_service.find_accommodation(
-            destination_country=request.destination_country,
-            city=request.city,
+            destination_country=canonical_registry.country(request.destination_country),
+            city=clean_text(request.city),
             user_type=request.user_type,
             budget_min=request.budget_min,
             budget_max=request.budget_max,
             duration_days=request.duration_days,
-            preferences=request.preferences
+            preferences=request.preferences,
+            page=request.page,
+            page_size=request.page_size
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
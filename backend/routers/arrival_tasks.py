@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from models.arrival_tasks import ArrivalTasksRequest, ArrivalTasksResponse
 from services.arrival_tasks_service import arrival_tasks_service
+from services.canonical_registry import canonical_registry
 
 router = APIRouter(
     prefix="/api/arrival-tasks",
@@ -12,7 +13,7 @@ async def get_arrival_tasks(request: ArrivalTasksRequest):
     """Get categorized post-arrival tasks"""
     try:
         return await arrival_tasks_service.get_arrival_tasks(
-            destination_country=request.destination_country,
+            destination_country=canonical_registry.country(request.destination_country),
             purpose=request.purpose
         )
     except Exception as e:
@@ -1,38 +1,16 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List
-from datetime import datetime, timedelta
-from services.gemini_service import gemini_service
-import json
-import re
+from datetime import datetime
+from services.canonical_registry import canonical_registry
+from services.calendar_service import calendar_service
+from services.timeline_service import timeline_service
+from services.ics_export import ics_stream
+from services.reminder_service import reminder_service
 
 router = APIRouter(prefix="/api/calendar", tags=["Smart Calendar"])
 
-def extract_json_from_text(text: str) -> dict:
-    """Extract JSON from AI response text"""
-    try:
-        # Try direct JSON parse first
-        return json.loads(text)
-    except:
-        # Extract JSON from markdown code blocks
-        json_match = re.search(r'```(?:json)?\s*(\{.*\})\s*```', text, re.DOTALL)
-        if json_match:
-            try:
-                return json.loads(json_match.group(1))
-            except:
-                pass
-
-        # Extract JSON from text
-        json_match = re.search(r'\{.*\}', text, re.DOTALL)
-        if json_match:
-            try:
-                return json.loads(json_match.group(0))
-            except:
-                pass
-
-    # Return fallback structure
-    return {"error": "Could not parse JSON", "raw_text": text}
-
 class TimelineRequest(BaseModel):
     destination: str
     departureDate: Optional[str] = None
@@ -49,147 +27,110 @@ class CalendarEventsRequest(BaseModel):
 @router.post("/timeline")
 async def get_relocation_timeline(request: TimelineRequest):
     """Generate a comprehensive relocation timeline with all important tasks and dates"""
+    request.destination = canonical_registry.location(request.destination)
 
-    # Calculate timeline if departure date is provided
-    timeline_info = ""
+    # The model only supplies the task graph; dates, critical path and phases are
+    # computed locally, so changing the departure date never needs a new generation
+    departure = None
     if request.departureDate:
         try:
-            departure = datetime.fromisoformat(request.departureDate)
-            today = datetime.now()
-            days_until = (departure - today).days
-
-            timeline_info = f"""
-            Departure Date: {request.departureDate}
-            Days Until Departure: {days_until}
-            Today's Date: {today.strftime('%Y-%m-%d')}
-            """
-        except:
-            timeline_info = "Departure date format invalid, using flexible timeline"
-
-    prompt = f"""
-    As a relocation planning expert, create a comprehensive timeline for someone relocating to {request.destination}.
-
-    {timeline_info}
-    Visa Type: {request.visaType or 'Not specified'}
-    Relocation Type: {request.relocationType}
-
-    Provide a JSON response with:
-    {{
-        "tasks": [
-            {{
-                "id": unique_id,
-                "title": "task title",
-                "description": "detailed description",
-                "date": "YYYY-MM-DD",
-                "priority": "high/medium/low",
-                "category": "visa/housing/finance/health/logistics/etc",
-                "estimatedDuration": "time needed to complete",
-                "dependencies": ["task IDs this depends on"],
-                "completed": false,
-                "type": "system"
-            }}
-        ],
-        "milestones": [
-            {{
-                "name": "milestone name",
-                "date": "YYYY-MM-DD",
-                "importance": "critical/important/nice-to-have"
-            }}
-        ],
-        "phases": [
-            {{
-                "name": "phase name (e.g., Planning, Preparation, Final Week)",
-                "startDate": "YYYY-MM-DD",
-                "endDate": "YYYY-MM-DD",
-                "focus": "what to focus on during this phase"
-            }}
-        ],
-        "tips": [
-            "Timeline management tips"
-        ]
-    }}
-
-    Create a realistic timeline with 15-20 tasks covering:
-    - Visa application process
-    - Flight booking
-    - Accommodation arrangements
-    - Financial preparations (bank, insurance)
-    - Health requirements (vaccinations, health insurance)
-    - Document preparation
-    - Packing and shipping
-    - Saying goodbye
-    - Final preparations
-    - Departure day tasks
-
-    Space tasks appropriately based on the departure date and visa processing times for {request.destination}.
-    """
+            departure = datetime.fromisoformat(request.departureDate).date()
+        except ValueError:
+            # Departure date format invalid, using flexible timeline
+            departure = None
 
     try:
-        response = await gemini_service.generate_response(prompt)
-        parsed_data = extract_json_from_text(response)
-        return {"data": parsed_data}
+        data = await timeline_service.get_timeline(
+            request.destination, departure, request.visaType, request.relocationType
+        )
+        data["timelineId"] = calendar_service.save("timeline", data)
+        return {"data": data}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/generate-events")
 async def generate_calendar_events(request: CalendarEventsRequest):
     """Generate calendar events including holidays, weather patterns, and important dates"""
+    request.destination = canonical_registry.location(request.destination)
 
-    prompt = f"""
-    As a travel and cultural expert, provide important calendar information for {request.destination}
-    between {request.startDate} and {request.endDate}.
-
-    Provide a JSON response with:
-    {{
-        "holidays": [
-            {{
-                "name": "holiday name",
-                "date": "YYYY-MM-DD",
-                "type": "public/religious/cultural",
-                "description": "brief description",
-                "impact": "how it affects daily life/businesses"
-            }}
-        ],
-        "weather": {{
-            "season": "season name",
-            "averageTemp": "temperature range",
-            "rainfall": "rainfall info",
-            "recommendations": ["what to prepare for weather-wise"]
-        }},
-        "culturalEvents": [
-            {{
-                "name": "event name",
-                "date": "YYYY-MM-DD",
-                "description": "brief description",
-                "recommendedForNewcomers": true/false
-            }}
-        ],
-        "importantDates": [
-            {{
-                "name": "important date (tax deadlines, registration periods, etc)",
-                "date": "YYYY-MM-DD",
-                "category": "administrative/legal/social",
-                "priority": "high/medium/low"
-            }}
-        ]
-    }}
-
-    Include all major holidays, cultural festivals, and important administrative dates for the destination.
-    """
+    try:
+        start = datetime.fromisoformat(request.startDate).date()
+        end = datetime.fromisoformat(request.endDate).date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="startDate and endDate must be YYYY-MM-DD")
 
     try:
-        response = await gemini_service.generate_response(prompt)
-        parsed_data = extract_json_from_text(response)
-        return {"data": parsed_data}
+        data = await calendar_service.generate_events(
+            request.destination, start, end,
+            include_holidays=request.includeHolidays,
+            include_weather=request.includeWeather
+        )
+        data["eventsId"] = calendar_service.save("events", data)
+        return {"data": data}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/export.ics")
+async def export_calendar(request: Request, timelineId: Optional[str] = None, eventsId: Optional[str] = None):
+    """
+    Export a stored timeline and/or event set as an iCalendar feed.
+    Tasks become VTODOs; milestones, holidays and events become all-day VEVENTs.
+    Supports If-None-Match so polling calendar apps get 304 Not Modified.
+    """
+    if not timelineId and not eventsId:
+        raise HTTPException(status_code=400, detail="Provide timelineId and/or eventsId")
+
+    timeline = calendar_service.load("timeline", timelineId) if timelineId else None
+    events = calendar_service.load("events", eventsId) if eventsId else None
+    if (timelineId and timeline is None) or (eventsId and events is None):
+        raise HTTPException(status_code=404, detail="Timeline or events not found or expired")
+
+    # Ids are content hashes, so together they identify the feed content
+    etag = f'"{timelineId or "-"}.{eventsId or "-"}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=300"}
+    if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    created_at = max(record[1] for record in (timeline, events) if record)
+    headers["Content-Disposition"] = 'attachment; filename="visaverse-relocation-calendar.ics"'
+    return StreamingResponse(
+        ics_stream(timeline[0] if timeline else None, events[0] if events else None, created_at, f"{timelineId or eventsId}.visaverse"),
+        media_type="text/calendar; charset=utf-8",
+        headers=headers
+    )
+
 @router.post("/reminders")
 async def set_task_reminders(task_id: str, reminder_date: str, reminder_type: str = "email"):
-    """Set reminders for specific tasks (placeholder for future implementation)"""
+    """Schedule a reminder for a task; it is delivered when reminder_date (ISO date or datetime) is reached"""
+    try:
+        fire_at = datetime.fromisoformat(reminder_date).timestamp()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="reminder_date must be an ISO date or datetime")
+
+    try:
+        reminder = await reminder_service.schedule(task_id, fire_at, reminder_type)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
     return {
         "status": "success",
         "message": f"Reminder set for task {task_id} on {reminder_date} via {reminder_type}",
-        "note": "Email/SMS integration coming soon"
+        "reminder": reminder
     }
+
+@router.get("/reminders/{reminder_id}")
+async def get_task_reminder(reminder_id: str):
+    """Get a reminder and its delivery status"""
+    reminder = await reminder_service.get(reminder_id)
+    if reminder is None:
+        raise HTTPException(status_code=404, detail="Reminder not found")
+    return reminder
+
+@router.delete("/reminders/{reminder_id}")
+async def cancel_task_reminder(reminder_id: str):
+    """Cancel a pending reminder"""
+    if not await reminder_service.cancel(reminder_id):
+        raise HTTPException(status_code=404, detail="Reminder not found or no longer pending")
+    return {"status": "cancelled", "reminder_id": reminder_id}
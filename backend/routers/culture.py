@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from models.culture import CultureRequest, CultureGuide
 from services.cultural_guide import cultural_guide_service
+from services.canonical_registry import canonical_registry
 
 router = APIRouter(prefix="/api/culture", tags=["Cultural Guide"])
 
@@ -13,7 +14,7 @@ async def get_culture_guide(request: CultureRequest):
     """
     try:
         guide = await cultural_guide_service.get_cultural_guide(
-            country=request.country,
+            country=canonical_registry.country(request.country),
             category=request.category
         )
         return guide
@@ -3,9 +3,11 @@ from models.currency import (
     CurrencyConversionRequest, 
     CurrencyConversionResponse,
     MoneyAdviceRequest,
-    MoneyAdviceResponse
+    MoneyAdviceResponse,
+    RateHistoryResponse
 )
 from services.currency_service import currency_service
+from services.canonical_registry import canonical_registry
 
 router = APIRouter(prefix="/api/currency", tags=["Currency Assistant"])
 
@@ -18,8 +20,8 @@ async def convert_currency(request: CurrencyConversionRequest):
     try:
         conversion = await currency_service.convert_currency(
             amount=request.amount,
-            from_currency=request.from_currency,
-            to_currency=request.to_currency
+            from_currency=canonical_registry.currency(request.from_currency),
+            to_currency=canonical_registry.currency(request.to_currency)
         )
         return conversion
     except Exception as e:
@@ -33,9 +35,27 @@ async def get_money_advice(request: MoneyAdviceRequest):
     """
     try:
         advice = await currency_service.get_money_advice(
-            destination_country=request.destination_country,
+            destination_country=canonical_registry.country(request.destination_country),
             duration_days=request.duration_days
         )
         return advice
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/history", response_model=RateHistoryResponse)
+async def get_rate_history(base: str = "USD", target: str = "EUR", days: int = 30):
+    """
+    Get recorded daily exchange rates between two currencies.
+    Includes mean, min, max and percent change over the period.
+    """
+    try:
+        history = await currency_service.get_rate_history(
+            base_currency=canonical_registry.currency(base),
+            target_currency=canonical_registry.currency(target),
+            days=days
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if history is None:
+        raise HTTPException(status_code=404, detail="No rate history recorded for this currency pair yet")
+    return history
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from models.first_hours import FirstHoursRequest, FirstHoursResponse
 from services.first_hours_service import first_hours_service
+from services.canonical_registry import canonical_registry, clean_text
 
 router = APIRouter(
     prefix="/api/first-hours",
@@ -12,8 +13,8 @@ async def get_first_hours_checklist(request: FirstHoursRequest):
     """Get first 48 hours checklist"""
     try:
         return await first_hours_service.generate_checklist(
-            destination_country=request.destination_country,
-            city=request.city,
+            destination_country=canonical_registry.country(request.destination_country),
+            city=clean_text(request.city),
             arrival_time=request.arrival_time
         )
     except Exception as e:
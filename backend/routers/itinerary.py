@@ -1,6 +1,9 @@
 from fastapi import APIRouter, HTTPException
-from models.itinerary import ItineraryRequest, ItineraryResponse
+from fastapi.responses import StreamingResponse
+from models.itinerary import ItineraryRequest, ItineraryResponse, DayPlan, DayRegenerateRequest
 from services.itinerary_service import itinerary_service
+from services.canonical_registry import canonical_registry, clean_text
+import json
 
 router = APIRouter(
     prefix="/api/itinerary",
@@ -12,8 +15,8 @@ async def generate_itinerary(request: ItineraryRequest):
     """Generate travel itinerary with budget breakdown"""
     try:
         return await itinerary_service.generate_itinerary(
-            destination_country=request.destination_country,
-            city=request.city,
+            destination_country=canonical_registry.country(request.destination_country),
+            city=clean_text(request.city),
             duration_days=request.duration_days,
             total_budget=request.total_budget,
             travel_style=request.travel_style,
@@ -21,3 +24,52 @@ async def generate_itinerary(request: ItineraryRequest):
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/generate/stream")
+async def stream_itinerary(request: ItineraryRequest):
+    """Stream the itinerary as newline-delimited JSON, one day per line, then the budget summary"""
+    events = itinerary_service.stream_itinerary(
+        destination_country=canonical_registry.country(request.destination_country),
+        city=clean_text(request.city),
+        duration_days=request.duration_days,
+        total_budget=request.total_budget,
+        travel_style=request.travel_style,
+        interests=request.interests
+    )
+
+    async def ndjson():
+        try:
+            async for event in events:
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            print(f"Error streaming itinerary: {e}")
+            yield json.dumps({"type": "error", "detail": str(e)}) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+@router.get("/{itinerary_id}", response_model=ItineraryResponse)
+async def get_itinerary(itinerary_id: str):
+    """Get a stored itinerary by id"""
+    itinerary = itinerary_service.get_itinerary(itinerary_id)
+    if itinerary is None:
+        raise HTTPException(status_code=404, detail="Itinerary not found or expired")
+    return itinerary
+
+@router.post("/{itinerary_id}/days/{day_number}/regenerate", response_model=ItineraryResponse)
+async def regenerate_day(itinerary_id: str, day_number: int, request: DayRegenerateRequest):
+    """Regenerate a single day, keeping the other days and recalculating the budget"""
+    try:
+        itinerary = await itinerary_service.regenerate_day(itinerary_id, day_number, request.instructions)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if itinerary is None:
+        raise HTTPException(status_code=404, detail="Itinerary or day not found")
+    return itinerary
+
+@router.put("/{itinerary_id}/days/{day_number}", response_model=ItineraryResponse)
+async def update_day(itinerary_id: str, day_number: int, day: DayPlan):
+    """Replace a single day with an edited version and recalculate the budget"""
+    itinerary = itinerary_service.update_day(itinerary_id, day_number, day)
+    if itinerary is None:
+        raise HTTPException(status_code=404, detail="Itinerary or day not found")
+    return itinerary
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from models.jobs import JobStatus
+from services.job_service import job_service
+import asyncio
+
+router = APIRouter(prefix="/api/jobs", tags=["Background Jobs"])
+
+@router.get("/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    """Poll the status of a background job; the result is included once it is done"""
+    job = job_service.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job.to_status()
+
+@router.get("/{job_id}/events")
+async def stream_job(job_id: str):
+    """
+    Subscribe to a background job over Server-Sent Events.
+    Emits the job status on every change and closes once the job is done or failed.
+    """
+    job = job_service.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+
+    async def event_stream():
+        while True:
+            # Capture the version before yielding: the job may change while the client reads
+            version = job.version
+            yield f"data: {job.to_status().model_dump_json()}\n\n"
+            if job.finished:
+                break
+            # Keep proxies from closing an idle connection
+            while not await job.wait_for_change(version, timeout=15):
+                yield ": keepalive\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+async def submit_job(kind: str, params: dict) -> JobStatus:
+    """Submit a job, translating a full queue into 503 so clients back off"""
+    try:
+        job = await job_service.submit(kind, params)
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Too many pending jobs, please retry shortly")
+    return job.to_status()
@@ -1,10 +1,16 @@
 from fastapi import APIRouter, HTTPException
-from models.language import TranslationRequest, TranslationResponse, LanguageLearningResponse
+from models.language import (
+    TranslationRequest, TranslationResponse, BatchTranslationRequest, BatchTranslationResponse,
+    LanguageLearningResponse
+)
 from services.language_service import language_service
+from services.canonical_registry import canonical_registry
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/api/language", tags=["Language & Translation"])
 
+MAX_BATCH_TEXTS = 500
+
 @router.post("/translate", response_model=TranslationResponse)
 async def translate_text(request: TranslationRequest):
     """
@@ -14,13 +20,34 @@ async def translate_text(request: TranslationRequest):
     try:
         translation = await language_service.translate_text(
             text=request.text,
-            source_language=request.source_language,
-            target_language=request.target_language
+            source_language=canonical_registry.language(request.source_language),
+            target_language=canonical_registry.language(request.target_language)
         )
         return translation
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/translate/batch", response_model=BatchTranslationResponse)
+async def translate_batch(request: BatchTranslationRequest):
+    """
+    Translate a list of strings in one request.
+    Strings are packed into as few model calls as possible and returned in request order.
+    """
+    if len(request.texts) > MAX_BATCH_TEXTS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_TEXTS} texts per batch")
+
+    source_language = canonical_registry.language(request.source_language)
+    target_language = canonical_registry.language(request.target_language)
+    try:
+        translations = await language_service.translate_batch(request.texts, source_language, target_language)
+        return BatchTranslationResponse(
+            translations=translations,
+            source_language=source_language,
+            target_language=target_language
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 class LanguageRequest(BaseModel):
     country: str
     language: str
@@ -33,8 +60,8 @@ async def get_basic_phrases(request: LanguageRequest):
     """
     try:
         phrases = await language_service.get_basic_phrases(
-            country=request.country,
-            language=request.language
+            country=canonical_registry.country(request.country),
+            language=canonical_registry.language(request.language)
         )
         return phrases
     except Exception as e:
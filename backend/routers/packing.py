@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from models.packing import PackingRequest, PackingList
 from services.packing_service import packing_service
+from services.canonical_registry import canonical_registry
 
 router = APIRouter(prefix="/api/packing", tags=["Packing Essentials"])
 
@@ -13,8 +14,8 @@ async def get_packing_list(request: PackingRequest):
     """
     try:
         packing_list = await packing_service.generate_packing_list(
-            home_country=request.home_country,
-            destination_country=request.destination_country,
+            home_country=canonical_registry.country(request.home_country),
+            destination_country=canonical_registry.country(request.destination_country),
             duration_days=request.duration_days,
             purpose=request.purpose
         )
@@ -1,6 +1,11 @@
 from fastapi import APIRouter, HTTPException
-from models.relocation import RelocationRequest, RelocationPlan
-from services.relocation_planner import relocation_planner_service
+from models.relocation import RelocationRequest, RelocationPlan, ProgressiveRelocationPlan
+from models.jobs import JobStatus
+from services.relocation_planner import relocation_planner_service, DRAFT
+from services.canonical_registry import canonical_registry
+from services.job_service import job_service
+from routers.jobs import submit_job
+import asyncio
 
 router = APIRouter(prefix="/api/relocation", tags=["Relocation Planner"])
 
@@ -12,10 +17,60 @@ async def get_relocation_plan(request: RelocationRequest):
     """
     try:
         plan = await relocation_planner_service.generate_relocation_plan(
-            home_country=request.home_country,
-            destination_country=request.destination_country,
+            home_country=canonical_registry.country(request.home_country),
+            destination_country=canonical_registry.country(request.destination_country),
             purpose=request.purpose
         )
         return plan
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+async def _run_relocation_plan_job(home_country: str, destination_country: str, purpose: str) -> dict:
+    plan = await relocation_planner_service.generate_relocation_plan(
+        home_country=home_country,
+        destination_country=destination_country,
+        purpose=purpose,
+        strict=True
+    )
+    return plan.model_dump()
+
+job_service.register("relocation_plan", _run_relocation_plan_job)
+
+@router.post("/plan/jobs", response_model=JobStatus, status_code=202)
+async def submit_relocation_plan_job(request: RelocationRequest):
+    """
+    Queue relocation plan generation and return a job id immediately.
+    Poll /api/jobs/{job_id} or subscribe to /api/jobs/{job_id}/events for the result.
+    Retries with the same input attach to the existing job.
+    """
+    return await submit_job("relocation_plan", {
+        "home_country": canonical_registry.country(request.home_country),
+        "destination_country": canonical_registry.country(request.destination_country),
+        "purpose": request.purpose
+    })
+
+
+@router.post("/plan/progressive", response_model=ProgressiveRelocationPlan)
+async def get_progressive_relocation_plan(request: RelocationRequest):
+    """
+    Return a fast Flash-generated draft plan right away.
+    When only a draft is available, a Pro refinement job is queued and its id is
+    returned; the refined plan then replaces the draft in the cache for later users.
+    """
+    params = {
+        "home_country": canonical_registry.country(request.home_country),
+        "destination_country": canonical_registry.country(request.destination_country),
+        "purpose": request.purpose
+    }
+    try:
+        plan, quality = await relocation_planner_service.generate_draft_plan(**params)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    refine_job_id = None
+    if quality == DRAFT:
+        try:
+            refine_job_id = (await job_service.submit("relocation_plan", params)).job_id
+        except asyncio.QueueFull:
+            print("Job queue full; returning draft relocation plan without refinement")
+    return ProgressiveRelocationPlan(plan=plan, quality=quality, refine_job_id=refine_job_id)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from models.rental_housing import RentalHousingRequest, RentalHousingResponse
 from services.rental_housing_service import rental_housing_service
+from services.canonical_registry import canonical_registry, clean_text
 
 router = APIRouter(
     prefix="/api/rental-housing",
@@ -12,8 +13,8 @@ async def get_rental_guide(request: RentalHousingRequest):
     """Get rental housing guidance"""
     try:
         return await rental_housing_service.get_rental_guide(
-            destination_country=request.destination_country,
-            city=request.city
+            destination_country=canonical_registry.country(request.destination_country),
+            city=clean_text(request.city)
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
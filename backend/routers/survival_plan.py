@@ -1,6 +1,11 @@
 from fastapi import APIRouter, HTTPException
-from models.survival_plan import SurvivalPlanRequest, SurvivalPlanResponse
-from services.survival_plan_service import survival_plan_service
+from models.survival_plan import SurvivalPlanRequest, SurvivalPlanResponse, ProgressiveSurvivalPlan
+from models.jobs import JobStatus
+from services.survival_plan_service import survival_plan_service, DRAFT
+from services.canonical_registry import canonical_registry
+from services.job_service import job_service
+from routers.jobs import submit_job
+import asyncio
 
 router = APIRouter(
     prefix="/api/survival-plan",
@@ -12,9 +17,58 @@ async def generate_survival_plan(request: SurvivalPlanRequest):
     """Generate 30-day survival plan"""
     try:
         return await survival_plan_service.generate_survival_plan(
-            home_country=request.home_country,
-            destination_country=request.destination_country,
+            home_country=canonical_registry.country(request.home_country),
+            destination_country=canonical_registry.country(request.destination_country),
             purpose=request.purpose
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+async def _run_survival_plan_job(home_country: str, destination_country: str, purpose: str) -> dict:
+    plan = await survival_plan_service.generate_survival_plan(
+        home_country=home_country,
+        destination_country=destination_country,
+        purpose=purpose,
+        strict=True
+    )
+    return plan.model_dump()
+
+job_service.register("survival_plan", _run_survival_plan_job)
+
+@router.post("/generate/jobs", response_model=JobStatus, status_code=202)
+async def submit_survival_plan_job(request: SurvivalPlanRequest):
+    """
+    Queue 30-day survival plan generation and return a job id immediately.
+    Poll /api/jobs/{job_id} or subscribe to /api/jobs/{job_id}/events for the result.
+    """
+    return await submit_job("survival_plan", {
+        "home_country": canonical_registry.country(request.home_country),
+        "destination_country": canonical_registry.country(request.destination_country),
+        "purpose": request.purpose
+    })
+
+
+@router.post("/generate/progressive", response_model=ProgressiveSurvivalPlan)
+async def generate_progressive_survival_plan(request: SurvivalPlanRequest):
+    """
+    Return a fast Flash-generated draft survival plan right away.
+    When only a draft is available, a Pro refinement job is queued and its id is
+    returned; the refined plan then replaces the draft in the cache for later users.
+    """
+    params = {
+        "home_country": canonical_registry.country(request.home_country),
+        "destination_country": canonical_registry.country(request.destination_country),
+        "purpose": request.purpose
+    }
+    try:
+        plan, quality = await survival_plan_service.generate_draft_plan(**params)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    refine_job_id = None
+    if quality == DRAFT:
+        try:
+            refine_job_id = (await job_service.submit("survival_plan", params)).job_id
+        except asyncio.QueueFull:
+            print("Job queue full; returning draft survival plan without refinement")
+    return ProgressiveSurvivalPlan(plan=plan, quality=quality, refine_job_id=refine_job_id)
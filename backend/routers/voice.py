@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from models.voice import VoiceQuery, VoiceResponse
 from services.voice_service import voice_service
+from services.canonical_registry import canonical_registry
 
 router = APIRouter(prefix="/api/voice", tags=["Voice AI"])
 
@@ -13,7 +14,10 @@ async def process_voice_query(request: VoiceQuery):
     """
     try:
         # Extract relocation data from context
-        relocation_data = request.context or {}
+        relocation_data = dict(request.context or {})
+        for key in ("homeCountry", "destinationCountry"):
+            if isinstance(relocation_data.get(key), str):
+                relocation_data[key] = canonical_registry.country(relocation_data[key])
         session_id = request.user_id or "anonymous"
         
         # Call the service
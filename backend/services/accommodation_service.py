@@ -1,9 +1,27 @@
 from services.gemini_service import gemini_service
+from services.cache_service import StaleWhileRevalidateCache, make_cache_key, parse_json_response
+from services.cost_of_living import cost_of_living_service
 from models.accommodation import AccommodationResponse, AccommodationOption
-from typing import List
-import json
+from config import settings
+from typing import Any, Dict, List, Optional
+import re
+
+POOL_SIZE = 15
+DEFAULT_PAGE_SIZE = 5
+# Return at least this many options even if fewer fit the budget
+MIN_RESULTS = 3
+# Relative slack around budget_min/budget_max when filtering
+BUDGET_TOLERANCE = 0.1
+PRICE_PATTERN = re.compile(r"(\d[\d,]*(?:\.\d+)?)")
 
 class AccommodationService:
+
+    def __init__(self):
+        # One broad candidate pool per (country, city, user type); budget,
+        # preference and paging changes are served from it locally
+        self._pool_cache = StaleWhileRevalidateCache(
+            "accommodation_pool", settings.cache_ttl_seconds, settings.cache_max_stale_seconds, settings.cache_max_entries
+        )
     
     async def find_accommodation(
         self,
@@ -13,20 +31,32 @@ class AccommodationService:
         budget_min: float,
         budget_max: float,
         duration_days: int,
-        preferences: List[str]
+        preferences: List[str],
+        page: int = 1,
+        page_size: int = DEFAULT_PAGE_SIZE
     ) -> AccommodationResponse:
         """Find accommodation recommendations using AI"""
-        
+
         user_context = "student" if user_type == "student" else "traveler"
-        pref_text = ", ".join(preferences) if preferences else "no specific preferences"
-        
-        prompt = f"""You are an accommodation expert with knowledge of REAL hotels and accommodations.
-Recommend ACTUAL, REAL hotels and stays that exist in {city or destination_country} for a {user_context}.
+        try:
+            key = make_cache_key(destination_country, city, user_context)
+            pool = await self._pool_cache.get_or_revalidate(
+                key, lambda: self._generate_pool(destination_country, city, user_context)
+            )
+        except Exception as e:
+            print(f"Error finding accommodation: {e}")
+            pool = self._create_fallback_accommodation(city or destination_country, user_type).model_dump()
 
-Budget: ${budget_min}-${budget_max} per night
-Duration: {duration_days} days
-Preferences: {pref_text}
+        return self._rank(pool, budget_min, budget_max, preferences, page, page_size)
 
+    async def _generate_pool(self, destination_country: str, city: str, user_context: str) -> Dict[str, Any]:
+        """Ask the model once for a broad set of candidates across all price tiers"""
+        price_reference = self._price_reference(destination_country, city, user_context)
+        
+        prompt = f"""You are an accommodation expert with knowledge of REAL hotels and accommodations.
+Recommend {POOL_SIZE} ACTUAL, REAL hotels and stays that exist in {city or destination_country} for a {user_context}.
+Cover the full price range from budget to premium and a variety of areas, so the list can later be filtered by budget and preferences.
+{price_reference}
 IMPORTANT: Provide REAL hotel names, REAL prices, and REAL locations that actually exist in {city or destination_country}.
 Include well-known hotel chains (Hilton, Marriott, Hyatt, etc.) and popular local hotels.
 
@@ -39,6 +69,7 @@ Provide response in JSON format:
             "area": "Area name with details",
             "price_range": "$60-80/night",
             "cost_per_night": "$65 average",
+            "nightly_price": 65.0,
             "star_rating": "3-star" or "4-star" or null,
             "amenities": ["wifi", "breakfast included", "gym", "pool", "parking"],
             "nearby_attractions": ["museum 500m", "shopping mall 1km", "beach 2km"],
@@ -59,35 +90,85 @@ Provide response in JSON format:
     "area_safety_info": "Detailed safety information about different areas"
 }}
 
+nightly_price is the typical price per night in USD as a number.
 For students, prioritize: near university, student communities, kitchen access, budget-friendly.
 For travelers, prioritize: safety, English-speaking staff, tourist-friendly areas.
-Include cultural compatibility based on preferences like vegetarian food, quiet areas, etc."""
+Mention features like vegetarian food, quiet areas, kitchens or accessibility in amenities and compatibility_reasons so they can be matched to preferences."""
 
-        try:
-            response = await gemini_service.generate_response(prompt)
-            response_text = response.strip() if response else ""
+        response = await gemini_service.generate_response(prompt)
+        # Check if response is empty (quota exceeded)
+        if not response or not response.strip():
+            raise ValueError("Empty response from Gemini API - likely quota exceeded")
 
-            # Check if response is empty (quota exceeded)
-            if not response_text:
-                print("Empty response from Gemini API - likely quota exceeded")
-                return self._create_fallback_accommodation(city or destination_country, user_type)
+        return AccommodationResponse(**parse_json_response(response)).model_dump()
 
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
+    def _rank(
+        self,
+        pool: Dict[str, Any],
+        budget_min: float,
+        budget_max: float,
+        preferences: List[str],
+        page: int,
+        page_size: int
+    ) -> AccommodationResponse:
+        """Filter the pool by budget, score by preferences and compatibility, and return one page"""
+        low, high = min(budget_min, budget_max), max(budget_min, budget_max)
+        terms = [term.replace("_", " ").lower().strip() for term in preferences if term.strip()]
 
-            data = json.loads(response_text)
-            return AccommodationResponse(**data)
+        in_budget, outside = [], []
+        for option in pool["recommendations"]:
+            price = self._nightly_price(option)
+            fits = price is None or high <= 0 or low * (1 - BUDGET_TOLERANCE) <= price <= high * (1 + BUDGET_TOLERANCE)
+            (in_budget if fits else outside).append((self._score(option, price, low, high, terms), option))
+
+        ranked = sorted(in_budget, key=lambda item: item[0], reverse=True)
+        if len(ranked) < MIN_RESULTS:
+            # Too few matches: pad with the nearest options outside the budget
+            ranked += sorted(outside, key=lambda item: item[0], reverse=True)[:MIN_RESULTS - len(ranked)]
+
+        page_size = max(1, page_size)
+        page = max(1, page)
+        start = (page - 1) * page_size
+        return AccommodationResponse(
+            recommendations=[option for _, option in ranked[start:start + page_size]],
+            general_tips=pool["general_tips"],
+            scam_warnings=pool["scam_warnings"],
+            area_safety_info=pool["area_safety_info"],
+            total_results=len(ranked),
+            page=page,
+            page_size=page_size
+        )
+
+    def _score(self, option: Dict[str, Any], price: Optional[float], low: float, high: float, terms: List[str]) -> float:
+        """Preference matches dominate, then cultural compatibility, then closeness to the budget"""
+        text = " ".join([
+            option["name"], option["type"], option["area"], option.get("best_for") or "",
+            " ".join(option["amenities"]), " ".join(option["pros"]), " ".join(option["compatibility_reasons"])
+        ]).lower()
+        matches = sum(1 for term in terms if term in text)
+        score = matches * 100 + option["cultural_compatibility_score"]
+        if price is not None and high > 0:
+            middle = (low + high) / 2
+            score -= 20 * abs(price - middle) / max(middle, 1.0)
+        return score
+
+    def _nightly_price(self, option: Dict[str, Any]) -> Optional[float]:
+        if option.get("nightly_price") is not None:
+            return float(option["nightly_price"])
+        match = PRICE_PATTERN.search(option.get("cost_per_night") or "")
+        return float(match.group(1).replace(",", "")) if match else None
+
+    def _price_reference(self, destination_country: str, city: str, user_type: str) -> str:
+        """Local cost figures the model should anchor its prices to"""
+        nightly = cost_of_living_service.nightly_range(destination_country, city)
+        if nightly is None:
+            return ""
+        reference = f"Typical nightly cost here: about ${nightly[0]:.0f} (budget) to ${nightly[1]:.0f} (mid-range)."
+        if user_type == "student":
+            rent = cost_of_living_service.monthly_rent(destination_country, city)
+            reference += f" A 1-bedroom city-centre apartment rents for about ${rent:.0f}/month."
+        return reference + " Keep prices consistent with these figures.\n"
 
-        except json.JSONDecodeError as e:
-            print(f"JSON decode error in accommodation service: {e}")
-            print(f"Response text was: {response_text[:200] if 'response_text' in locals() else 'None'}")
-            return self._create_fallback_accommodation(city or destination_country, user_type)
-        except Exception as e:
-            print(f"Error finding accommodation: {e}")
-            return self._create_fallback_accommodation(city or destination_country, user_type)
-    
     def _create_fallback_accommodation(self, location: str, user_type: str) -> AccommodationResponse:
         """Create fallback accommodation recommendations"""
         if user_type == "student":
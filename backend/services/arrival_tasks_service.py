@@ -1,8 +1,15 @@
 from services.gemini_service import gemini_service
+from services.cache_service import StaleWhileRevalidateCache, make_cache_key, parse_json_response
 from models.arrival_tasks import ArrivalTasksResponse, TaskItem
-import json
+from config import settings
+from typing import Dict, Any
 
 class ArrivalTasksService:
+
+    def __init__(self):
+        self._cache = StaleWhileRevalidateCache(
+            "arrival_tasks", settings.cache_ttl_seconds, settings.cache_max_stale_seconds, settings.cache_max_entries
+        )
     
     async def get_arrival_tasks(
         self,
@@ -10,6 +17,19 @@ class ArrivalTasksService:
         purpose: str
     ) -> ArrivalTasksResponse:
         """Get categorized post-arrival tasks"""
+
+        try:
+            data = await self._cache.get_or_revalidate(
+                make_cache_key(destination_country, purpose),
+                lambda: self._generate_tasks(destination_country, purpose)
+            )
+            return ArrivalTasksResponse(**data)
+        except Exception as e:
+            print(f"Error getting arrival tasks: {e}")
+            return self._create_fallback_tasks(destination_country, purpose)
+
+    async def _generate_tasks(self, destination_country: str, purpose: str) -> Dict[str, Any]:
+        """Generate arrival tasks with Gemini; raises if the response cannot be parsed"""
         
         prompt = f"""You are a relocation expert. List important tasks after arriving in {destination_country} for {purpose}.
 
@@ -50,22 +70,10 @@ Safety: Emergency numbers, safe areas, scam awareness, local laws
 
 Be specific to {destination_country} and {purpose}."""
 
-        try:
-            response = await gemini_service.generate_response(prompt)
-            response_text = response.strip()
-            
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-            
-            data = json.loads(response_text)
-            return ArrivalTasksResponse(**data)
-            
-        except Exception as e:
-            print(f"Error getting arrival tasks: {e}")
-            return self._create_fallback_tasks(destination_country, purpose)
-    
+        response = await gemini_service.generate_response(prompt)
+        data = parse_json_response(response)
+        return ArrivalTasksResponse(**data).model_dump()
+
     def _create_fallback_tasks(self, country: str, purpose: str) -> ArrivalTasksResponse:
         """Create fallback tasks"""
         return ArrivalTasksResponse(
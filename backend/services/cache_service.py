@@ -0,0 +1,197 @@
+import asyncio
+import copy
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+from services.snapshot_store import snapshot_store
+
+
+def make_cache_key(*parts: Any) -> str:
+    """Build a normalized cache key from request parts"""
+    return "|".join("" if part is None else " ".join(str(part).lower().split()) for part in parts)
+
+
+def stay_length_bucket(duration_days: int) -> str:
+    """Bucket a stay so nearby durations share one cache entry"""
+    if duration_days <= 14:
+        return "up to 2 weeks"
+    if duration_days <= 90:
+        return "2 weeks to 3 months"
+    if duration_days <= 365:
+        return "3 to 12 months"
+    return "more than a year"
+
+
+def parse_json_response(response: str) -> Any:
+    """Parse JSON from a Gemini response (sometimes wrapped in markdown code blocks)"""
+    response_text = response.strip()
+    if "```json" in response_text:
+        response_text = response_text.split("```json")[1].split("```")[0].strip()
+    elif "```" in response_text:
+        response_text = response_text.split("```")[1].split("```")[0].strip()
+    return json.loads(response_text)
+
+
+def merge_items(base: List[str], extra: List[str]) -> List[str]:
+    """Append extra items that are not already present (case-insensitive)"""
+    seen = {item.lower().strip() for item in base}
+    merged = list(base)
+    for item in extra:
+        if item.lower().strip() not in seen:
+            seen.add(item.lower().strip())
+            merged.append(item)
+    return merged
+
+
+class TTLCache:
+    """In-memory LRU cache with per-entry expiry and single-flight loading.
+
+    Values are expected to be plain JSON-like data (dicts/lists); copies are
+    returned so callers can merge into them without touching the cached entry.
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, max_entries: int = 1024):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _is_expired(self, age: float) -> bool:
+        return age >= self.ttl_seconds
+
+    def _lookup(self, key: str) -> Optional[tuple]:
+        """Return (value, age) for a live entry, dropping it if expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, stored_at = entry
+        age = time.time() - stored_at
+        if self._is_expired(age):
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value, age
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a copy of the cached value, or None if missing/expired"""
+        entry = self._lookup(key)
+        if entry is None or entry[1] >= self.ttl_seconds:
+            return None
+        return copy.deepcopy(entry[0])
+
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entry if full"""
+        self._entries[key] = (copy.deepcopy(value), stored_at if stored_at is not None else time.time())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _load(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Run the factory once per key, sharing the result with concurrent callers"""
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return copy.deepcopy(await asyncio.shield(pending))
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await factory()
+            self.set(key, value)
+            future.set_result(value)
+            return copy.deepcopy(value)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def get_or_create(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value or build it once, sharing the result with concurrent callers.
+
+        Exceptions raised by the factory are propagated and nothing is cached,
+        so fallbacks never get pinned in the cache.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        return await self._load(key, factory)
+
+    def items(self):
+        """Yield (key, value, stored_at) for every live entry"""
+        for key, (value, stored_at) in list(self._entries.items()):
+            if not self._is_expired(time.time() - stored_at):
+                yield key, copy.deepcopy(value), stored_at
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class StaleWhileRevalidateCache(TTLCache):
+    """TTL cache that keeps serving expired entries while they are refreshed.
+
+    An entry is fresh for ``ttl_seconds``; after that it is still served for up
+    to ``max_stale_seconds`` while a single background task per key replaces it.
+    Entries older than ``ttl_seconds + max_stale_seconds`` are treated as misses.
+
+    On a miss the precomputed snapshot (if loaded) is consulted under
+    ``"<cache name>:<key>"``; its records age from the snapshot build time.
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, max_stale_seconds: float, max_entries: int = 1024):
+        super().__init__(name, ttl_seconds, max_entries)
+        self.max_stale_seconds = max_stale_seconds
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        self._refreshing: Set[str] = set()
+
+    def _is_expired(self, age: float) -> bool:
+        return age >= self.ttl_seconds + self.max_stale_seconds
+
+    async def get_or_revalidate(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Return fresh or stale data immediately, loading synchronously only on a miss"""
+        entry = self._lookup(key) or self._seed_from_snapshot(key)
+        if entry is None:
+            return await self._load(key, factory)
+
+        value, age = entry
+        if age >= self.ttl_seconds and key not in self._inflight and key not in self._refreshing:
+            # Claim the key before the task starts so concurrent hits don't spawn duplicates
+            self._refreshing.add(key)
+            task = asyncio.create_task(self._refresh(key, factory))
+            self._refresh_tasks.add(task)
+            task.add_done_callback(self._refresh_tasks.discard)
+        return copy.deepcopy(value)
+
+    def _seed_from_snapshot(self, key: str) -> Optional[tuple]:
+        """Copy a snapshot record into the cache, returning (value, age) if still usable"""
+        if not snapshot_store.loaded:
+            return None
+        age = time.time() - snapshot_store.created_at
+        if self._is_expired(age):
+            return None
+        value = snapshot_store.get(f"{self.name}:{key}")
+        if value is None:
+            return None
+        self.set(key, value, stored_at=snapshot_store.created_at)
+        return value, age
+
+    async def _refresh(self, key: str, factory: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await self._load(key, factory)
+        except Exception as e:
+            # Keep serving the stale entry; the next request retries
+            print(f"Background refresh failed for {self.name} [{key}]: {e}")
+        finally:
+            self._refreshing.discard(key)
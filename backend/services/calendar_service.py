@@ -0,0 +1,194 @@
+from services.gemini_service import gemini_service
+from services.cache_service import TTLCache, make_cache_key, parse_json_response
+from services.holiday_service import holiday_service
+from config import settings
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import time
+
+# Longest range split into month segments for one request
+MAX_MONTHS = 24
+DATED_LISTS = ("holidays", "culturalEvents", "importantDates")
+
+
+def month_segments(start: date, end: date) -> List[Tuple[date, date]]:
+    """Split an inclusive date range into whole calendar months covering it"""
+    segments = []
+    first = start.replace(day=1)
+    while first <= end:
+        following = (first.replace(day=28) + timedelta(days=4)).replace(day=1)
+        segments.append((first, following - timedelta(days=1)))
+        first = following
+    return segments
+
+
+class CalendarService:
+
+    def __init__(self):
+        # One entry per (destination, month); overlapping ranges share segments
+        self._segment_cache = TTLCache("calendar_month", settings.cache_ttl_seconds, settings.cache_max_entries)
+        # Generated timelines and event sets, addressed by content hash for export feeds
+        self._saved = TTLCache("calendar_saved", settings.calendar_store_ttl_seconds, settings.cache_max_entries)
+
+    def save(self, kind: str, data: Dict[str, Any]) -> str:
+        """Store a timeline or event set and return its id, a hash of its content.
+
+        Identical content keeps its id and original timestamp, so export feeds
+        (and their ETags) only change when the content does.
+        """
+        digest = hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:32]
+        key = f"{kind}:{digest}"
+        record = self._saved.get(key)
+        self._saved.set(key, record or {"data": data, "created_at": time.time()})
+        return digest
+
+    def load(self, kind: str, saved_id: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Return (data, created_at) for a stored timeline or event set"""
+        record = self._saved.get(f"{kind}:{saved_id}")
+        if record is None:
+            return None
+        return record["data"], record["created_at"]
+
+    async def generate_events(
+        self,
+        destination: str,
+        start: date,
+        end: date,
+        include_holidays: bool = True,
+        include_weather: bool = True
+    ) -> Dict[str, Any]:
+        """Holidays, weather, cultural events and important dates for a date range.
+
+        Months the model failed on are listed in failedMonths (with partial set);
+        if every month fails the error is raised instead.
+        """
+        if end < start:
+            raise ValueError("endDate must not be before startDate")
+        segments = month_segments(start, end)
+        if len(segments) > MAX_MONTHS:
+            raise ValueError(f"Date range is limited to {MAX_MONTHS} months")
+
+        # Public holidays come from the local rule engine when the country is covered;
+        # the model is then only asked for weather, cultural events and other dates
+        country = destination.rpartition(",")[2].strip()
+        local_holidays = holiday_service.supports(country)
+        model_holidays = include_holidays and not local_holidays
+
+        results = await asyncio.gather(*(
+            self._get_month(destination, first, last, model_holidays) for first, last in segments
+        ), return_exceptions=True)
+        failed_months = [
+            first.strftime("%Y-%m") for (first, _), result in zip(segments, results) if isinstance(result, Exception)
+        ]
+        if len(failed_months) == len(segments):
+            raise RuntimeError(f"Calendar information could not be generated: {results[0]}")
+        months = [{} if isinstance(result, Exception) else result for result in results]
+
+        data: Dict[str, Any] = {name: [] for name in DATED_LISTS}
+        seen = set()
+        start_iso, end_iso = start.isoformat(), end.isoformat()
+        for month in months:
+            for name in DATED_LISTS:
+                for item in month.get(name, []):
+                    if not isinstance(item, dict):
+                        continue
+                    key = (name, str(item.get("name", "")).lower(), item.get("date"))
+                    if key in seen or not start_iso <= str(item.get("date", "")) <= end_iso:
+                        continue
+                    seen.add(key)
+                    data[name].append(item)
+
+        if include_holidays and local_holidays:
+            data["holidays"] = holiday_service.holidays_between(country, start, end)
+        elif not include_holidays:
+            data.pop("holidays")
+        for name in DATED_LISTS:
+            if name in data:
+                data[name].sort(key=lambda item: str(item.get("date", "")))
+
+        if include_weather:
+            weather_by_month = [
+                {"month": first.strftime("%Y-%m"), **month["weather"]}
+                for (first, _), month in zip(segments, months) if month.get("weather")
+            ]
+            data["weather"] = weather_by_month[0] if weather_by_month else {}
+            data["weatherByMonth"] = weather_by_month
+        data["partial"] = bool(failed_months)
+        data["failedMonths"] = failed_months
+        return data
+
+    async def _get_month(self, destination: str, first: date, last: date, model_holidays: bool) -> Dict[str, Any]:
+        key = make_cache_key(destination, first.strftime("%Y-%m"), "holidays" if model_holidays else "")
+        try:
+            return await self._segment_cache.get_or_create(
+                key, lambda: self._generate_month(destination, first, last, model_holidays)
+            )
+        except Exception as e:
+            # Failures are not cached, so the month is retried next time
+            print(f"Error generating calendar month {first.strftime('%Y-%m')} for {destination}: {e}")
+            raise
+
+    async def _generate_month(self, destination: str, first: date, last: date, model_holidays: bool) -> Dict[str, Any]:
+        holidays_section = """
+        "holidays": [
+            {
+                "name": "holiday name",
+                "date": "YYYY-MM-DD",
+                "type": "public/religious/cultural",
+                "description": "brief description",
+                "impact": "how it affects daily life/businesses"
+            }
+        ],""" if model_holidays else ""
+        holidays_instruction = (
+            "Include all major holidays, cultural festivals, and important administrative dates for the destination."
+            if model_holidays else
+            "Public holidays are already known; do not list them. Include cultural festivals and important administrative dates for the destination."
+        )
+
+        prompt = f"""
+    As a travel and cultural expert, provide important calendar information for {destination}
+    for {first.strftime('%B %Y')} (between {first.isoformat()} and {last.isoformat()}).
+
+    Provide a JSON response with:
+    {{{holidays_section}
+        "weather": {{
+            "season": "season name",
+            "averageTemp": "temperature range",
+            "rainfall": "rainfall info",
+            "recommendations": ["what to prepare for weather-wise"]
+        }},
+        "culturalEvents": [
+            {{
+                "name": "event name",
+                "date": "YYYY-MM-DD",
+                "description": "brief description",
+                "recommendedForNewcomers": true/false
+            }}
+        ],
+        "importantDates": [
+            {{
+                "name": "important date (tax deadlines, registration periods, etc)",
+                "date": "YYYY-MM-DD",
+                "category": "administrative/legal/social",
+                "priority": "high/medium/low"
+            }}
+        ]
+    }}
+
+    Only include dates within {first.strftime('%B %Y')}.
+    {holidays_instruction}
+    """
+
+        response = await gemini_service.generate_response(prompt)
+        data = parse_json_response(response)
+        if not isinstance(data.get("weather"), dict):
+            raise ValueError("Calendar response is missing weather")
+        for name in DATED_LISTS:
+            if not isinstance(data.get(name, []), list):
+                raise ValueError(f"Calendar response has invalid {name}")
+        return data
+
+calendar_service = CalendarService()
@@ -0,0 +1,339 @@
+from difflib import get_close_matches
+from typing import Dict, List, Optional, Tuple
+import re
+
+# (name, ISO 3166 alpha-2, alpha-3, ISO 4217 currency, ISO 639 language, aliases)
+# Mirrors the country list in frontend/lib/countryUtils.js
+COUNTRIES = [
+    ("Afghanistan", "AF", "AFG", "AFN", "ps", []),
+    ("Albania", "AL", "ALB", "ALL", "sq", []),
+    ("Algeria", "DZ", "DZA", "DZD", "ar", []),
+    ("Andorra", "AD", "AND", "EUR", "ca", []),
+    ("Angola", "AO", "AGO", "AOA", "pt", []),
+    ("Argentina", "AR", "ARG", "ARS", "es", []),
+    ("Armenia", "AM", "ARM", "AMD", "hy", []),
+    ("Australia", "AU", "AUS", "AUD", "en", ["oz"]),
+    ("Austria", "AT", "AUT", "EUR", "de", ["osterreich"]),
+    ("Azerbaijan", "AZ", "AZE", "AZN", "az", []),
+    ("Bahamas", "BS", "BHS", "BSD", "en", ["the bahamas"]),
+    ("Bangladesh", "BD", "BGD", "BDT", "bn", []),
+    ("Belgium", "BE", "BEL", "EUR", "nl", ["belgique", "belgie"]),
+    ("Belize", "BZ", "BLZ", "BZD", "en", []),
+    ("Benin", "BJ", "BEN", "XOF", "fr", []),
+    ("Bhutan", "BT", "BTN", "BTN", "dz", []),
+    ("Bolivia", "BO", "BOL", "BOB", "es", []),
+    ("Bosnia & Herzegovina", "BA", "BIH", "BAM", "bs", ["bosnia", "bosnia and herzegovina"]),
+    ("Botswana", "BW", "BWA", "BWP", "en", []),
+    ("Brazil", "BR", "BRA", "BRL", "pt", ["brasil"]),
+    ("Bulgaria", "BG", "BGR", "EUR", "bg", []),
+    ("Canada", "CA", "CAN", "CAD", "en", []),
+    ("Chile", "CL", "CHL", "CLP", "es", []),
+    ("China", "CN", "CHN", "CNY", "zh", ["prc", "peoples republic of china", "mainland china"]),
+    ("Colombia", "CO", "COL", "COP", "es", []),
+    ("Costa Rica", "CR", "CRI", "CRC", "es", []),
+    ("Croatia", "HR", "HRV", "EUR", "hr", ["hrvatska"]),
+    ("Cuba", "CU", "CUB", "CUP", "es", []),
+    ("Cyprus", "CY", "CYP", "EUR", "el", []),
+    ("Czech Republic", "CZ", "CZE", "CZK", "cs", ["czechia"]),
+    ("Denmark", "DK", "DNK", "DKK", "da", ["danmark"]),
+    ("Dominican Republic", "DO", "DOM", "DOP", "es", []),
+    ("Ecuador", "EC", "ECU", "USD", "es", []),
+    ("Egypt", "EG", "EGY", "EGP", "ar", []),
+    ("El Salvador", "SV", "SLV", "USD", "es", []),
+    ("Estonia", "EE", "EST", "EUR", "et", []),
+    ("Ethiopia", "ET", "ETH", "ETB", "am", []),
+    ("Finland", "FI", "FIN", "EUR", "fi", ["suomi"]),
+    ("France", "FR", "FRA", "EUR", "fr", []),
+    ("Georgia", "GE", "GEO", "GEL", "ka", []),
+    ("Germany", "DE", "DEU", "EUR", "de", ["deutschland", "allemagne"]),
+    ("Ghana", "GH", "GHA", "GHS", "en", []),
+    ("Greece", "GR", "GRC", "EUR", "el", ["hellas"]),
+    ("Guatemala", "GT", "GTM", "GTQ", "es", []),
+    ("Haiti", "HT", "HTI", "HTG", "ht", []),
+    ("Honduras", "HN", "HND", "HNL", "es", []),
+    ("Hungary", "HU", "HUN", "HUF", "hu", ["magyarorszag"]),
+    ("Iceland", "IS", "ISL", "ISK", "is", []),
+    ("India", "IN", "IND", "INR", "hi", ["bharat"]),
+    ("Indonesia", "ID", "IDN", "IDR", "id", []),
+    ("Iran", "IR", "IRN", "IRR", "fa", ["persia"]),
+    ("Iraq", "IQ", "IRQ", "IQD", "ar", []),
+    ("Ireland", "IE", "IRL", "EUR", "en", ["eire", "republic of ireland"]),
+    ("Israel", "IL", "ISR", "ILS", "he", []),
+    ("Italy", "IT", "ITA", "EUR", "it", ["italia"]),
+    ("Jamaica", "JM", "JAM", "JMD", "en", []),
+    ("Japan", "JP", "JPN", "JPY", "ja", ["nippon", "nihon"]),
+    ("Jordan", "JO", "JOR", "JOD", "ar", []),
+    ("Kazakhstan", "KZ", "KAZ", "KZT", "kk", []),
+    ("Kenya", "KE", "KEN", "KES", "en", []),
+    ("Kuwait", "KW", "KWT", "KWD", "ar", []),
+    ("Kyrgyzstan", "KG", "KGZ", "KGS", "ky", []),
+    ("Laos", "LA", "LAO", "LAK", "lo", []),
+    ("Latvia", "LV", "LVA", "EUR", "lv", []),
+    ("Lebanon", "LB", "LBN", "LBP", "ar", []),
+    ("Lithuania", "LT", "LTU", "EUR", "lt", []),
+    ("Luxembourg", "LU", "LUX", "EUR", "lb", []),
+    ("Malaysia", "MY", "MYS", "MYR", "ms", []),
+    ("Maldives", "MV", "MDV", "MVR", "dv", []),
+    ("Mali", "ML", "MLI", "XOF", "fr", []),
+    ("Mexico", "MX", "MEX", "MXN", "es", ["mejico"]),
+    ("Moldova", "MD", "MDA", "MDL", "ro", []),
+    ("Mongolia", "MN", "MNG", "MNT", "mn", []),
+    ("Morocco", "MA", "MAR", "MAD", "ar", []),
+    ("Nepal", "NP", "NPL", "NPR", "ne", []),
+    ("Netherlands", "NL", "NLD", "EUR", "nl", ["holland", "the netherlands", "nederland"]),
+    ("New Zealand", "NZ", "NZL", "NZD", "en", ["aotearoa"]),
+    ("Nigeria", "NG", "NGA", "NGN", "en", []),
+    ("North Korea", "KP", "PRK", "KPW", "ko", ["dprk"]),
+    ("Norway", "NO", "NOR", "NOK", "no", ["norge"]),
+    ("Oman", "OM", "OMN", "OMR", "ar", []),
+    ("Pakistan", "PK", "PAK", "PKR", "ur", []),
+    ("Panama", "PA", "PAN", "PAB", "es", []),
+    ("Paraguay", "PY", "PRY", "PYG", "es", []),
+    ("Peru", "PE", "PER", "PEN", "es", []),
+    ("Philippines", "PH", "PHL", "PHP", "fil", ["the philippines"]),
+    ("Poland", "PL", "POL", "PLN", "pl", ["polska"]),
+    ("Portugal", "PT", "PRT", "EUR", "pt", []),
+    ("Qatar", "QA", "QAT", "QAR", "ar", []),
+    ("Romania", "RO", "ROU", "RON", "ro", []),
+    ("Russia", "RU", "RUS", "RUB", "ru", ["russian federation"]),
+    ("Saudi Arabia", "SA", "SAU", "SAR", "ar", ["ksa"]),
+    ("Serbia", "RS", "SRB", "RSD", "sr", []),
+    ("Singapore", "SG", "SGP", "SGD", "en", []),
+    ("Slovakia", "SK", "SVK", "EUR", "sk", ["slovak republic"]),
+    ("Slovenia", "SI", "SVN", "EUR", "sl", []),
+    ("South Africa", "ZA", "ZAF", "ZAR", "en", ["rsa"]),
+    ("South Korea", "KR", "KOR", "KRW", "ko", ["korea", "republic of korea"]),
+    ("Spain", "ES", "ESP", "EUR", "es", ["espana"]),
+    ("Sri Lanka", "LK", "LKA", "LKR", "si", ["ceylon"]),
+    ("Sweden", "SE", "SWE", "SEK", "sv", ["sverige"]),
+    ("Switzerland", "CH", "CHE", "CHF", "de", ["schweiz", "suisse", "svizzera"]),
+    ("Syria", "SY", "SYR", "SYP", "ar", []),
+    ("Taiwan", "TW", "TWN", "TWD", "zh", []),
+    ("Thailand", "TH", "THA", "THB", "th", []),
+    ("Turkey", "TR", "TUR", "TRY", "tr", ["turkiye"]),
+    ("Ukraine", "UA", "UKR", "UAH", "uk", []),
+    ("United Arab Emirates", "AE", "ARE", "AED", "ar", ["uae", "emirates"]),
+    ("United Kingdom", "GB", "GBR", "GBP", "en", ["uk", "great britain", "britain", "england", "scotland", "wales"]),
+    ("United States", "US", "USA", "USD", "en", ["united states of america", "america", "usa", "us of a"]),
+    ("Vietnam", "VN", "VNM", "VND", "vi", ["viet nam"]),
+    ("Yemen", "YE", "YEM", "YER", "ar", []),
+    ("Zambia", "ZM", "ZMB", "ZMW", "en", []),
+    ("Zimbabwe", "ZW", "ZWE", "ZWL", "en", []),
+]
+
+# (ISO 639 code, English name, aliases)
+LANGUAGES = [
+    ("sq", "Albanian", []), ("am", "Amharic", []), ("ar", "Arabic", []),
+    ("hy", "Armenian", []), ("az", "Azerbaijani", []), ("bn", "Bengali", ["bangla"]),
+    ("bs", "Bosnian", []), ("bg", "Bulgarian", []), ("ca", "Catalan", []),
+    ("hr", "Croatian", []), ("cs", "Czech", []), ("da", "Danish", []),
+    ("dv", "Dhivehi", []), ("nl", "Dutch", ["flemish"]), ("dz", "Dzongkha", []),
+    ("en", "English", []), ("et", "Estonian", []), ("fil", "Filipino", ["tagalog"]),
+    ("fi", "Finnish", []), ("fr", "French", ["francais"]), ("ka", "Georgian", []),
+    ("de", "German", ["deutsch"]), ("el", "Greek", []), ("ht", "Haitian Creole", ["creole"]),
+    ("he", "Hebrew", []), ("hi", "Hindi", []), ("hu", "Hungarian", []),
+    ("is", "Icelandic", []), ("id", "Indonesian", ["bahasa indonesia"]), ("it", "Italian", ["italiano"]),
+    ("ja", "Japanese", []), ("kk", "Kazakh", []), ("ko", "Korean", []),
+    ("ky", "Kyrgyz", []), ("lo", "Lao", []), ("lv", "Latvian", []),
+    ("lt", "Lithuanian", []), ("lb", "Luxembourgish", []), ("ms", "Malay", ["bahasa melayu"]),
+    ("zh", "Mandarin Chinese", ["chinese", "mandarin", "putonghua"]), ("mn", "Mongolian", []),
+    ("ne", "Nepali", []), ("no", "Norwegian", ["norsk"]), ("ps", "Pashto", []),
+    ("fa", "Persian (Farsi)", ["persian", "farsi"]), ("pl", "Polish", []), ("pt", "Portuguese", ["portugues"]),
+    ("ro", "Romanian", []), ("ru", "Russian", []), ("sr", "Serbian", []),
+    ("si", "Sinhala", ["sinhalese"]), ("sk", "Slovak", []), ("sl", "Slovene", ["slovenian"]),
+    ("es", "Spanish", ["espanol", "castellano"]), ("sv", "Swedish", []), ("th", "Thai", []),
+    ("tr", "Turkish", []), ("uk", "Ukrainian", []), ("ur", "Urdu", []),
+    ("vi", "Vietnamese", []), ("ta", "Tamil", []), ("te", "Telugu", []),
+    ("ml", "Malayalam", []), ("kn", "Kannada", []), ("mr", "Marathi", []),
+    ("gu", "Gujarati", []), ("pa", "Punjabi", []), ("sw", "Swahili", ["kiswahili"]),
+]
+
+# (ISO 4217 code, name, aliases)
+CURRENCIES = [
+    ("USD", "US Dollar", ["$", "us$", "dollar", "dollars", "american dollar"]),
+    ("EUR", "Euro", ["€", "euros"]),
+    ("GBP", "British Pound", ["£", "pound sterling", "sterling", "pounds"]),
+    ("INR", "Indian Rupee", ["₹", "rupees"]),
+    ("JPY", "Japanese Yen", ["yen"]),
+    ("CNY", "Chinese Yuan", ["yuan", "renminbi", "rmb"]),
+    ("KRW", "South Korean Won", ["₩", "won"]),
+    ("CHF", "Swiss Franc", []),
+    ("CAD", "Canadian Dollar", ["c$"]),
+    ("AUD", "Australian Dollar", ["a$"]),
+    ("NZD", "New Zealand Dollar", ["nz$"]),
+    ("SGD", "Singapore Dollar", ["s$"]),
+    ("AED", "UAE Dirham", ["dirham"]),
+    ("RUB", "Russian Ruble", ["₽", "ruble", "rouble"]),
+    ("TRY", "Turkish Lira", ["₺", "lira"]),
+    ("BRL", "Brazilian Real", ["r$", "real", "reais"]),
+    ("MXN", "Mexican Peso", []),
+    ("ZAR", "South African Rand", ["rand"]),
+    ("THB", "Thai Baht", ["฿", "baht"]),
+    ("VND", "Vietnamese Dong", ["₫", "dong"]),
+    ("PHP", "Philippine Peso", ["₱"]),
+    ("NGN", "Nigerian Naira", ["₦", "naira"]),
+    ("UAH", "Ukrainian Hryvnia", ["₴", "hryvnia"]),
+    ("ILS", "Israeli Shekel", ["₪", "shekel", "new israeli shekel"]),
+    ("PLN", "Polish Zloty", ["zloty", "złoty"]),
+    ("XOF", "West African CFA Franc", ["cfa franc"]),
+]
+
+# Names for codes that only appear in the country table
+_CURRENCY_NAMES = {
+    "AFN": "Afghan Afghani", "ALL": "Albanian Lek", "DZD": "Algerian Dinar", "AOA": "Angolan Kwanza",
+    "ARS": "Argentine Peso", "AMD": "Armenian Dram", "AZN": "Azerbaijani Manat", "BSD": "Bahamian Dollar",
+    "BDT": "Bangladeshi Taka", "BZD": "Belize Dollar", "BTN": "Bhutanese Ngultrum", "BOB": "Bolivian Boliviano",
+    "BAM": "Convertible Mark", "BWP": "Botswana Pula", "CLP": "Chilean Peso", "COP": "Colombian Peso",
+    "CRC": "Costa Rican Colon", "CUP": "Cuban Peso", "CZK": "Czech Koruna", "DKK": "Danish Krone",
+    "DOP": "Dominican Peso", "EGP": "Egyptian Pound", "ETB": "Ethiopian Birr", "GEL": "Georgian Lari",
+    "GHS": "Ghanaian Cedi", "GTQ": "Guatemalan Quetzal", "HTG": "Haitian Gourde", "HNL": "Honduran Lempira",
+    "HUF": "Hungarian Forint", "ISK": "Icelandic Krona", "IDR": "Indonesian Rupiah", "IRR": "Iranian Rial",
+    "IQD": "Iraqi Dinar", "JMD": "Jamaican Dollar", "JOD": "Jordanian Dinar", "KZT": "Kazakhstani Tenge",
+    "KES": "Kenyan Shilling", "KWD": "Kuwaiti Dinar", "KGS": "Kyrgyzstani Som", "LAK": "Lao Kip",
+    "LBP": "Lebanese Pound", "MYR": "Malaysian Ringgit", "MVR": "Maldivian Rufiyaa", "MDL": "Moldovan Leu",
+    "MNT": "Mongolian Tugrik", "MAD": "Moroccan Dirham", "NPR": "Nepalese Rupee", "KPW": "North Korean Won",
+    "NOK": "Norwegian Krone", "OMR": "Omani Rial", "PKR": "Pakistani Rupee", "PAB": "Panamanian Balboa",
+    "PYG": "Paraguayan Guarani", "PEN": "Peruvian Sol", "QAR": "Qatari Riyal", "RON": "Romanian Leu",
+    "SAR": "Saudi Riyal", "RSD": "Serbian Dinar", "LKR": "Sri Lankan Rupee", "SEK": "Swedish Krona",
+    "SYP": "Syrian Pound", "TWD": "New Taiwan Dollar", "YER": "Yemeni Rial", "ZMW": "Zambian Kwacha",
+    "ZWL": "Zimbabwean Dollar",
+}
+
+_PUNCTUATION = re.compile(r"[.'’()\-_,]")
+
+
+def _normalize(value: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace for index lookups"""
+    value = _PUNCTUATION.sub("", value.lower().replace("&", " and "))
+    value = " ".join(value.split())
+    return value[4:] if value.startswith("the ") else value
+
+
+def clean_text(value: Optional[str]) -> Optional[str]:
+    """Strip and collapse whitespace without changing meaning"""
+    if value is None:
+        return None
+    return " ".join(value.split())
+
+
+class CanonicalRegistry:
+    """Maps free-form country/currency/language inputs to canonical values.
+
+    Every alias is precomputed into a flat dict so exact lookups are O(1);
+    fuzzy matching only runs for misses and is memoized.
+    """
+
+    FUZZY_CUTOFF = 0.85
+    FUZZY_MEMO_SIZE = 4096
+
+    def __init__(self):
+        self._countries: Dict[str, Tuple] = {}
+        self._currencies: Dict[str, str] = {}
+        self._languages: Dict[str, str] = {}
+        self.currency_names: Dict[str, str] = dict(_CURRENCY_NAMES)
+        self.language_codes: Dict[str, str] = {}
+
+        for code, name, aliases in CURRENCIES:
+            self.currency_names[code] = name
+            for alias in [code, name, *aliases]:
+                self._currencies[_normalize(alias)] = code
+        for code, name in self.currency_names.items():
+            self._currencies.setdefault(_normalize(code), code)
+            self._currencies.setdefault(_normalize(name), code)
+
+        for code, name, aliases in LANGUAGES:
+            self.language_codes[name] = code
+            for alias in [code, name, *aliases]:
+                self._languages[_normalize(alias)] = name
+
+        for record in COUNTRIES:
+            name, alpha2, alpha3, _, _, aliases = record
+            for alias in [name, alpha2, alpha3, *aliases]:
+                self._countries.setdefault(_normalize(alias), record)
+
+        # Fuzzy matching only considers full names/aliases, not 2-3 letter codes
+        self._country_choices = [key for key in self._countries if len(key) > 3]
+        self._language_choices = [key for key in self._languages if len(key) > 3]
+        self._currency_choices = [key for key in self._currencies if len(key) > 3]
+        self._fuzzy_memo: Dict[Tuple[int, str], Optional[str]] = {}
+
+    def _lookup(self, index: Dict, choices: List[str], value: str):
+        key = _normalize(value)
+        hit = index.get(key)
+        if hit is None and len(key) > 3:
+            match = self._fuzzy_match(choices, key)
+            hit = index.get(match) if match else None
+        return hit
+
+    def _fuzzy_match(self, choices: List[str], key: str) -> Optional[str]:
+        """Closest alias above FUZZY_CUTOFF, memoized per index"""
+        memo_key = (id(choices), key)
+        if memo_key not in self._fuzzy_memo:
+            if len(self._fuzzy_memo) >= self.FUZZY_MEMO_SIZE:
+                self._fuzzy_memo.clear()
+            matches = get_close_matches(key, choices, n=1, cutoff=self.FUZZY_CUTOFF)
+            self._fuzzy_memo[memo_key] = matches[0] if matches else None
+        return self._fuzzy_memo[memo_key]
+
+    def country_record(self, value: Optional[str]) -> Optional[Tuple]:
+        """Return (name, alpha2, alpha3, currency, language, aliases) for a country input"""
+        if not value:
+            return None
+        return self._lookup(self._countries, self._country_choices, value)
+
+    def country(self, value: Optional[str]) -> Optional[str]:
+        """Canonical country name, or the cleaned input if the country is unknown"""
+        record = self.country_record(value)
+        return record[0] if record else clean_text(value)
+
+    def country_code(self, value: Optional[str]) -> Optional[str]:
+        """ISO 3166 alpha-2 code for a country input"""
+        record = self.country_record(value)
+        return record[1] if record else None
+
+    def currency(self, value: Optional[str]) -> Optional[str]:
+        """ISO 4217 code for a currency (or country) input, or the cleaned upper-cased input"""
+        if not value:
+            return clean_text(value)
+        code = self._lookup(self._currencies, self._currency_choices, value)
+        if code:
+            return code
+        # Only an exact country name or alias implies its currency; a fuzzy country
+        # match would turn near-miss currency names ("franc") into a country's currency
+        record = self._countries.get(_normalize(value))
+        return record[3] if record else clean_text(value).upper()
+
+    def currency_for_country(self, value: Optional[str]) -> Optional[str]:
+        record = self.country_record(value)
+        return record[3] if record else None
+
+    def language(self, value: Optional[str]) -> Optional[str]:
+        """Canonical English language name, or the cleaned input if unknown"""
+        if not value:
+            return clean_text(value)
+        name = self._lookup(self._languages, self._language_choices, value)
+        return name or clean_text(value)
+
+    def language_code(self, value: Optional[str]) -> Optional[str]:
+        """ISO 639 code for a language input"""
+        name = self.language(value)
+        return self.language_codes.get(name)
+
+    def language_for_country(self, value: Optional[str]) -> Optional[str]:
+        record = self.country_record(value)
+        return self.language(record[4]) if record else None
+
+    def location(self, value: Optional[str]) -> Optional[str]:
+        """Canonicalize a free-form location ("Berlin, germany " or "usa")"""
+        value = clean_text(value)
+        if not value:
+            return value
+        if "," in value:
+            place, _, country = value.rpartition(",")
+            record = self.country_record(country)
+            return f"{place.strip()}, {record[0]}" if record else value
+        record = self.country_record(value)
+        return record[0] if record else value
+
+
+canonical_registry = CanonicalRegistry()
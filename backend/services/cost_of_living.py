@@ -0,0 +1,261 @@
+import numpy as np
+from services.canonical_registry import canonical_registry, clean_text
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Approximate mid-range costs in USD:
+# (food per day, local transport per day, 1-bed city-centre rent per month, traveller daily budget)
+# The daily budget covers accommodation, food, transport and activities.
+COUNTRY_COSTS = {
+    "Argentina": (22, 3, 450, 70),
+    "Australia": (45, 10, 1900, 150),
+    "Austria": (40, 6, 1000, 130),
+    "Bangladesh": (8, 2, 180, 30),
+    "Belgium": (42, 6, 1000, 130),
+    "Brazil": (20, 3, 450, 65),
+    "Bulgaria": (20, 2, 450, 55),
+    "Canada": (42, 8, 1500, 140),
+    "Chile": (24, 4, 550, 75),
+    "China": (18, 3, 700, 70),
+    "Colombia": (15, 2, 400, 50),
+    "Croatia": (30, 4, 650, 90),
+    "Czech Republic": (28, 3, 850, 85),
+    "Denmark": (55, 9, 1300, 170),
+    "Egypt": (10, 2, 250, 40),
+    "Finland": (45, 7, 1000, 140),
+    "France": (45, 7, 1200, 150),
+    "Germany": (40, 7, 1100, 130),
+    "Greece": (32, 4, 550, 95),
+    "Hungary": (25, 3, 600, 75),
+    "Iceland": (65, 10, 1600, 200),
+    "India": (10, 2, 300, 35),
+    "Indonesia": (12, 3, 400, 45),
+    "Ireland": (48, 8, 2000, 160),
+    "Israel": (50, 6, 1500, 150),
+    "Italy": (40, 5, 950, 120),
+    "Japan": (35, 8, 900, 120),
+    "Kenya": (14, 3, 500, 55),
+    "Malaysia": (14, 2, 500, 50),
+    "Mexico": (20, 3, 600, 65),
+    "Morocco": (14, 2, 350, 45),
+    "Nepal": (9, 2, 200, 30),
+    "Netherlands": (45, 8, 1500, 145),
+    "New Zealand": (45, 9, 1300, 140),
+    "Nigeria": (12, 3, 450, 50),
+    "Norway": (60, 10, 1300, 180),
+    "Pakistan": (8, 2, 200, 30),
+    "Peru": (16, 2, 450, 55),
+    "Philippines": (13, 2, 450, 50),
+    "Poland": (25, 3, 750, 75),
+    "Portugal": (32, 4, 1000, 95),
+    "Qatar": (40, 6, 1700, 150),
+    "Romania": (22, 2, 500, 60),
+    "Russia": (22, 2, 600, 65),
+    "Saudi Arabia": (30, 6, 900, 110),
+    "Singapore": (40, 6, 3000, 170),
+    "South Africa": (22, 5, 650, 70),
+    "South Korea": (35, 5, 800, 110),
+    "Spain": (35, 5, 1000, 110),
+    "Sri Lanka": (10, 2, 300, 40),
+    "Sweden": (45, 8, 1100, 140),
+    "Switzerland": (70, 12, 2200, 220),
+    "Taiwan": (20, 3, 650, 75),
+    "Thailand": (15, 3, 500, 55),
+    "Turkey": (18, 2, 500, 60),
+    "United Arab Emirates": (40, 7, 2000, 160),
+    "United Kingdom": (45, 10, 1700, 150),
+    "United States": (50, 10, 1800, 170),
+    "Vietnam": (10, 2, 450, 40),
+}
+
+CITY_COSTS = {
+    ("Amsterdam", "Netherlands"): (50, 9, 2000, 170),
+    ("Bangalore", "India"): (12, 3, 400, 40),
+    ("Bangkok", "Thailand"): (17, 3, 650, 60),
+    ("Barcelona", "Spain"): (40, 6, 1200, 125),
+    ("Berlin", "Germany"): (40, 7, 1200, 130),
+    ("Boston", "United States"): (55, 9, 3000, 210),
+    ("Delhi", "India"): (11, 2, 350, 40),
+    ("Dubai", "United Arab Emirates"): (42, 8, 2200, 170),
+    ("Dublin", "Ireland"): (50, 9, 2300, 170),
+    ("Hong Kong", "China"): (40, 6, 2200, 150),
+    ("Hyderabad", "India"): (10, 2, 300, 35),
+    ("Istanbul", "Turkey"): (20, 2, 600, 65),
+    ("Kuala Lumpur", "Malaysia"): (16, 3, 650, 55),
+    ("Lisbon", "Portugal"): (35, 4, 1300, 110),
+    ("London", "United Kingdom"): (55, 12, 2800, 190),
+    ("Los Angeles", "United States"): (55, 10, 2800, 200),
+    ("Madrid", "Spain"): (38, 5, 1200, 115),
+    ("Melbourne", "Australia"): (45, 10, 1800, 150),
+    ("Mexico City", "Mexico"): (22, 2, 850, 70),
+    ("Milan", "Italy"): (45, 6, 1400, 140),
+    ("Montreal", "Canada"): (40, 7, 1300, 125),
+    ("Mumbai", "India"): (13, 2, 700, 45),
+    ("Munich", "Germany"): (45, 8, 1500, 150),
+    ("New York", "United States"): (65, 10, 4000, 250),
+    ("Osaka", "Japan"): (32, 7, 750, 110),
+    ("Paris", "France"): (55, 8, 1500, 180),
+    ("Prague", "Czech Republic"): (30, 3, 1000, 90),
+    ("Rome", "Italy"): (42, 5, 1200, 130),
+    ("San Francisco", "United States"): (65, 10, 3500, 240),
+    ("Seoul", "South Korea"): (35, 5, 900, 115),
+    ("Shanghai", "China"): (25, 4, 1200, 90),
+    ("Singapore", "Singapore"): (40, 6, 3000, 170),
+    ("Sydney", "Australia"): (50, 12, 2300, 170),
+    ("Tokyo", "Japan"): (40, 9, 1200, 140),
+    ("Toronto", "Canada"): (45, 9, 1900, 150),
+    ("Vancouver", "Canada"): (45, 9, 2000, 155),
+    ("Vienna", "Austria"): (40, 5, 1000, 130),
+    ("Warsaw", "Poland"): (27, 3, 900, 80),
+    ("Zurich", "Switzerland"): (75, 12, 2600, 240),
+}
+
+COLUMNS = ("food", "transport", "rent", "daily_budget")
+DAILY_COMPONENTS = ("food", "transport", "accommodation", "activities")
+
+# Share of the traveller daily budget spent on activities and attractions
+ACTIVITY_SHARE = 0.15
+# Maps a (food, transport, rent, daily_budget) row onto the daily
+# (food, transport, accommodation, activities) split; accommodation is what is
+# left of the daily budget after food, transport and activities.
+_DAILY_PROJECTION = np.array([
+    [1.0, 0.0, -1.0, 0.0],
+    [0.0, 1.0, -1.0, 0.0],
+    [0.0, 0.0, 0.0, 0.0],
+    [0.0, 0.0, 1.0 - ACTIVITY_SHARE, ACTIVITY_SHARE],
+])
+
+# Per-component multipliers for how someone travels
+STYLE_MULTIPLIERS = {
+    "budget": (0.6, 0.7, 0.5, 0.5),
+    "relaxed": (1.0, 0.8, 1.0, 0.7),
+    "moderate": (1.0, 1.0, 1.0, 1.0),
+    "packed": (1.0, 1.3, 1.0, 1.4),
+    "luxury": (2.0, 2.0, 2.5, 1.8),
+}
+BUFFER_SHARE = 0.05
+
+
+def _key(*parts: str) -> str:
+    return "|".join(" ".join(part.lower().split()) for part in parts)
+
+
+class CostOfLivingService:
+    """Local cost-of-living table held in NumPy arrays.
+
+    Rows are countries followed by cities; all figures are USD. Daily
+    components are precomputed once so lookups and trip totals are plain
+    array arithmetic.
+    """
+
+    def __init__(self):
+        rows: List[Tuple[float, ...]] = []
+        self._rows: Dict[str, int] = {}
+        self._city_rows: Dict[str, int] = {}
+        for country, values in COUNTRY_COSTS.items():
+            self._rows[_key(country)] = len(rows)
+            rows.append(values)
+        for (city, country), values in CITY_COSTS.items():
+            self._rows[_key(city, country)] = len(rows)
+            self._city_rows.setdefault(_key(city), len(rows))
+            rows.append(values)
+
+        self._values = np.array(rows, dtype=np.float64)
+        self._daily = np.maximum(self._values @ _DAILY_PROJECTION, 0.0)
+        self._styles = {style: np.array(factors) for style, factors in STYLE_MULTIPLIERS.items()}
+
+    def row(self, country: Optional[str], city: Optional[str] = None) -> Optional[int]:
+        """Row index for a city (preferred) or its country, or None if neither is known"""
+        country = canonical_registry.country(country) if country else ""
+        if city:
+            city = clean_text(city).split(",")[0]
+            index = self._rows.get(_key(city, country)) if country else None
+            if index is None and not country:
+                index = self._city_rows.get(_key(city))
+            if index is not None:
+                return index
+        return self._rows.get(_key(country)) if country else None
+
+    def costs(self, country: Optional[str], city: Optional[str] = None) -> Optional[Dict[str, float]]:
+        """Raw table figures (food, transport, rent, daily_budget)"""
+        index = self.row(country, city)
+        if index is None:
+            return None
+        return dict(zip(COLUMNS, self._values[index].round(2).tolist()))
+
+    def daily_costs(
+        self,
+        country: Optional[str],
+        city: Optional[str] = None,
+        style: str = "moderate"
+    ) -> Optional[Dict[str, float]]:
+        """Daily food/transport/accommodation/activities split for a travel style, plus the total"""
+        index = self.row(country, city)
+        if index is None:
+            return None
+        daily = self._daily[index] * self._style(style)
+        result = dict(zip(DAILY_COMPONENTS, daily.round(2).tolist()))
+        result["total"] = round(float(daily.sum()), 2)
+        return result
+
+    def trip_breakdown(
+        self,
+        country: Optional[str],
+        city: Optional[str],
+        days: int,
+        style: str = "moderate"
+    ) -> Optional[Dict[str, float]]:
+        """Trip budget in the itinerary BudgetBreakdown shape"""
+        index = self.row(country, city)
+        if index is None:
+            return None
+        food, transport, accommodation, attractions = (self._daily[index] * self._style(style) * max(days, 1)).tolist()
+        subtotal = food + transport + accommodation + attractions
+        return {
+            "accommodation": round(accommodation, 2),
+            "food": round(food, 2),
+            "transport": round(transport, 2),
+            "attractions": round(attractions, 2),
+            "buffer": round(subtotal * BUFFER_SHARE, 2),
+        }
+
+    def nightly_range(self, country: Optional[str], city: Optional[str] = None) -> Optional[Tuple[float, float]]:
+        """Typical (budget, mid-range) nightly accommodation cost"""
+        index = self.row(country, city)
+        if index is None:
+            return None
+        accommodation = self._daily[index][DAILY_COMPONENTS.index("accommodation")]
+        budget = accommodation * STYLE_MULTIPLIERS["budget"][DAILY_COMPONENTS.index("accommodation")]
+        return round(float(budget), 2), round(float(accommodation), 2)
+
+    def monthly_rent(self, country: Optional[str], city: Optional[str] = None) -> Optional[float]:
+        index = self.row(country, city)
+        if index is None:
+            return None
+        return round(float(self._values[index][COLUMNS.index("rent")]), 2)
+
+    def trip_totals(
+        self,
+        locations: Sequence[Tuple[Optional[str], Optional[str]]],
+        days: Sequence[int],
+        rates: Optional[Sequence[float]] = None,
+        style: str = "moderate"
+    ) -> np.ndarray:
+        """Total trip cost for many (country, city) pairs at once.
+
+        Unknown locations yield NaN. ``rates`` converts each total from USD into
+        another currency (one rate per location).
+        """
+        indices = [self.row(country, city) for country, city in locations]
+        known = np.array([index is not None for index in indices])
+        rows = np.array([index if index is not None else 0 for index in indices], dtype=np.intp)
+        totals = (self._daily[rows] * self._style(style)).sum(axis=1) * np.asarray(days, dtype=np.float64)
+        totals *= 1.0 + BUFFER_SHARE
+        if rates is not None:
+            totals *= np.asarray(rates, dtype=np.float64)
+        return np.where(known, totals.round(2), np.nan)
+
+    def _style(self, style: str) -> np.ndarray:
+        return self._styles.get((style or "").lower().strip(), self._styles["moderate"])
+
+
+cost_of_living_service = CostOfLivingService()
@@ -1,8 +1,15 @@
 from services.gemini_service import gemini_service
+from services.cache_service import StaleWhileRevalidateCache, make_cache_key, parse_json_response
 from models.culture import CultureGuide, CultureCategory
-import json
+from config import settings
+from typing import Dict, Any
 
 class CulturalGuideService:
+
+    def __init__(self):
+        self._cache = StaleWhileRevalidateCache(
+            "culture_guide", settings.cache_ttl_seconds, settings.cache_max_stale_seconds, settings.cache_max_entries
+        )
     
     async def get_cultural_guide(self, country: str, category: str = "all") -> CultureGuide:
         """Generate cultural intelligence guide for a country"""
@@ -18,6 +25,19 @@ class CulturalGuideService:
         
         if category != "all":
             categories_list = [cat for cat in categories_list if category.lower() in cat.lower()]
+
+        try:
+            data = await self._cache.get_or_revalidate(
+                make_cache_key(country, category),
+                lambda: self._generate_guide(country, categories_list)
+            )
+            return CultureGuide(**data)
+        except Exception as e:
+            print(f"Error generating cultural guide: {e}")
+            return self._create_fallback_guide(country, categories_list)
+
+    async def _generate_guide(self, country: str, categories_list: list) -> Dict[str, Any]:
+        """Generate the guide with Gemini; raises if the response cannot be parsed"""
         
         prompt = f"""You are a cultural expert. Provide detailed cultural intelligence for {country}.
 
@@ -40,26 +60,10 @@ Format your response as JSON:
 
 Be specific, practical, and include real examples. Focus on what newcomers need to know to avoid cultural misunderstandings."""
 
-        try:
-            response = await gemini_service.generate_response(prompt)
-            
-            # Parse JSON response
-            response_text = response.strip()
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-            
-            try:
-                data = json.loads(response_text)
-                return CultureGuide(**data)
-            except json.JSONDecodeError:
-                return self._create_fallback_guide(country, categories_list)
-                
-        except Exception as e:
-            print(f"Error generating cultural guide: {e}")
-            return self._create_fallback_guide(country, categories_list)
-    
+        response = await gemini_service.generate_response(prompt)
+        data = parse_json_response(response)
+        return CultureGuide(**data).model_dump()
+
     def _create_fallback_guide(self, country: str, categories: list) -> CultureGuide:
         """Create fallback cultural guide"""
         return CultureGuide(
@@ -1,9 +1,95 @@
 from services.gemini_service import gemini_service
-from models.currency import CurrencyConversionResponse, MoneyAdviceResponse
+from services.cache_service import StaleWhileRevalidateCache, TTLCache, make_cache_key, stay_length_bucket, parse_json_response
+from services.canonical_registry import canonical_registry
+from services.cost_of_living import cost_of_living_service
+from services.rate_history import rate_history
+from models.currency import CurrencyConversionResponse, MoneyAdviceResponse, RateHistoryResponse
+from typing import Dict, Optional
+import asyncio
+import time
 import requests
 from config import settings
 
+RATES_TTL_SECONDS = 3600
+# After a failed rate fetch, callers fail fast for this long instead of waiting on the API again
+RATES_RETRY_SECONDS = 60
+
 class CurrencyService:
+
+    def __init__(self):
+        self._rates_cache = TTLCache("exchange_rates", RATES_TTL_SECONDS, 256)
+        # Last rates fetched per base (kept past the TTL) and when a fetch last failed
+        self._last_rates: Dict[str, Dict[str, float]] = {}
+        self._rates_failed_at: Dict[str, float] = {}
+        self._rates_refresh: Dict[str, asyncio.Task] = {}
+        self._advice_cache = StaleWhileRevalidateCache(
+            "money_advice", settings.cache_ttl_seconds, settings.cache_max_stale_seconds, settings.cache_max_entries
+        )
+
+    async def get_rates(self, base_currency: str) -> Dict[str, float]:
+        """Latest exchange rates from base_currency, cached for an hour"""
+        base = base_currency.upper()
+
+        async def fetch():
+            if time.time() - self._rates_failed_at.get(base, 0.0) < RATES_RETRY_SECONDS:
+                raise RuntimeError(f"Exchange rates for {base} are unavailable; retrying shortly")
+            url = f"https://api.exchangerate-api.com/v4/latest/{base}"
+            try:
+                response = await asyncio.to_thread(requests.get, url, timeout=5)
+                rates = response.json()["rates"]
+            except Exception:
+                self._rates_failed_at[base] = time.time()
+                raise
+            self._last_rates[base] = rates
+            self._record_history(base, rates)
+            return rates
+
+        return await self._rates_cache.get_or_create(base, fetch)
+
+    def last_known_rates(self, base_currency: str) -> Optional[Dict[str, float]]:
+        """Cached or last fetched rates without waiting on the network.
+
+        When the cached rates are missing or expired a refresh is started in the
+        background and the previous rates (if any) are returned meanwhile.
+        """
+        base = base_currency.upper()
+        rates = self._rates_cache.get(base)
+        if rates is not None:
+            return rates
+        if base not in self._rates_refresh:
+            task = asyncio.create_task(self._refresh_rates(base))
+            self._rates_refresh[base] = task
+            task.add_done_callback(lambda _: self._rates_refresh.pop(base, None))
+        return self._last_rates.get(base)
+
+    async def _refresh_rates(self, base: str) -> None:
+        try:
+            await self.get_rates(base)
+        except Exception as e:
+            print(f"Error refreshing exchange rates for {base}: {e}")
+
+    def _record_history(self, base: str, rates: Dict[str, float]) -> None:
+        """Add today's rates (rebased to USD) to the local history file"""
+        usd = 1.0 if base == "USD" else rates.get("USD")
+        if not usd:
+            return
+        try:
+            rate_history.record({code: rate / usd for code, rate in rates.items()})
+        except Exception as e:
+            print(f"Error recording rate history: {e}")
+
+    async def get_rate_history(self, base_currency: str, target_currency: str, days: int) -> Optional[RateHistoryResponse]:
+        """Recorded daily rates between two currencies with mean/min/max and percent change"""
+        base, target = base_currency.upper(), target_currency.upper()
+        try:
+            # Make sure today's rates are recorded before reading
+            await self.get_rates("USD")
+        except Exception as e:
+            print(f"Error fetching rates for history: {e}")
+        series = rate_history.series(base, target, days)
+        if series is None:
+            return None
+        return RateHistoryResponse(base_currency=base, target_currency=target, **series)
     
     async def convert_currency(
         self, 
@@ -15,12 +101,10 @@ class CurrencyService:
         
         try:
             # Use free exchange rate API
-            url = f"https://api.exchangerate-api.com/v4/latest/{from_currency.upper()}"
-            response = requests.get(url, timeout=5)
-            data = response.json()
+            rates = await self.get_rates(from_currency)
             
-            if to_currency.upper() in data.get('rates', {}):
-                rate = data['rates'][to_currency.upper()]
+            if to_currency.upper() in rates:
+                rate = rates[to_currency.upper()]
                 converted = amount * rate
                 
                 # Get AI advice
@@ -77,32 +161,20 @@ Include tips about:
         duration_days: int
     ) -> MoneyAdviceResponse:
         """Get comprehensive money advice for destination country"""
-        
-        prompt = f"""Provide financial advice for someone traveling to {destination_country} for {duration_days} days.
-
-Include:
-1. Cash vs Card usage (which is preferred, acceptance rates)
-2. ATM availability and fees
-3. Currency exchange tips (best places, what to avoid)
-4. Local money habits and payment culture
-5. Estimated daily budget for basic expenses (food, transport, misc)
-
-Be specific and practical. Keep each section to 2-3 sentences."""
 
+        # Budget figures come from the local cost table per request (with the last
+        # known rates, never a blocking fetch); the model narrative is cached per
+        # country and stay length
+        local_budget = self._local_daily_budget(destination_country, duration_days)
+        stay_length = stay_length_bucket(duration_days)
         try:
-            response = await gemini_service.generate_response(prompt)
-            
-            # Parse response into sections (simple split for now)
-            lines = response.strip().split('\n')
-            
-            return MoneyAdviceResponse(
-                country=destination_country,
-                cash_vs_card_advice=self._extract_section(lines, "cash", "card"),
-                atm_availability=self._extract_section(lines, "atm"),
-                exchange_tips=self._extract_section(lines, "exchange", "currency"),
-                local_money_habits=self._extract_section(lines, "local", "habit", "payment"),
-                estimated_daily_budget=self._extract_section(lines, "budget", "cost", "expense")
+            advice = await self._advice_cache.get_or_revalidate(
+                make_cache_key(destination_country, stay_length),
+                lambda: self._generate_money_advice(destination_country, stay_length)
             )
+            if local_budget:
+                advice["estimated_daily_budget"] = local_budget
+            return MoneyAdviceResponse(country=destination_country, **advice)
             
         except Exception as e:
             print(f"Error getting money advice: {e}")
@@ -112,17 +184,54 @@ Be specific and practical. Keep each section to 2-3 sentences."""
                 atm_availability="ATMs are generally available in urban areas.",
                 exchange_tips="Exchange at official banks or authorized dealers.",
                 local_money_habits="Observe local payment customs and follow local practices.",
-                estimated_daily_budget=f"Budget varies by lifestyle; research typical costs for {destination_country}."
+                estimated_daily_budget=local_budget or f"Budget varies by lifestyle; research typical costs for {destination_country}."
             )
-    
-    def _extract_section(self, lines: list, *keywords) -> str:
-        """Extract section from response based on keywords"""
-        for line in lines:
-            if any(kw.lower() in line.lower() for kw in keywords):
-                # Get this line and next few lines
-                idx = lines.index(line)
-                section = ' '.join(lines[idx:idx+3])
-                return section[:200]  # Limit length
-        return "Information not available"
+
+    async def _generate_money_advice(self, destination_country: str, stay_length: str) -> Dict[str, str]:
+        """Generate the money advice sections as structured JSON"""
+        daily = cost_of_living_service.daily_costs(destination_country)
+        budget_hint = (
+            f" Typical daily costs are about ${daily['total']:.0f} (food ${daily['food']:.0f}, transport ${daily['transport']:.0f}); stay consistent with these."
+            if daily else ""
+        )
+
+        prompt = f"""Provide financial advice for someone staying in {destination_country} for {stay_length}.
+
+Provide the response in the following JSON format:
+{{
+    "cash_vs_card_advice": "Cash vs Card usage (which is preferred, acceptance rates)",
+    "atm_availability": "ATM availability and fees",
+    "exchange_tips": "Currency exchange tips (best places, what to avoid)",
+    "local_money_habits": "Local money habits and payment culture",
+    "estimated_daily_budget": "Estimated daily budget for basic expenses (food, transport, misc)"
+}}
+
+Be specific and practical. Keep each section to 2-3 sentences.{budget_hint}"""
+
+        response = await gemini_service.generate_response(prompt)
+        data = parse_json_response(response)
+        return MoneyAdviceResponse(country=destination_country, **data).model_dump(exclude={"country"})
+
+    def _local_daily_budget(self, destination_country: str, duration_days: int) -> Optional[str]:
+        """Daily and trip budget from the cost-of-living table, in USD and local currency"""
+        daily = cost_of_living_service.daily_costs(destination_country)
+        if daily is None:
+            return None
+
+        text = (
+            f"About ${daily['total']:.0f}/day (food ${daily['food']:.0f}, transport ${daily['transport']:.0f}, "
+            f"accommodation ${daily['accommodation']:.0f}, activities ${daily['activities']:.0f})"
+        )
+        total = cost_of_living_service.trip_totals([(destination_country, None)], [duration_days])[0]
+        currency = canonical_registry.currency_for_country(destination_country)
+        rate = None
+        if currency and currency != "USD":
+            rate = (self.last_known_rates("USD") or {}).get(currency)
+        if rate:
+            text += f" ≈ {daily['total'] * rate:,.0f} {currency}/day"
+            text += f"; about ${total:,.0f} ≈ {total * rate:,.0f} {currency} for {duration_days} days including a small buffer."
+        else:
+            text += f"; about ${total:,.0f} for {duration_days} days including a small buffer."
+        return text
 
 currency_service = CurrencyService()
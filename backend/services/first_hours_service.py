@@ -1,8 +1,15 @@
 from services.gemini_service import gemini_service
+from services.cache_service import StaleWhileRevalidateCache, make_cache_key, parse_json_response
 from models.first_hours import FirstHoursResponse, TimeSlotTasks
-import json
+from config import settings
+from typing import Dict, Any
 
 class FirstHoursService:
+
+    def __init__(self):
+        self._cache = StaleWhileRevalidateCache(
+            "first_hours", settings.cache_ttl_seconds, settings.cache_max_stale_seconds, settings.cache_max_entries
+        )
     
     async def generate_checklist(
         self,
@@ -11,6 +18,19 @@ class FirstHoursService:
         arrival_time: str = "daytime"
     ) -> FirstHoursResponse:
         """Generate first 48 hours checklist"""
+
+        try:
+            data = await self._cache.get_or_revalidate(
+                make_cache_key(destination_country, city, arrival_time),
+                lambda: self._generate_checklist(destination_country, city, arrival_time)
+            )
+            return FirstHoursResponse(**data)
+        except Exception as e:
+            print(f"Error generating first hours checklist: {e}")
+            return self._create_fallback_checklist(destination_country)
+
+    async def _generate_checklist(self, destination_country: str, city: str = None, arrival_time: str = "daytime") -> Dict[str, Any]:
+        """Generate the checklist with Gemini; raises if the response cannot be parsed"""
         
         location = f"{city}, {destination_country}" if city else destination_country
         
@@ -46,22 +66,10 @@ Day 2: Bank account, transport card, grocery shopping
 
 Be specific to {destination_country}'s requirements and {arrival_time} considerations."""
 
-        try:
-            response = await gemini_service.generate_response(prompt)
-            response_text = response.strip()
-            
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-            
-            data = json.loads(response_text)
-            return FirstHoursResponse(**data)
-            
-        except Exception as e:
-            print(f"Error generating first hours checklist: {e}")
-            return self._create_fallback_checklist(destination_country)
-    
+        response = await gemini_service.generate_response(prompt)
+        data = parse_json_response(response)
+        return FirstHoursResponse(**data).model_dump()
+
     def _create_fallback_checklist(self, country: str) -> FirstHoursResponse:
         """Create fallback checklist"""
         return FirstHoursResponse(
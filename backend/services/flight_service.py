@@ -0,0 +1,262 @@
+from services.gemini_service import gemini_service
+from services.cache_service import StaleWhileRevalidateCache, make_cache_key, parse_json_response
+from services.snapshot_store import snapshot_store
+from config import settings
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import json
+import re
+
+CABIN_CLASSES = {"economy", "premium economy", "business", "first"}
+
+# Built-in static content; precompute.py copies it into the snapshot under
+# "flight_content:<name>" so a rebuilt snapshot can ship updated versions.
+STATIC_CONTENT: Dict[str, Dict[str, Any]] = {
+    "coupons": {
+        "coupons": [
+            {
+                "code": "SAVE15",
+                "provider": "Expedia",
+                "discount": "Up to $15 OFF",
+                "description": "Book flights + hotel packages",
+                "expiryDate": "Ongoing",
+                "link": "https://www.expedia.com"
+            },
+            {
+                "code": "СТУДЕНТ",
+                "provider": "StudentUniverse",
+                "discount": "Extra discounts",
+                "description": "Student verification required",
+                "expiryDate": "Ongoing",
+                "link": "https://www.studentuniverse.com"
+            },
+            {
+                "code": "APP10",
+                "provider": "Booking.com",
+                "discount": "$10-25 OFF",
+                "description": "First app booking",
+                "expiryDate": "Ongoing",
+                "link": "https://www.booking.com"
+            },
+            {
+                "code": "MOBILE",
+                "provider": "Skyscanner",
+                "discount": "Mobile-only deals",
+                "description": "Book through mobile app",
+                "expiryDate": "Ongoing",
+                "link": "https://www.skyscanner.com"
+            },
+            {
+                "code": "EMAIL10",
+                "provider": "Kayak",
+                "discount": "Email signup bonus",
+                "description": "Subscribe to price alerts",
+                "expiryDate": "Ongoing",
+                "link": "https://www.kayak.com"
+            },
+            {
+                "code": "CHASE",
+                "provider": "Chase Sapphire",
+                "discount": "5x points",
+                "description": "Use Chase Sapphire card",
+                "expiryDate": "Ongoing",
+                "link": "https://creditcards.chase.com"
+            }
+        ],
+        "tips": [
+            "Sign up for airline newsletters for exclusive codes",
+            "Check RetailMeNot and Honey browser extension",
+            "Book through cashback sites like Rakuten",
+            "Use credit cards with travel rewards",
+            "Check for student, military, or senior discounts"
+        ]
+    }
+}
+
+
+def json_body(data: Any) -> Tuple[bytes, str]:
+    """Serialize a {"data": ...} response once and derive its ETag from the bytes"""
+    body = json.dumps({"data": data}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return body, f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def route_month(departure_date: Optional[str]) -> str:
+    """Month bucket (YYYY-MM) for a departure date, or "flexible" when none is given"""
+    match = re.match(r"\s*(\d{4})-(\d{1,2})", departure_date or "")
+    if not match:
+        return "flexible"
+    return f"{match.group(1)}-{int(match.group(2)):02d}"
+
+
+def booking_link(from_location: str, to: str) -> str:
+    """Skyscanner search link for a route"""
+    from_code = from_location.replace(" ", "-")
+    to_code = to.replace(" ", "-")
+    return f"https://www.skyscanner.com/transport/flights/{from_code}/{to_code}/"
+
+
+class FlightService:
+
+    def __init__(self):
+        # Deals for a route barely change within a day: serve cached entries and refresh them in the background
+        self._deals_cache = StaleWhileRevalidateCache(
+            "flight_deals", settings.flight_deals_ttl_seconds, settings.flight_deals_max_stale_seconds,
+            settings.cache_max_entries
+        )
+        # Booking tips depend only on (destination, travelType); precompute.py snapshots popular ones
+        self._tips_cache = StaleWhileRevalidateCache(
+            "flight_booking_tips", settings.cache_ttl_seconds, settings.cache_max_stale_seconds,
+            settings.cache_max_entries
+        )
+        self._static: Dict[str, Tuple[bytes, str]] = {}
+
+    def load_content(self) -> None:
+        """Serialize static content once, preferring the versions shipped in the snapshot"""
+        for name, default in STATIC_CONTENT.items():
+            self._static[name] = json_body(snapshot_store.get(f"flight_content:{name}") or default)
+
+    def static_content(self, name: str) -> Tuple[bytes, str]:
+        """Pre-serialized response body and ETag for a static content entry"""
+        if name not in self._static:
+            self.load_content()
+        return self._static[name]
+
+    async def get_booking_tips(self, destination: str, travel_type: str = "relocation") -> Dict[str, Any]:
+        """Booking tips for a destination and travel type"""
+        return await self._tips_cache.get_or_revalidate(
+            make_cache_key(destination, travel_type),
+            lambda: self._generate_booking_tips(destination, travel_type.strip().lower())
+        )
+
+    async def get_deals(self, from_location: str, to: str, departure_date: Optional[str] = None,
+                        class_type: str = "economy", stops: str = "any") -> Dict[str, Any]:
+        """Flight deals, price insights and recommendations for a route and month.
+
+        Deals are cached per (from, to, month, class); the stops preference is
+        applied to the cached deals rather than being part of the key.
+        """
+        month = route_month(departure_date)
+        cabin = class_type.strip().lower()
+        if cabin not in CABIN_CLASSES:
+            cabin = "economy"
+
+        data = await self._deals_cache.get_or_revalidate(
+            make_cache_key(from_location, to, month, cabin),
+            lambda: self._generate_deals(from_location, to, month, cabin)
+        )
+        data["deals"] = self._filter_stops(data["deals"], stops)
+        return data
+
+    def _filter_stops(self, deals: List[Dict[str, Any]], stops: str) -> List[Dict[str, Any]]:
+        """Apply the stops preference locally; all deals are kept if none match"""
+        preference = stops.strip().lower()
+        if preference in ("nonstop", "direct", "0"):
+            matching = [deal for deal in deals if re.search(r"non-?stop|direct", str(deal.get("stops", "")), re.I)]
+        elif preference in ("1", "1 stop", "one stop", "max 1"):
+            matching = [deal for deal in deals if not re.search(r"[2-9] stops", str(deal.get("stops", "")), re.I)]
+        else:
+            return deals
+        return matching or deals
+
+    async def _generate_deals(self, from_location: str, to: str, month: str, cabin: str) -> Dict[str, Any]:
+        """Generate deals for a route key with Gemini; raises if the response cannot be used"""
+        travel_month = "Flexible" if month == "flexible" else month
+
+        prompt = f"""
+    As a flight booking expert, provide the best flight deals and options for the following trip:
+
+    From: {from_location}
+    To: {to}
+    Departure Month: {travel_month}
+    Class: {cabin}
+
+    Provide a JSON response with:
+    {{
+        "deals": [
+            {{
+                "airline": "airline name",
+                "route": "departure → destination",
+                "price": "$XXX",
+                "originalPrice": "$XXX (if on sale)",
+                "savings": "$XX or XX%",
+                "date": "suggested date",
+                "duration": "flight duration",
+                "stops": "nonstop/1 stop/2 stops",
+                "badge": "Best Value/Lowest Price/Fastest/etc"
+            }}
+        ],
+        "priceInsights": {{
+            "bestTimeToBook": "timing recommendation",
+            "priceTrend": "increasing/decreasing/stable",
+            "averagePrice": "$XXX",
+            "cheapestMonth": "month name"
+        }},
+        "recommendations": [
+            "Specific actionable booking recommendations"
+        ]
+    }}
+
+    Include 4-6 real flight options with realistic pricing based on the route,
+    mixing nonstop and connecting flights where the route has them.
+    """
+
+        response = await gemini_service.generate_response(prompt)
+        data = parse_json_response(response)
+        if not isinstance(data.get("deals"), list) or not data["deals"]:
+            raise ValueError("Flight deals response has no deals")
+
+        # The link depends only on the route, so it is built once into the cached record
+        link = booking_link(from_location, to)
+        data["deals"] = [{**deal, "bookingLink": link} for deal in data["deals"] if isinstance(deal, dict)]
+        data.setdefault("priceInsights", {})
+        data.setdefault("recommendations", [])
+        return data
+
+    async def _generate_booking_tips(self, destination: str, travel_type: str) -> Dict[str, Any]:
+        """Generate booking tips with Gemini; raises if the response cannot be used"""
+        prompt = f"""
+    As a flight booking expert, provide comprehensive tips for booking flights to {destination}
+    for {travel_type} purposes.
+
+    Provide a JSON response with:
+    {{
+        "tips": [
+            {{
+                "title": "Tip title",
+                "description": "Detailed explanation of the tip",
+                "savings": "Potential savings estimate"
+            }}
+        ],
+        "bestPractices": [
+            "Best practice recommendations"
+        ],
+        "mistakes ToAvoid": [
+            "Common mistakes people make when booking"
+        ],
+        "tools": [
+            {{
+                "name": "Tool/website name",
+                "purpose": "What it helps with",
+                "link": "https://..."
+            }}
+        ]
+    }}
+
+    Include 8-10 actionable tips covering:
+    - Best time to book
+    - Price comparison strategies
+    - Flexible date searching
+    - Hidden fees to watch for
+    - Booking directly vs. third-party
+    - Using points/miles
+    - Error fares
+    - Price tracking
+    """
+
+        response = await gemini_service.generate_response(prompt)
+        data = parse_json_response(response)
+        if not isinstance(data.get("tips"), list) or not data["tips"]:
+            raise ValueError("Booking tips response has no tips")
+        return data
+
+flight_service = FlightService()
@@ -1,6 +1,6 @@
 import google.generativeai as genai
 from config import settings
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 
 class GeminiService:
     _instance = None
@@ -64,13 +64,25 @@ class GeminiService:
             print(f"Error generating multimodal response: {e}")
             return f"Error: {str(e)}"
     
-    async def translate_text(self, text: str, source_lang: str, target_lang: str) -> str:
-        """Translate text using Gemini (Always using Flash for speed)"""
+    async def translate_text(self, text: str, source_lang: str, target_lang: str,
+                             examples: Optional[List[Tuple[str, str]]] = None) -> str:
+        """Translate text using Gemini (Always using Flash for speed).
+
+        examples are (source, translation) pairs of similar sentences, given
+        to the model as reference wording only.
+        """
         try:
             if not self.flash_model:
                 return "Translation service unavailable"
             
-            prompt = f"""Translate the following text from {source_lang} to {target_lang}.
+            reference = ""
+            if examples:
+                pairs = "\n".join(f"{source} => {translation}" for source, translation in examples)
+                reference = f"""Earlier translations of similar sentences, for consistent wording only (they are not the answer):
+{pairs}
+
+"""
+            prompt = f"""{reference}Translate the following text from {source_lang} to {target_lang}.
 Only provide the translation, nothing else.
 
 Text: {text}
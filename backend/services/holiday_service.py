@@ -0,0 +1,417 @@
+from datetime import date, timedelta
+from services.canonical_registry import canonical_registry
+from typing import Dict, List, Optional, Tuple
+
+MON, TUE, WED, THU, FRI, SAT, SUN = range(7)
+
+# Rules per country:
+#   ("fixed", month, day)
+#   ("easter", offset)                        days from Western Easter Sunday
+#   ("nth", month, weekday, n)                n-th weekday of the month; n=-1 is the last
+#   ("on_or_after", month, day, weekday)      first weekday on or after the date
+#   ("on_or_before", month, day, weekday)     last weekday on or before the date
+#   ("equinox", "spring" | "autumn")          Japanese equinox days
+#   ("friday_or_first_monday", month)         the 1st if it is a Friday, else the first Monday
+# An optional trailing weekend policy moves holidays that fall on a weekend:
+#   "us"        Saturday -> Friday, Sunday -> Monday
+#   "next"      Saturday/Sunday -> next free weekday
+#   "sunday"    Sunday -> next free day
+HOLIDAY_RULES = {
+    "United States": [
+        ("New Year's Day", ("fixed", 1, 1), "us"),
+        ("Martin Luther King Jr. Day", ("nth", 1, MON, 3)),
+        ("Presidents' Day", ("nth", 2, MON, 3)),
+        ("Memorial Day", ("nth", 5, MON, -1)),
+        ("Juneteenth", ("fixed", 6, 19), "us"),
+        ("Independence Day", ("fixed", 7, 4), "us"),
+        ("Labor Day", ("nth", 9, MON, 1)),
+        ("Columbus Day", ("nth", 10, MON, 2)),
+        ("Veterans Day", ("fixed", 11, 11), "us"),
+        ("Thanksgiving Day", ("nth", 11, THU, 4)),
+        ("Christmas Day", ("fixed", 12, 25), "us"),
+    ],
+    "United Kingdom": [
+        ("New Year's Day", ("fixed", 1, 1), "next"),
+        ("Good Friday", ("easter", -2)),
+        ("Easter Monday", ("easter", 1)),
+        ("Early May Bank Holiday", ("nth", 5, MON, 1)),
+        ("Spring Bank Holiday", ("nth", 5, MON, -1)),
+        ("Summer Bank Holiday", ("nth", 8, MON, -1)),
+        ("Christmas Day", ("fixed", 12, 25), "next"),
+        ("Boxing Day", ("fixed", 12, 26), "next"),
+    ],
+    "Ireland": [
+        ("New Year's Day", ("fixed", 1, 1), "next"),
+        ("St Brigid's Day", ("friday_or_first_monday", 2)),
+        ("St Patrick's Day", ("fixed", 3, 17), "next"),
+        ("Easter Monday", ("easter", 1)),
+        ("May Bank Holiday", ("nth", 5, MON, 1)),
+        ("June Bank Holiday", ("nth", 6, MON, 1)),
+        ("August Bank Holiday", ("nth", 8, MON, 1)),
+        ("October Bank Holiday", ("nth", 10, MON, -1)),
+        ("Christmas Day", ("fixed", 12, 25), "next"),
+        ("St Stephen's Day", ("fixed", 12, 26), "next"),
+    ],
+    "Canada": [
+        ("New Year's Day", ("fixed", 1, 1), "next"),
+        ("Good Friday", ("easter", -2)),
+        ("Victoria Day", ("on_or_before", 5, 24, MON)),
+        ("Canada Day", ("fixed", 7, 1), "next"),
+        ("Civic Holiday", ("nth", 8, MON, 1)),
+        ("Labour Day", ("nth", 9, MON, 1)),
+        ("National Day for Truth and Reconciliation", ("fixed", 9, 30)),
+        ("Thanksgiving", ("nth", 10, MON, 2)),
+        ("Remembrance Day", ("fixed", 11, 11)),
+        ("Christmas Day", ("fixed", 12, 25), "next"),
+        ("Boxing Day", ("fixed", 12, 26), "next"),
+    ],
+    "Australia": [
+        ("New Year's Day", ("fixed", 1, 1), "next"),
+        ("Australia Day", ("fixed", 1, 26), "next"),
+        ("Good Friday", ("easter", -2)),
+        ("Easter Saturday", ("easter", -1)),
+        ("Easter Monday", ("easter", 1)),
+        ("Anzac Day", ("fixed", 4, 25)),
+        ("King's Birthday", ("nth", 6, MON, 2)),
+        ("Christmas Day", ("fixed", 12, 25), "next"),
+        ("Boxing Day", ("fixed", 12, 26), "next"),
+    ],
+    "New Zealand": [
+        ("New Year's Day", ("fixed", 1, 1), "next"),
+        ("Day after New Year's Day", ("fixed", 1, 2), "next"),
+        ("Waitangi Day", ("fixed", 2, 6), "next"),
+        ("Good Friday", ("easter", -2)),
+        ("Easter Monday", ("easter", 1)),
+        ("Anzac Day", ("fixed", 4, 25), "next"),
+        ("King's Birthday", ("nth", 6, MON, 1)),
+        ("Labour Day", ("nth", 10, MON, 4)),
+        ("Christmas Day", ("fixed", 12, 25), "next"),
+        ("Boxing Day", ("fixed", 12, 26), "next"),
+    ],
+    "Germany": [
+        ("Neujahr (New Year's Day)", ("fixed", 1, 1)),
+        ("Karfreitag (Good Friday)", ("easter", -2)),
+        ("Ostermontag (Easter Monday)", ("easter", 1)),
+        ("Tag der Arbeit (Labour Day)", ("fixed", 5, 1)),
+        ("Christi Himmelfahrt (Ascension Day)", ("easter", 39)),
+        ("Pfingstmontag (Whit Monday)", ("easter", 50)),
+        ("Tag der Deutschen Einheit (German Unity Day)", ("fixed", 10, 3)),
+        ("Erster Weihnachtstag (Christmas Day)", ("fixed", 12, 25)),
+        ("Zweiter Weihnachtstag (St Stephen's Day)", ("fixed", 12, 26)),
+    ],
+    "Austria": [
+        ("Neujahr (New Year's Day)", ("fixed", 1, 1)),
+        ("Heilige Drei Könige (Epiphany)", ("fixed", 1, 6)),
+        ("Ostermontag (Easter Monday)", ("easter", 1)),
+        ("Staatsfeiertag (Labour Day)", ("fixed", 5, 1)),
+        ("Christi Himmelfahrt (Ascension Day)", ("easter", 39)),
+        ("Pfingstmontag (Whit Monday)", ("easter", 50)),
+        ("Fronleichnam (Corpus Christi)", ("easter", 60)),
+        ("Mariä Himmelfahrt (Assumption Day)", ("fixed", 8, 15)),
+        ("Nationalfeiertag (National Day)", ("fixed", 10, 26)),
+        ("Allerheiligen (All Saints' Day)", ("fixed", 11, 1)),
+        ("Mariä Empfängnis (Immaculate Conception)", ("fixed", 12, 8)),
+        ("Christtag (Christmas Day)", ("fixed", 12, 25)),
+        ("Stefanitag (St Stephen's Day)", ("fixed", 12, 26)),
+    ],
+    "Switzerland": [
+        ("New Year's Day", ("fixed", 1, 1)),
+        ("Good Friday", ("easter", -2)),
+        ("Easter Monday", ("easter", 1)),
+        ("Ascension Day", ("easter", 39)),
+        ("Whit Monday", ("easter", 50)),
+        ("Swiss National Day", ("fixed", 8, 1)),
+        ("Christmas Day", ("fixed", 12, 25)),
+        ("St Stephen's Day", ("fixed", 12, 26)),
+    ],
+    "France": [
+        ("Jour de l'an (New Year's Day)", ("fixed", 1, 1)),
+        ("Lundi de Pâques (Easter Monday)", ("easter", 1)),
+        ("Fête du Travail (Labour Day)", ("fixed", 5, 1)),
+        ("Victoire 1945 (Victory in Europe Day)", ("fixed", 5, 8)),
+        ("Ascension", ("easter", 39)),
+        ("Lundi de Pentecôte (Whit Monday)", ("easter", 50)),
+        ("Fête nationale (Bastille Day)", ("fixed", 7, 14)),
+        ("Assomption (Assumption Day)", ("fixed", 8, 15)),
+        ("Toussaint (All Saints' Day)", ("fixed", 11, 1)),
+        ("Armistice 1918", ("fixed", 11, 11)),
+        ("Noël (Christmas Day)", ("fixed", 12, 25)),
+    ],
+    "Belgium": [
+        ("New Year's Day", ("fixed", 1, 1)),
+        ("Easter Monday", ("easter", 1)),
+        ("Labour Day", ("fixed", 5, 1)),
+        ("Ascension Day", ("easter", 39)),
+        ("Whit Monday", ("easter", 50)),
+        ("National Day", ("fixed", 7, 21)),
+        ("Assumption Day", ("fixed", 8, 15)),
+        ("All Saints' Day", ("fixed", 11, 1)),
+        ("Armistice Day", ("fixed", 11, 11)),
+        ("Christmas Day", ("fixed", 12, 25)),
+    ],
+    "Netherlands": [
+        ("Nieuwjaarsdag (New Year's Day)", ("fixed", 1, 1)),
+        ("Goede Vrijdag (Good Friday)", ("easter", -2)),
+        ("Eerste Paasdag (Easter Sunday)", ("easter", 0)),
+        ("Tweede Paasdag (Easter Monday)", ("easter", 1)),
+        ("Koningsdag (King's Day)", ("fixed", 4, 27)),
+        ("Bevrijdingsdag (Liberation Day)", ("fixed", 5, 5)),
+        ("Hemelvaartsdag (Ascension Day)", ("easter", 39)),
+        ("Eerste Pinksterdag (Whit Sunday)", ("easter", 49)),
+        ("Tweede Pinksterdag (Whit Monday)", ("easter", 50)),
+        ("Eerste Kerstdag (Christmas Day)", ("fixed", 12, 25)),
+        ("Tweede Kerstdag (Boxing Day)", ("fixed", 12, 26)),
+    ],
+    "Spain": [
+        ("Año Nuevo (New Year's Day)", ("fixed", 1, 1)),
+        ("Epifanía del Señor (Epiphany)", ("fixed", 1, 6)),
+        ("Viernes Santo (Good Friday)", ("easter", -2)),
+        ("Fiesta del Trabajo (Labour Day)", ("fixed", 5, 1)),
+        ("Asunción de la Virgen (Assumption Day)", ("fixed", 8, 15)),
+        ("Fiesta Nacional de España", ("fixed", 10, 12)),
+        ("Todos los Santos (All Saints' Day)", ("fixed", 11, 1)),
+        ("Día de la Constitución (Constitution Day)", ("fixed", 12, 6)),
+        ("Inmaculada Concepción (Immaculate Conception)", ("fixed", 12, 8)),
+        ("Navidad (Christmas Day)", ("fixed", 12, 25)),
+    ],
+    "Portugal": [
+        ("Ano Novo (New Year's Day)", ("fixed", 1, 1)),
+        ("Sexta-feira Santa (Good Friday)", ("easter", -2)),
+        ("Páscoa (Easter Sunday)", ("easter", 0)),
+        ("Dia da Liberdade (Freedom Day)", ("fixed", 4, 25)),
+        ("Dia do Trabalhador (Labour Day)", ("fixed", 5, 1)),
+        ("Corpo de Deus (Corpus Christi)", ("easter", 60)),
+        ("Dia de Portugal (Portugal Day)", ("fixed", 6, 10)),
+        ("Assunção de Nossa Senhora (Assumption Day)", ("fixed", 8, 15)),
+        ("Implantação da República (Republic Day)", ("fixed", 10, 5)),
+        ("Dia de Todos os Santos (All Saints' Day)", ("fixed", 11, 1)),
+        ("Restauração da Independência (Restoration of Independence)", ("fixed", 12, 1)),
+        ("Imaculada Conceição (Immaculate Conception)", ("fixed", 12, 8)),
+        ("Natal (Christmas Day)", ("fixed", 12, 25)),
+    ],
+    "Italy": [
+        ("Capodanno (New Year's Day)", ("fixed", 1, 1)),
+        ("Epifania (Epiphany)", ("fixed", 1, 6)),
+        ("Pasqua (Easter Sunday)", ("easter", 0)),
+        ("Lunedì dell'Angelo (Easter Monday)", ("easter", 1)),
+        ("Festa della Liberazione (Liberation Day)", ("fixed", 4, 25)),
+        ("Festa del Lavoro (Labour Day)", ("fixed", 5, 1)),
+        ("Festa della Repubblica (Republic Day)", ("fixed", 6, 2)),
+        ("Ferragosto (Assumption Day)", ("fixed", 8, 15)),
+        ("Ognissanti (All Saints' Day)", ("fixed", 11, 1)),
+        ("Immacolata Concezione (Immaculate Conception)", ("fixed", 12, 8)),
+        ("Natale (Christmas Day)", ("fixed", 12, 25)),
+        ("Santo Stefano (St Stephen's Day)", ("fixed", 12, 26)),
+    ],
+    "Poland": [
+        ("Nowy Rok (New Year's Day)", ("fixed", 1, 1)),
+        ("Trzech Króli (Epiphany)", ("fixed", 1, 6)),
+        ("Wielkanoc (Easter Sunday)", ("easter", 0)),
+        ("Poniedziałek Wielkanocny (Easter Monday)", ("easter", 1)),
+        ("Święto Pracy (Labour Day)", ("fixed", 5, 1)),
+        ("Święto Konstytucji 3 Maja (Constitution Day)", ("fixed", 5, 3)),
+        ("Zielone Świątki (Whit Sunday)", ("easter", 49)),
+        ("Boże Ciało (Corpus Christi)", ("easter", 60)),
+        ("Wniebowzięcie NMP (Assumption Day)", ("fixed", 8, 15)),
+        ("Wszystkich Świętych (All Saints' Day)", ("fixed", 11, 1)),
+        ("Święto Niepodległości (Independence Day)", ("fixed", 11, 11)),
+        ("Wigilia (Christmas Eve)", ("fixed", 12, 24)),
+        ("Boże Narodzenie (Christmas Day)", ("fixed", 12, 25)),
+        ("Drugi dzień Bożego Narodzenia (Second Day of Christmas)", ("fixed", 12, 26)),
+    ],
+    "Sweden": [
+        ("Nyårsdagen (New Year's Day)", ("fixed", 1, 1)),
+        ("Trettondedag jul (Epiphany)", ("fixed", 1, 6)),
+        ("Långfredagen (Good Friday)", ("easter", -2)),
+        ("Påskdagen (Easter Sunday)", ("easter", 0)),
+        ("Annandag påsk (Easter Monday)", ("easter", 1)),
+        ("Första maj (May Day)", ("fixed", 5, 1)),
+        ("Kristi himmelsfärdsdag (Ascension Day)", ("easter", 39)),
+        ("Sveriges nationaldag (National Day)", ("fixed", 6, 6)),
+        ("Midsommarafton (Midsummer Eve)", ("on_or_after", 6, 19, FRI)),
+        ("Midsommardagen (Midsummer Day)", ("on_or_after", 6, 20, SAT)),
+        ("Alla helgons dag (All Saints' Day)", ("on_or_after", 10, 31, SAT)),
+        ("Julafton (Christmas Eve)", ("fixed", 12, 24)),
+        ("Juldagen (Christmas Day)", ("fixed", 12, 25)),
+        ("Annandag jul (Boxing Day)", ("fixed", 12, 26)),
+        ("Nyårsafton (New Year's Eve)", ("fixed", 12, 31)),
+    ],
+    "Norway": [
+        ("Nyttårsdag (New Year's Day)", ("fixed", 1, 1)),
+        ("Skjærtorsdag (Maundy Thursday)", ("easter", -3)),
+        ("Langfredag (Good Friday)", ("easter", -2)),
+        ("Første påskedag (Easter Sunday)", ("easter", 0)),
+        ("Andre påskedag (Easter Monday)", ("easter", 1)),
+        ("Arbeidernes dag (Labour Day)", ("fixed", 5, 1)),
+        ("Grunnlovsdag (Constitution Day)", ("fixed", 5, 17)),
+        ("Kristi himmelfartsdag (Ascension Day)", ("easter", 39)),
+        ("Andre pinsedag (Whit Monday)", ("easter", 50)),
+        ("Første juledag (Christmas Day)", ("fixed", 12, 25)),
+        ("Andre juledag (Boxing Day)", ("fixed", 12, 26)),
+    ],
+    "Denmark": [
+        ("Nytårsdag (New Year's Day)", ("fixed", 1, 1)),
+        ("Skærtorsdag (Maundy Thursday)", ("easter", -3)),
+        ("Langfredag (Good Friday)", ("easter", -2)),
+        ("Påskedag (Easter Sunday)", ("easter", 0)),
+        ("Anden påskedag (Easter Monday)", ("easter", 1)),
+        ("Kristi himmelfartsdag (Ascension Day)", ("easter", 39)),
+        ("Anden pinsedag (Whit Monday)", ("easter", 50)),
+        ("Grundlovsdag (Constitution Day)", ("fixed", 6, 5)),
+        ("Juledag (Christmas Day)", ("fixed", 12, 25)),
+        ("Anden juledag (Boxing Day)", ("fixed", 12, 26)),
+    ],
+    "Japan": [
+        ("Ganjitsu (New Year's Day)", ("fixed", 1, 1), "sunday"),
+        ("Seijin no Hi (Coming of Age Day)", ("nth", 1, MON, 2)),
+        ("Kenkoku Kinen no Hi (National Foundation Day)", ("fixed", 2, 11), "sunday"),
+        ("Tennō Tanjōbi (Emperor's Birthday)", ("fixed", 2, 23), "sunday"),
+        ("Shunbun no Hi (Vernal Equinox Day)", ("equinox", "spring"), "sunday"),
+        ("Shōwa no Hi (Shōwa Day)", ("fixed", 4, 29), "sunday"),
+        ("Kenpō Kinenbi (Constitution Memorial Day)", ("fixed", 5, 3), "sunday"),
+        ("Midori no Hi (Greenery Day)", ("fixed", 5, 4), "sunday"),
+        ("Kodomo no Hi (Children's Day)", ("fixed", 5, 5), "sunday"),
+        ("Umi no Hi (Marine Day)", ("nth", 7, MON, 3)),
+        ("Yama no Hi (Mountain Day)", ("fixed", 8, 11), "sunday"),
+        ("Keirō no Hi (Respect for the Aged Day)", ("nth", 9, MON, 3)),
+        ("Shūbun no Hi (Autumnal Equinox Day)", ("equinox", "autumn"), "sunday"),
+        ("Supōtsu no Hi (Sports Day)", ("nth", 10, MON, 2)),
+        ("Bunka no Hi (Culture Day)", ("fixed", 11, 3), "sunday"),
+        ("Kinrō Kansha no Hi (Labour Thanksgiving Day)", ("fixed", 11, 23), "sunday"),
+    ],
+}
+
+HOLIDAY_IMPACT = "Banks, government offices and many shops are closed; public transport may run a reduced schedule."
+
+
+def easter_sunday(year: int) -> date:
+    """Western (Gregorian) Easter Sunday using the anonymous Gregorian algorithm"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """The n-th given weekday of a month; n=-1 is the last one"""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = (date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1))
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def japanese_equinox(year: int, season: str) -> date:
+    """Equinox day as used for Japanese public holidays (valid 1980-2099)"""
+    base = 20.8431 if season == "spring" else 23.2488
+    day = int(base + 0.242194 * (year - 1980) - (year - 1980) // 4)
+    return date(year, 3 if season == "spring" else 9, day)
+
+
+class HolidayService:
+    """Rule-based public holidays for the main destination countries, memoized per country-year"""
+
+    def __init__(self):
+        self._cache: Dict[Tuple[str, int], List[Dict[str, str]]] = {}
+
+    def supports(self, country: Optional[str]) -> bool:
+        return canonical_registry.country(country) in HOLIDAY_RULES if country else False
+
+    def holidays_for_year(self, country: str, year: int) -> List[Dict[str, str]]:
+        """All public holidays for one country and year, sorted by date"""
+        country = canonical_registry.country(country)
+        key = (country, year)
+        if key not in self._cache:
+            self._cache[key] = self._compute(country, year)
+        return [dict(holiday) for holiday in self._cache[key]]
+
+    def holidays_between(self, country: str, start: date, end: date) -> List[Dict[str, str]]:
+        """Public holidays between two dates (inclusive)"""
+        start_iso, end_iso = start.isoformat(), end.isoformat()
+        return [
+            holiday
+            for year in range(start.year, end.year + 1)
+            for holiday in self.holidays_for_year(country, year)
+            if start_iso <= holiday["date"] <= end_iso
+        ]
+
+    def _compute(self, country: str, year: int) -> List[Dict[str, str]]:
+        # Observed days can cross the year boundary (1 January on a Saturday is
+        # observed on 31 December), so the neighbouring years are expanded too
+        holidays = [
+            holiday
+            for rule_year in (year - 1, year, year + 1)
+            for holiday in self._expand(country, rule_year)
+            if holiday["date"].startswith(f"{year}-")
+        ]
+        return sorted(holidays, key=lambda holiday: holiday["date"])
+
+    def _expand(self, country: str, year: int) -> List[Dict[str, str]]:
+        """Holidays from one year's rules, including observed days that may fall outside that year"""
+        rules = HOLIDAY_RULES.get(country, [])
+        actual = [(name, self._resolve(rule, year)) for name, rule, *_ in rules]
+        taken = {day for _, day in actual}
+
+        holidays = []
+        for (name, day), (_, _, *policy) in zip(actual, rules):
+            holidays.append(self._holiday(country, name, day))
+            observed = self._observed(day, policy[0], taken) if policy else None
+            if observed is not None:
+                taken.add(observed)
+                holidays.append(self._holiday(country, f"{name} (observed)", observed))
+        return holidays
+
+    def _resolve(self, rule: tuple, year: int) -> date:
+        kind = rule[0]
+        if kind == "fixed":
+            return date(year, rule[1], rule[2])
+        if kind == "easter":
+            return easter_sunday(year) + timedelta(days=rule[1])
+        if kind == "nth":
+            return nth_weekday(year, rule[1], rule[2], rule[3])
+        if kind == "on_or_after":
+            start = date(year, rule[1], rule[2])
+            return start + timedelta(days=(rule[3] - start.weekday()) % 7)
+        if kind == "on_or_before":
+            start = date(year, rule[1], rule[2])
+            return start - timedelta(days=(start.weekday() - rule[3]) % 7)
+        if kind == "equinox":
+            return japanese_equinox(year, rule[1])
+        if kind == "friday_or_first_monday":
+            first = date(year, rule[1], 1)
+            return first if first.weekday() == FRI else nth_weekday(year, rule[1], MON, 1)
+        raise ValueError(f"unknown holiday rule {kind}")
+
+    def _observed(self, day: date, policy: str, taken: set) -> Optional[date]:
+        """Substitute day off for a holiday falling on a weekend, if the policy grants one"""
+        if policy == "us":
+            if day.weekday() == SAT:
+                return day - timedelta(days=1)
+            if day.weekday() == SUN:
+                return day + timedelta(days=1)
+            return None
+        if policy == "next" and day.weekday() >= SAT or policy == "sunday" and day.weekday() == SUN:
+            substitute = day + timedelta(days=1)
+            while substitute in taken or (policy == "next" and substitute.weekday() >= SAT):
+                substitute += timedelta(days=1)
+            return substitute
+        return None
+
+    def _holiday(self, country: str, name: str, day: date) -> Dict[str, str]:
+        return {
+            "name": name,
+            "date": day.isoformat(),
+            "type": "public",
+            "description": f"Public holiday in {country}",
+            "impact": HOLIDAY_IMPACT
+        }
+
+
+holiday_service = HolidayService()
@@ -0,0 +1,111 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, Optional
+
+PRODID = "-//VisaVerse//Relocation Calendar//EN"
+# iCalendar PRIORITY: 1 is highest, 9 lowest
+PRIORITIES = {"high": 1, "critical": 1, "medium": 5, "important": 5, "low": 9}
+
+
+def escape_text(value: Any) -> str:
+    """Escape a TEXT value per RFC 5545"""
+    return (
+        str(value).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+        .replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def fold_line(line: str) -> str:
+    """Fold a content line to 75 octets, continuing with a leading space"""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Never split inside a UTF-8 sequence
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode("utf-8"))
+        encoded = encoded[cut:]
+        limit = 74
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _ics_date(value: str) -> Optional[date]:
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def _all_day_event(uid: str, stamp: str, day: date, summary: str, description: str, category: str,
+                   priority: Optional[int] = None) -> Iterator[str]:
+    yield "BEGIN:VEVENT"
+    yield f"UID:{uid}"
+    yield f"DTSTAMP:{stamp}"
+    yield f"DTSTART;VALUE=DATE:{day.strftime('%Y%m%d')}"
+    yield f"DTEND;VALUE=DATE:{(day + timedelta(days=1)).strftime('%Y%m%d')}"
+    yield f"SUMMARY:{escape_text(summary)}"
+    if description:
+        yield f"DESCRIPTION:{escape_text(description)}"
+    yield f"CATEGORIES:{escape_text(category)}"
+    if priority is not None:
+        yield f"PRIORITY:{priority}"
+    yield "TRANSP:TRANSPARENT"
+    yield "END:VEVENT"
+
+
+def _components(timeline: Optional[Dict[str, Any]], events: Optional[Dict[str, Any]], stamp: str,
+                namespace: str) -> Iterator[str]:
+    if timeline:
+        for task in timeline.get("tasks", []):
+            start, due = _ics_date(task.get("date", "")), _ics_date(task.get("dueDate") or task.get("date", ""))
+            if start is None:
+                continue
+            yield "BEGIN:VTODO"
+            yield f"UID:task-{escape_text(task.get('id'))}@{namespace}"
+            yield f"DTSTAMP:{stamp}"
+            yield f"DTSTART;VALUE=DATE:{start.strftime('%Y%m%d')}"
+            if due is not None and due >= start:
+                yield f"DUE;VALUE=DATE:{due.strftime('%Y%m%d')}"
+            yield f"SUMMARY:{escape_text(task.get('title', 'Relocation task'))}"
+            yield f"DESCRIPTION:{escape_text(task.get('description') or 'Relocation task')}"
+            yield f"CATEGORIES:{escape_text(task.get('category', 'relocation'))}"
+            yield f"PRIORITY:{PRIORITIES.get(str(task.get('priority', '')).lower(), 5)}"
+            yield "STATUS:COMPLETED" if task.get("completed") else "STATUS:NEEDS-ACTION"
+            yield "END:VTODO"
+
+        for index, milestone in enumerate(timeline.get("milestones", [])):
+            day = _ics_date(milestone.get("date", ""))
+            if day is not None:
+                yield from _all_day_event(
+                    f"milestone-{index}@{namespace}", stamp, day, milestone.get("name", "Milestone"), "",
+                    "milestone", PRIORITIES.get(str(milestone.get("importance", "")).lower())
+                )
+
+    if events:
+        for kind, category in (("holidays", "holiday"), ("culturalEvents", "cultural"), ("importantDates", "important")):
+            for index, event in enumerate(events.get(kind, [])):
+                day = _ics_date(event.get("date", "")) if isinstance(event, dict) else None
+                if day is None:
+                    continue
+                yield from _all_day_event(
+                    f"{category}-{index}-{day.strftime('%Y%m%d')}@{namespace}", stamp, day,
+                    event.get("name", category.title()), event.get("description") or event.get("impact", ""),
+                    event.get("category", category), PRIORITIES.get(str(event.get("priority", "")).lower())
+                )
+
+
+def ics_stream(timeline: Optional[Dict[str, Any]], events: Optional[Dict[str, Any]], created_at: float,
+               namespace: str) -> Iterator[str]:
+    """Yield a VCALENDAR document one folded content line at a time"""
+    stamp = datetime.fromtimestamp(created_at, tz=timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield fold_line("BEGIN:VCALENDAR")
+    yield fold_line("VERSION:2.0")
+    yield fold_line(f"PRODID:{PRODID}")
+    yield fold_line("CALSCALE:GREGORIAN")
+    yield fold_line("X-WR-CALNAME:VisaVerse Relocation")
+    for line in _components(timeline, events, stamp, namespace):
+        yield fold_line(line)
+    yield fold_line("END:VCALENDAR")
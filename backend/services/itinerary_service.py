@@ -1,10 +1,26 @@
 from services.gemini_service import gemini_service
+from services.cache_service import TTLCache, make_cache_key, parse_json_response
+from services.cost_of_living import cost_of_living_service
 from models.itinerary import ItineraryResponse, DayPlan, BudgetBreakdown
-from typing import List
-import json
+from config import settings
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+import asyncio
+import uuid
+
+BUDGET_FIELDS = ["accommodation", "food", "transport", "attractions", "buffer"]
+# Categories that move with day-to-day spending when a single day is changed
+DAILY_FIELDS = ["food", "transport", "attractions"]
 
 class ItineraryService:
-    
+
+    def __init__(self):
+        # Generated itineraries by id, so single days can be edited as deltas
+        self._store = TTLCache("itineraries", settings.itinerary_store_ttl_seconds, settings.cache_max_entries)
+        # Generated itineraries reused across budget changes for the same trip shape
+        self._templates = TTLCache("itinerary_templates", settings.cache_ttl_seconds, settings.cache_max_entries)
+        # Per-itinerary locks (with their number of users) serializing day regenerations
+        self._locks: Dict[str, List] = {}
+
     async def generate_itinerary(
         self,
         destination_country: str,
@@ -15,27 +31,300 @@ class ItineraryService:
         interests: List[str]
     ) -> ItineraryResponse:
         """Generate travel itinerary with budget breakdown"""
-        
+
+        try:
+            daily_plans = []
+            summary = None
+            async for event in self.stream_itinerary(
+                destination_country, city, duration_days, total_budget, travel_style, interests
+            ):
+                if event["type"] == "day":
+                    daily_plans.append(event["day"])
+                else:
+                    summary = event["summary"]
+            return ItineraryResponse(daily_plans=daily_plans, **summary)
+
+        except Exception as e:
+            print(f"Error generating itinerary: {e}")
+            fallback = self._create_fallback_itinerary(city, duration_days, total_budget).model_dump()
+            params = self._trip_params(destination_country, city, duration_days, total_budget, travel_style, interests)
+            fallback["itinerary_id"] = self._save(params, fallback)
+            return ItineraryResponse(**fallback)
+
+    async def stream_itinerary(
+        self,
+        destination_country: str,
+        city: str,
+        duration_days: int,
+        total_budget: float,
+        travel_style: str,
+        interests: List[str]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Generate days concurrently in shards and yield them in order as they complete.
+
+        Yields ``{"type": "day", "day": {...}}`` per day, then a final
+        ``{"type": "summary", "summary": {...}}`` with the reconciled budget and
+        the ``itinerary_id`` under which the full itinerary was stored.
+
+        A cached template for the same city, duration, style and interests is
+        rescaled locally instead of re-prompting while the budget stays in its band.
+        """
+        params = self._trip_params(destination_country, city, duration_days, total_budget, travel_style, interests)
+        template_key = self._template_key(destination_country, city, duration_days, travel_style, interests)
+        template = self._templates.get(template_key)
+        if template is not None and self._within_band(template["total_budget"], total_budget):
+            itinerary = self._rescale_budget(template["itinerary"], template["total_budget"], total_budget)
+            for day in itinerary["daily_plans"]:
+                yield {"type": "day", "day": day}
+            summary = {key: value for key, value in itinerary.items() if key != "daily_plans"}
+            summary["itinerary_id"] = self._save(params, itinerary)
+            yield {"type": "summary", "summary": summary}
+            return
+
+        context = self._trip_context(destination_country, city, duration_days, total_budget, travel_style, interests)
+        shard_size = max(1, settings.itinerary_shard_days)
+        shards = [
+            list(range(first, min(first + shard_size, duration_days + 1)))
+            for first in range(1, duration_days + 1, shard_size)
+        ]
+
+        # Locations picked by shards that already finished; shards that start
+        # later (limited by the semaphore) are told to avoid them
+        used_locations: Set[str] = set()
+        semaphore = asyncio.Semaphore(max(1, settings.itinerary_shard_concurrency))
+        shard_tasks = [
+            asyncio.create_task(self._generate_shard(context, city, day_numbers, used_locations, semaphore))
+            for day_numbers in shards
+        ]
+        summary_task = asyncio.create_task(
+            self._generate_summary(context, destination_country, city, duration_days, total_budget, travel_style)
+        )
+
+        try:
+            seen_locations: Set[str] = set()
+            daily_plans = []
+            complete = True
+            for day_numbers, task in zip(shards, shard_tasks):
+                try:
+                    days = await task
+                except Exception as e:
+                    print(f"Error generating itinerary days {day_numbers}: {e}")
+                    complete = False
+                    days = self._fallback_days(city, day_numbers, duration_days, total_budget)
+                for day in days:
+                    day = await self._reconcile_day(context, city, day, seen_locations, semaphore)
+                    daily_plans.append(day)
+                    yield {"type": "day", "day": day}
+
+            try:
+                summary = await summary_task
+            except Exception as e:
+                print(f"Error generating itinerary summary: {e}")
+                complete = False
+                summary = self._fallback_summary(city, total_budget)
+            summary = self._reconcile_budget(summary, total_budget)
+            if complete:
+                # Only fully generated itineraries become templates; fallbacks are never reused
+                self._templates.set(template_key, {
+                    "total_budget": total_budget,
+                    "itinerary": {"daily_plans": daily_plans, **summary}
+                })
+            summary["itinerary_id"] = self._save(params, {"daily_plans": daily_plans, **summary})
+            yield {"type": "summary", "summary": summary}
+        finally:
+            for task in shard_tasks + [summary_task]:
+                task.cancel()
+
+    def _template_key(self, destination_country: str, city: str, duration_days: int, travel_style: str,
+                      interests: List[str]) -> str:
+        # The country keeps same-named cities (Paris FR/TX, Valencia ES/VE) apart
+        return make_cache_key(
+            destination_country, city, duration_days, travel_style,
+            ",".join(sorted(interest.lower() for interest in interests))
+        )
+
+    def _within_band(self, template_budget: float, total_budget: float) -> bool:
+        """Whether a budget is close enough to the template's to rescale rather than re-plan"""
+        if template_budget <= 0 or total_budget <= 0:
+            return False
+        band = settings.itinerary_budget_band
+        return 1 - band <= total_budget / template_budget <= 1 + band
+
+    def _rescale_budget(self, itinerary: Dict[str, Any], template_budget: float, total_budget: float) -> Dict[str, Any]:
+        """Deterministically scale every cost in a template itinerary to a new total budget"""
+        factor = total_budget / template_budget
+        breakdown = itinerary["budget_breakdown"]
+        for field in BUDGET_FIELDS:
+            breakdown[field] = round(float(breakdown[field]) * factor, 2)
+        for day in itinerary["daily_plans"]:
+            day["estimated_cost"] = round(float(day["estimated_cost"]) * factor, 2)
+        return self._reconcile_budget(itinerary, total_budget)
+
+    def get_itinerary(self, itinerary_id: str) -> Optional[ItineraryResponse]:
+        """Return a stored itinerary, or None if it is unknown or expired"""
+        record = self._store.get(itinerary_id)
+        if record is None:
+            return None
+        return ItineraryResponse(itinerary_id=itinerary_id, **record["itinerary"])
+
+    async def regenerate_day(
+        self,
+        itinerary_id: str,
+        day_number: int,
+        instructions: Optional[str] = None
+    ) -> Optional[ItineraryResponse]:
+        """Regenerate one day of a stored itinerary, avoiding the other days' locations.
+
+        Regenerations of the same itinerary run one at a time, so each sees the
+        days (and budget) written by the previous one.
+        """
+        entry = self._locks.setdefault(itinerary_id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                return await self._regenerate_day(itinerary_id, day_number, instructions)
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._locks[itinerary_id]
+
+    async def _regenerate_day(self, itinerary_id: str, day_number: int,
+                              instructions: Optional[str]) -> Optional[ItineraryResponse]:
+        record = self._store.get(itinerary_id)
+        if record is None or not self._has_day(record, day_number):
+            return None
+
+        params = record["params"]
+        context = self._trip_context(**params)
+        other_locations = {
+            act["location"].lower().strip()
+            for day in record["itinerary"]["daily_plans"] if day["day_number"] != day_number
+            for act in day["activities"] if act["location"].strip()
+        }
+        extra = f"\nThe traveller asked for this day: {instructions}" if instructions else ""
+        days = await self._generate_shard(
+            context, params["city"], [day_number], set(other_locations), asyncio.Semaphore(1), extra=extra
+        )
+        self._dedupe_day(days[0], other_locations)
+        # Re-read so edits saved while the day was generating are kept
+        record = self._store.get(itinerary_id)
+        if record is None or not self._has_day(record, day_number):
+            return None
+        return self._replace_day(itinerary_id, record, days[0])
+
+    def update_day(self, itinerary_id: str, day_number: int, day: DayPlan) -> Optional[ItineraryResponse]:
+        """Replace one day of a stored itinerary with a user-edited version"""
+        record = self._store.get(itinerary_id)
+        if record is None or not self._has_day(record, day_number):
+            return None
+        updated = day.model_dump()
+        updated["day_number"] = day_number
+        return self._replace_day(itinerary_id, record, updated)
+
+    def _has_day(self, record: Dict[str, Any], day_number: int) -> bool:
+        return any(day["day_number"] == day_number for day in record["itinerary"]["daily_plans"])
+
+    def _replace_day(self, itinerary_id: str, record: Dict[str, Any], new_day: Dict[str, Any]) -> ItineraryResponse:
+        """Swap in a new day and shift the budget by the change in its estimated cost"""
+        itinerary = record["itinerary"]
+        plans = itinerary["daily_plans"]
+        index = next(i for i, day in enumerate(plans) if day["day_number"] == new_day["day_number"])
+        delta = float(new_day["estimated_cost"]) - float(plans[index]["estimated_cost"])
+        plans[index] = new_day
+
+        breakdown = itinerary["budget_breakdown"]
+        weights = [max(0.0, float(breakdown[field])) for field in DAILY_FIELDS]
+        weight_total = sum(weights)
+        for field, weight in zip(DAILY_FIELDS, weights):
+            share = weight / weight_total if weight_total > 0 else 1 / len(DAILY_FIELDS)
+            breakdown[field] = round(max(0.0, float(breakdown[field]) + delta * share), 2)
+        itinerary["total_estimated_cost"] = round(sum(float(breakdown[field]) for field in BUDGET_FIELDS), 2)
+
+        self._store.set(itinerary_id, record)
+        return ItineraryResponse(itinerary_id=itinerary_id, **itinerary)
+
+    def _save(self, params: Dict[str, Any], itinerary: Dict[str, Any]) -> str:
+        itinerary_id = uuid.uuid4().hex
+        itinerary = {key: value for key, value in itinerary.items() if key != "itinerary_id"}
+        self._store.set(itinerary_id, {"params": params, "itinerary": itinerary})
+        return itinerary_id
+
+    def _trip_params(
+        self,
+        destination_country: str,
+        city: str,
+        duration_days: int,
+        total_budget: float,
+        travel_style: str,
+        interests: List[str]
+    ) -> Dict[str, Any]:
+        return {
+            "destination_country": destination_country,
+            "city": city,
+            "duration_days": duration_days,
+            "total_budget": total_budget,
+            "travel_style": travel_style,
+            "interests": list(interests)
+        }
+
+    def _trip_context(
+        self,
+        destination_country: str,
+        city: str,
+        duration_days: int,
+        total_budget: float,
+        travel_style: str,
+        interests: List[str]
+    ) -> str:
+        """Shared trip description given to every shard and the summary call"""
         interests_text = ", ".join(interests) if interests else "general sightseeing"
-        
-        prompt = f"""You are a travel planning expert with REAL knowledge of {city}, {destination_country}.
-Create a detailed {duration_days}-day itinerary with ACTUAL, REAL places to visit (e.g., if in Hyderabad, suggest 'Charminar' instead of 'historic site').
+        context = f"""You are a travel planning expert with REAL knowledge of {city}, {destination_country}.
+The traveller is planning a {duration_days}-day trip with ACTUAL, REAL places to visit (e.g., if in Hyderabad, suggest 'Charminar' instead of 'historic site').
 
 Budget: ${total_budget}
 Travel Style: {travel_style}
-Interests: {interests_text}
+Interests: {interests_text}"""
+
+        daily = cost_of_living_service.daily_costs(destination_country, city, travel_style)
+        if daily:
+            context += (
+                f"\nTypical daily spend excluding accommodation: food ${daily['food']:.0f}, "
+                f"transport ${daily['transport']:.0f}, attractions ${daily['activities']:.0f}. "
+                f"Keep each day's estimated_cost in line with these figures."
+            )
+        return context
+
+    async def _generate_shard(
+        self,
+        context: str,
+        city: str,
+        day_numbers: List[int],
+        used_locations: Set[str],
+        semaphore: asyncio.Semaphore,
+        extra: str = ""
+    ) -> List[Dict[str, Any]]:
+        """Generate a run of consecutive days, avoiding locations other shards already used"""
+        async with semaphore:
+            days_text = ", ".join(str(number) for number in day_numbers)
+            exclusions = sorted(used_locations)
+            exclusions_text = (
+                "\nThese locations are already used on other days, DO NOT use them again:\n"
+                + "\n".join(f"- {location}" for location in exclusions)
+            ) if exclusions else ""
+
+            prompt = f"""Plan ONLY day(s) {days_text} of the trip. Other days are planned separately, so pick places that
+suit this part of the trip (days later in the trip can explore further from the centre).
 
 CRITICAL: Every day MUST be UNIQUE. DO NOT repeat locations, restaurants, or activities across different days.
-Day 2 must be completely different from Day 1, Day 3 different from Day 2, etc.
 Include a diverse mix: historic sites, modern cafes, local markets, parks, and hidden gems.
 Include REAL place names and their SPECIFIC LOCATIONS/ADDRESSES that can be searched on a map.
-Make each day's activities DISTINCT and SPECIFIC to {city}. 
+Make each day's activities DISTINCT and SPECIFIC to {city}.{exclusions_text}{extra}
 
 Provide response in JSON format:
 {{
     "daily_plans": [
         {{
-            "day_number": 1,
+            "day_number": {day_numbers[0]},
             "activities": [
                 {{
                     "time": "9 AM",
@@ -53,9 +342,51 @@ Provide response in JSON format:
                 }}
             ],
             "estimated_cost": 150.0,
-            "tips": ["Specific tip for day 1 activities", "Best time to visit tip"]
+            "tips": ["Specific tip for the day's activities", "Best time to visit tip"]
         }}
-    ],
+    ]
+}}
+
+Each activity MUST have a 'rating' (float between 1.0 and 5.0) and a 'description'."""
+
+            response = await gemini_service.generate_response(prompt, context=context, use_pro=False)
+            data = parse_json_response(response)
+
+        days_by_number = {}
+        for day in data["daily_plans"]:
+            day = DayPlan(**day).model_dump()
+            if day["day_number"] in day_numbers:
+                days_by_number[day["day_number"]] = day
+        missing = [number for number in day_numbers if number not in days_by_number]
+        if missing:
+            raise ValueError(f"missing day(s) {missing}")
+
+        days = [days_by_number[number] for number in day_numbers]
+        for day in days:
+            for act in day["activities"]:
+                loc = act["location"].lower().strip()
+                if loc:
+                    used_locations.add(loc)
+        return days
+
+    async def _generate_summary(
+        self,
+        context: str,
+        destination_country: str,
+        city: str,
+        duration_days: int,
+        total_budget: float,
+        travel_style: str
+    ) -> Dict[str, Any]:
+        """Generate the budget breakdown and money tips for the whole trip"""
+        breakdown = cost_of_living_service.trip_breakdown(destination_country, city, duration_days, travel_style)
+        if breakdown:
+            return await self._generate_budget_narrative(context, city, duration_days, breakdown)
+
+        prompt = f"""Estimate the budget for the whole {duration_days}-day trip to {city}. Do not plan daily activities.
+
+Provide response in JSON format:
+{{
     "budget_breakdown": {{
         "accommodation": 500.0,
         "food": 300.0,
@@ -68,42 +399,107 @@ Provide response in JSON format:
     "money_saving_tips": ["tip 1", "tip 2"]
 }}
 
-Each activity MUST have a 'rating' (float between 1.0 and 5.0) and a 'description'.
-Ensure total_estimated_cost matches budget_breakdown sum and is close to ${total_budget}."""
+Keep the total close to ${total_budget}."""
+
+        response = await gemini_service.generate_response(prompt, context=context, use_pro=False)
+        data = parse_json_response(response)
+        return {
+            "budget_breakdown": BudgetBreakdown(**data["budget_breakdown"]).model_dump(),
+            "total_estimated_cost": float(data.get("total_estimated_cost", 0)),
+            "cost_justification": str(data.get("cost_justification", "")),
+            "money_saving_tips": [str(tip) for tip in data.get("money_saving_tips", [])]
+        }
 
+    async def _generate_budget_narrative(
+        self,
+        context: str,
+        city: str,
+        duration_days: int,
+        breakdown: Dict[str, float]
+    ) -> Dict[str, Any]:
+        """Explain a locally computed budget; the model does not change the numbers"""
+        figures = ", ".join(f"{field} ${breakdown[field]:.0f}" for field in BUDGET_FIELDS)
+        prompt = f"""The budget for the whole {duration_days}-day trip to {city} is already calculated: {figures}.
+Do not change these numbers and do not plan daily activities.
+
+Provide response in JSON format:
+{{
+    "cost_justification": "Explanation of this budget allocation",
+    "money_saving_tips": ["tip 1", "tip 2"]
+}}"""
+
+        response = await gemini_service.generate_response(prompt, context=context, use_pro=False)
+        data = parse_json_response(response)
+        return {
+            "budget_breakdown": dict(breakdown),
+            "total_estimated_cost": round(sum(breakdown.values()), 2),
+            "cost_justification": str(data.get("cost_justification", "")),
+            "money_saving_tips": [str(tip) for tip in data.get("money_saving_tips", [])]
+        }
+
+    async def _reconcile_day(
+        self,
+        context: str,
+        city: str,
+        day: Dict[str, Any],
+        seen_locations: Set[str],
+        semaphore: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        """De-duplicate a day against earlier days, regenerating it if it repeated any of them.
+
+        Shards in the first concurrent wave are planned without exclusions, so
+        repeats are caught here, once earlier days are final.
+        """
+        earlier = set(seen_locations)
+        if not self._dedupe_day(day, seen_locations):
+            return day
         try:
-            response = await gemini_service.generate_response(prompt, use_pro=False)
-            response_text = response.strip()
-            
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-            
-            data = json.loads(response_text)
-            
-            # Post-processing to ensure uniqueness
-            seen_locations = set()
-            if "daily_plans" in data:
-                for day in data["daily_plans"]:
-                    if "activities" in day:
-                        # Keep only activities with unique locations
-                        unique_activities = []
-                        for act in day["activities"]:
-                            loc = act.get("location", "").lower().strip()
-                            if loc and loc not in seen_locations:
-                                seen_locations.add(loc)
-                                unique_activities.append(act)
-                            elif not loc: # Keep if no location specified
-                                unique_activities.append(act)
-                        day["activities"] = unique_activities
-
-            return ItineraryResponse(**data)
-            
+            days = await self._generate_shard(context, city, [day["day_number"]], set(earlier), semaphore)
         except Exception as e:
-            print(f"Error generating itinerary: {e}")
-            return self._create_fallback_itinerary(city, duration_days, total_budget)
-    
+            print(f"Error regenerating duplicate itinerary day {day['day_number']}: {e}")
+            return day
+        replacement = days[0]
+        self._dedupe_day(replacement, earlier)
+        if not replacement["activities"]:
+            return day
+        seen_locations.clear()
+        seen_locations.update(earlier)
+        return replacement
+
+    def _dedupe_day(self, day: Dict[str, Any], seen_locations: Set[str]) -> int:
+        """Keep only activities whose location hasn't appeared on an earlier day; returns how many were dropped"""
+        unique_activities = []
+        for act in day["activities"]:
+            loc = act.get("location", "").lower().strip()
+            if loc and loc not in seen_locations:
+                seen_locations.add(loc)
+                unique_activities.append(act)
+            elif not loc: # Keep if no location specified
+                unique_activities.append(act)
+        dropped = len(day["activities"]) - len(unique_activities)
+        day["activities"] = unique_activities
+        return dropped
+
+    def _reconcile_budget(self, summary: Dict[str, Any], total_budget: float) -> Dict[str, Any]:
+        """Make total_estimated_cost equal the breakdown sum, scaling down anything over budget"""
+        breakdown = summary["budget_breakdown"]
+        total = sum(max(0.0, float(breakdown[field])) for field in BUDGET_FIELDS)
+        scale = total_budget / total if total > total_budget > 0 else 1.0
+        for field in BUDGET_FIELDS:
+            breakdown[field] = round(max(0.0, float(breakdown[field])) * scale, 2)
+        summary["total_estimated_cost"] = round(sum(breakdown[field] for field in BUDGET_FIELDS), 2)
+        return summary
+
+    def _fallback_days(self, city: str, day_numbers: List[int], duration_days: int, total_budget: float) -> List[Dict[str, Any]]:
+        """Days from the fallback itinerary for a shard that failed"""
+        fallback = self._create_fallback_itinerary(city, duration_days, total_budget)
+        return [fallback.daily_plans[number - 1].model_dump() for number in day_numbers]
+
+    def _fallback_summary(self, city: str, total_budget: float) -> Dict[str, Any]:
+        fallback = self._create_fallback_itinerary(city, 1, total_budget).model_dump()
+        fallback.pop("daily_plans")
+        return fallback
+
     def _create_fallback_itinerary(self, city: str, days: int, budget: float) -> ItineraryResponse:
         """Create fallback itinerary with specific naming for common cities"""
         daily_budget = budget / days
@@ -0,0 +1,169 @@
+from services.cache_service import make_cache_key
+from models.jobs import JobStatus
+from config import settings
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import json
+import time
+import uuid
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class Job:
+    """A unit of background work and its observable state"""
+
+    def __init__(self, kind: str, params: Dict[str, Any], dedup_key: str):
+        self.job_id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.dedup_key = dedup_key
+        self.status = QUEUED
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        # Bumped on every update so waiters can tell whether they missed a change
+        self.version = 0
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    def update(self, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        self.status = status
+        if result is not None:
+            self.result = result
+        self.error = error
+        self.updated_at = time.time()
+        self.version += 1
+        # Wake everyone waiting on this version, then start a new one
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait_for_change(self, version: int, timeout: float) -> bool:
+        """Wait until the job moves past ``version``; returns False on timeout"""
+        if self.version != version:
+            return True
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def to_status(self) -> JobStatus:
+        return JobStatus(
+            job_id=self.job_id,
+            kind=self.kind,
+            status=self.status,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+            result=self.result,
+            error=self.error
+        )
+
+
+class LocalQueueBackend:
+    """Bounded in-process FIFO of job ids.
+
+    Any object with the same async ``put``/``get`` interface (e.g. a Redis or
+    SQLite backed queue) can be passed to JobService instead.
+    """
+
+    def __init__(self, max_size: int):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+
+    async def put(self, job_id: str) -> None:
+        # Never block the request: a full queue is reported to the caller
+        self._queue.put_nowait(job_id)
+
+    async def get(self) -> str:
+        return await self._queue.get()
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+
+class JobService:
+    """Runs slow generations on a bounded worker pool.
+
+    Jobs are de-duplicated by (kind, params): submitting the same input while a
+    job is queued, running or recently finished returns the existing job, so
+    client retries attach to it instead of starting new model calls.
+    """
+
+    def __init__(self, queue_backend=None, workers: int = 2, result_ttl_seconds: float = 3600):
+        self._queue_backend = queue_backend
+        self._worker_count = workers
+        self.result_ttl_seconds = result_ttl_seconds
+        self._handlers: Dict[str, Callable[..., Awaitable[Dict[str, Any]]]] = {}
+        self._jobs: Dict[str, Job] = {}
+        self._by_key: Dict[str, str] = {}
+        self._workers: List[asyncio.Task] = []
+
+    def register(self, kind: str, handler: Callable[..., Awaitable[Dict[str, Any]]]) -> None:
+        """Register the coroutine that executes jobs of a given kind"""
+        self._handlers[kind] = handler
+
+    def _ensure_workers(self) -> None:
+        if self._queue_backend is None:
+            self._queue_backend = LocalQueueBackend(settings.job_queue_size)
+        self._workers = [task for task in self._workers if not task.done()]
+        while len(self._workers) < self._worker_count:
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    async def submit(self, kind: str, params: Dict[str, Any]) -> Job:
+        """Queue a job, or return the existing job for the same input"""
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        self._prune()
+
+        dedup_key = make_cache_key(kind, json.dumps(params, sort_keys=True, default=str))
+        existing = self._jobs.get(self._by_key.get(dedup_key, ""))
+        if existing is not None and existing.status != FAILED:
+            return existing
+
+        self._ensure_workers()
+        job = Job(kind, params, dedup_key)
+        await self._queue_backend.put(job.job_id)
+        self._jobs[job.job_id] = job
+        self._by_key[dedup_key] = job.job_id
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue_backend.get()
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                continue
+            job.update(RUNNING)
+            try:
+                result = await self._handlers[job.kind](**job.params)
+                job.update(DONE, result=result)
+            except Exception as e:
+                print(f"Job {job.job_id} ({job.kind}) failed: {e}")
+                job.update(FAILED, error=str(e))
+
+    def _prune(self) -> None:
+        """Drop finished jobs whose results have outlived the retention window"""
+        cutoff = time.time() - self.result_ttl_seconds
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished and job.updated_at < cutoff]:
+            job = self._jobs.pop(job_id)
+            if self._by_key.get(job.dedup_key) == job_id:
+                del self._by_key[job.dedup_key]
+
+    async def stop(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+
+job_service = JobService(workers=settings.job_workers, result_ttl_seconds=settings.job_result_ttl_seconds)
@@ -0,0 +1,252 @@
+from typing import Dict, List, Optional, Tuple
+import math
+import re
+import unicodedata
+
+NGRAM = 3
+
+# Scripts used by a single language in the registry, keyed by Unicode name prefix
+UNIQUE_SCRIPTS = {
+    "HANGUL": "Korean",
+    "HIRAGANA": "Japanese",
+    "KATAKANA": "Japanese",
+    "THAI": "Thai",
+    "GREEK": "Greek",
+    "HEBREW": "Hebrew",
+    "GEORGIAN": "Georgian",
+    "ARMENIAN": "Armenian",
+    "TAMIL": "Tamil",
+    "TELUGU": "Telugu",
+    "KANNADA": "Kannada",
+    "MALAYALAM": "Malayalam",
+    "GUJARATI": "Gujarati",
+    "GURMUKHI": "Punjabi",
+    "SINHALA": "Sinhala",
+    "LAO": "Lao",
+    "ETHIOPIC": "Amharic",
+    "THAANA": "Dhivehi",
+    "TIBETAN": "Dzongkha",
+}
+# Scripts shared by several languages; the named one is only a low-confidence guess
+SHARED_SCRIPTS = {
+    "DEVANAGARI": "Hindi",
+    "BENGALI": "Bengali",
+    "CJK": "Mandarin Chinese",
+}
+SHARED_SCRIPT_CONFIDENCE = 0.6
+
+# A URL or email, optionally wrapped in brackets/quotes or followed by punctuation
+PASSTHROUGH_TOKEN = re.compile(
+    r"[(\[<\"']*(?:(?:https?://|www\.)\S+|[\w.+-]+@[\w-]+(?:\.[\w-]+)+)[)\]>\"'.,;:!?]*",
+    re.IGNORECASE
+)
+
+# Marker letters within the Arabic and Cyrillic scripts as (language, unique, shared):
+# unique letters single out the language, shared ones are also written in other
+# registry languages (Pashto, Kazakh, Kyrgyz, Mongolian) and only make it a guess
+ARABIC_MARKERS = [
+    ("Urdu", "ٹڈڑںے", ""),
+    ("Pashto", "ټډړښږځڅګڼۍې", ""),
+    ("Persian (Farsi)", "", "پچژگکی"),
+]
+CYRILLIC_MARKERS = [
+    ("Kazakh", "әғқұһ", ""),
+    ("Ukrainian", "їєґ", "і"),
+    ("Russian", "", "ыэё"),
+]
+
+# Close relatives of the seeded Latin languages that have no seed of their own.
+# Their text scores as the seeded relative with high confidence, so a detection
+# of these languages cannot tell the two apart.
+UNSEEDED_RELATIVES = {
+    "Swedish": ["Danish", "Norwegian", "Icelandic"],
+    "Spanish": ["Catalan", "Galician"],
+    "Portuguese": ["Galician"],
+    "Italian": ["Catalan"],
+    "Polish": ["Czech", "Slovak", "Slovene", "Croatian", "Bosnian", "Serbian"],
+    "Indonesian": ["Malay", "Filipino", "Swahili"],
+    "Dutch": ["Afrikaans", "Luxembourgish"],
+    "German": ["Luxembourgish"],
+    "French": ["Haitian Creole"],
+    "Finnish": ["Estonian"],
+    "Turkish": ["Azerbaijani"],
+}
+
+# Seed text for the Latin-script trigram profiles: frequent function words plus
+# everyday travel phrases, enough to separate the languages on short inputs
+LATIN_SEEDS = {
+    "English": (
+        "the and of to in is you that it he was for on are as with his they at be this have from or one had by "
+        "but not what all were we when your can said there use an each which she do how their if will up other "
+        "where is the train station how much does this cost please thank you i would like a ticket to the airport "
+        "can you help me i need a doctor where is the nearest hotel excuse me do you speak english good morning"
+    ),
+    "Spanish": (
+        "el la de que y a en un ser se no haber por con su para como estar tener le lo todo pero más hacer o "
+        "poder decir este ir otro ese si me ya ver porque dar cuando él muy sin vez mucho saber qué sobre "
+        "dónde está la estación de tren cuánto cuesta esto por favor gracias quisiera un billete al aeropuerto "
+        "puede ayudarme necesito un médico dónde está el hotel más cercano perdón habla usted inglés buenos días año niño"
+    ),
+    "French": (
+        "le de un être et à il avoir ne je son que se qui ce dans en du elle au pour pas que vous par sur faire "
+        "plus dire me on mon lui nous comme mais pouvoir avec tout y aller voir bien où est la gare combien ça "
+        "coûte s'il vous plaît merci je voudrais un billet pour l'aéroport pouvez-vous m'aider j'ai besoin d'un "
+        "médecin où est l'hôtel le plus proche excusez-moi parlez-vous anglais bonjour très déjà garçon"
+    ),
+    "German": (
+        "der die und in den von zu das mit sich des auf für ist im dem nicht ein eine als auch es an werden aus "
+        "er hat dass sie nach wird bei einer um am sind noch wie einem über einen so zum war haben nur oder "
+        "wo ist der bahnhof wie viel kostet das bitte danke ich möchte eine fahrkarte zum flughafen können sie "
+        "mir helfen ich brauche einen arzt wo ist das nächste hotel entschuldigung sprechen sie englisch guten morgen straße größe"
+    ),
+    "Italian": (
+        "il di che è e la per un in non una sono mi ho lo ma ti ha le si con cosa questo bene se da qui come "
+        "io hai sei gli mio anche del della nel alla sul più tutto niente molto fare ancora dove è la stazione "
+        "quanto costa questo per favore grazie vorrei un biglietto per l'aeroporto può aiutarmi ho bisogno di "
+        "un medico dov'è l'albergo più vicino mi scusi parla inglese buongiorno perché città"
+    ),
+    "Portuguese": (
+        "o de que e do da em um para é com não uma os no se na por mais as dos como mas foi ao ele das tem à "
+        "seu sua ou ser quando muito há nos já está eu também só pelo pela até isso ela entre onde fica a "
+        "estação de trem quanto custa isso por favor obrigado eu gostaria de uma passagem para o aeroporto "
+        "pode me ajudar preciso de um médico onde fica o hotel mais próximo com licença você fala inglês bom dia não são"
+    ),
+    "Dutch": (
+        "de en van ik te dat die in een hij het niet zijn is was op aan met als voor had er maar om hem dan zou "
+        "of wat mijn men dit zo door over ze zich bij ook tot je mij uit der daar haar naar heb hoe waar is het "
+        "station hoeveel kost dit alstublieft dank u wel ik wil graag een kaartje naar het vliegveld kunt u mij "
+        "helpen ik heb een dokter nodig waar is het dichtstbijzijnde hotel pardon spreekt u engels goedemorgen"
+    ),
+    "Swedish": (
+        "och i att det som en på är av för med till den har de inte om ett han men var jag sig från vi så kan "
+        "man när år säger hon under också efter eller nu sin där vid mot ska skulle kommer ut får finns vad var "
+        "ligger tågstationen hur mycket kostar det tack jag skulle vilja ha en biljett till flygplatsen kan du "
+        "hjälpa mig jag behöver en läkare var ligger närmaste hotell ursäkta talar du engelska god morgon"
+    ),
+    "Polish": (
+        "i w nie na się z że do to jest jak o co ale po tak za od tylko jego jej już przez może być dla czy "
+        "gdzie jest dworzec kolejowy ile to kosztuje proszę dziękuję chciałbym bilet na lotnisko czy może pan "
+        "mi pomóc potrzebuję lekarza gdzie jest najbliższy hotel przepraszam czy mówi pan po angielsku dzień "
+        "dobry bardzo dobrze wszystko który także więc będzie"
+    ),
+    "Turkish": (
+        "bir ve bu da de için ne ile çok ama gibi daha o ben sen var yok olan kadar sonra şey her mi değil "
+        "tren istasyonu nerede bu ne kadar lütfen teşekkür ederim havalimanına bir bilet istiyorum bana yardım "
+        "edebilir misiniz doktora ihtiyacım var en yakın otel nerede affedersiniz ingilizce biliyor musunuz "
+        "günaydın güzel büyük şimdi öyle çünkü ışık"
+    ),
+    "Indonesian": (
+        "yang dan di itu dengan untuk tidak ini dari dalam akan pada juga saya ke karena tersebut bisa ada "
+        "mereka lebih kami sudah atau satu kita hanya oleh telah seperti di mana stasiun kereta berapa harganya "
+        "tolong terima kasih saya mau tiket ke bandara bisakah anda membantu saya saya perlu dokter di mana "
+        "hotel terdekat permisi apakah anda bisa berbahasa inggris selamat pagi"
+    ),
+    "Vietnamese": (
+        "của và có là không được cho người một những trong này với đã các để khi như tôi bạn anh em rất "
+        "ga tàu ở đâu cái này bao nhiêu tiền làm ơn cảm ơn tôi muốn mua một vé đến sân bay bạn có thể giúp tôi "
+        "không tôi cần bác sĩ khách sạn gần nhất ở đâu xin lỗi bạn có nói tiếng anh không chào buổi sáng"
+    ),
+    "Romanian": (
+        "și de la în a cu pe un o nu care că mai din pentru este sunt ce se din acest fost dar la lui fi după "
+        "unde este gara cât costă asta vă rog mulțumesc aș dori un bilet la aeroport mă puteți ajuta am nevoie "
+        "de un doctor unde este cel mai apropiat hotel scuzați-mă vorbiți engleză bună dimineața țară și"
+    ),
+    "Finnish": (
+        "ja on ei se että hän oli ole mutta kun niin myös ovat kanssa vain jos tai sen hänen mitä tämä minä "
+        "missä on rautatieasema paljonko tämä maksaa kiitos ole hyvä haluaisin lipun lentokentälle voitteko "
+        "auttaa minua tarvitsen lääkärin missä on lähin hotelli anteeksi puhutteko englantia hyvää huomenta"
+    ),
+}
+
+
+def _grams(text: str) -> List[str]:
+    grams = []
+    for word in re.findall(r"[^\W\d_]+(?:'[^\W\d_]+)?", text.casefold()):
+        padded = f" {word} "
+        grams.extend(padded[i:i + NGRAM] for i in range(max(1, len(padded) - NGRAM + 1)))
+    return grams
+
+
+class LanguageDetector:
+    """Local script and language detection for translation pre-checks.
+
+    Non-Latin scripts are resolved from Unicode character names (plus marker
+    letters for Arabic and Cyrillic). Latin text is scored with a naive Bayes
+    character-trigram model built from the seed texts above; the confidence is
+    the posterior of the best language, so short or ambiguous inputs stay low.
+    The posterior only ranks seeded languages, see distinguishes().
+    """
+
+    def __init__(self):
+        self._profiles: Dict[str, Dict[str, float]] = {}
+        self._unseen: Dict[str, float] = {}
+        vocabulary = {gram for seed in LATIN_SEEDS.values() for gram in _grams(seed)}
+        for language, seed in LATIN_SEEDS.items():
+            counts: Dict[str, int] = {}
+            for gram in _grams(seed):
+                counts[gram] = counts.get(gram, 0) + 1
+            total = sum(counts.values()) + len(vocabulary)
+            self._profiles[language] = {gram: math.log((count + 1) / total) for gram, count in counts.items()}
+            self._unseen[language] = math.log(1 / total)
+
+    def detect(self, text: str) -> Optional[Tuple[str, float]]:
+        """(language, confidence) for a text, or None if it has no letters"""
+        scripts: Dict[str, int] = {}
+        for ch in text:
+            if ch.isalpha():
+                script = unicodedata.name(ch, "UNKNOWN").split(" ")[0]
+                scripts[script] = scripts.get(script, 0) + 1
+        if not scripts:
+            return None
+
+        script = max(scripts, key=scripts.get)
+        if "HIRAGANA" in scripts or "KATAKANA" in scripts:
+            return "Japanese", 1.0
+        if script in UNIQUE_SCRIPTS:
+            return UNIQUE_SCRIPTS[script], 1.0
+        if script == "ARABIC":
+            return self._by_markers(text, ARABIC_MARKERS, "Arabic")
+        if script == "CYRILLIC":
+            return self._by_markers(text, CYRILLIC_MARKERS, "Russian")
+        if script == "LATIN":
+            return self._classify_latin(text)
+        if script in SHARED_SCRIPTS:
+            return SHARED_SCRIPTS[script], SHARED_SCRIPT_CONFIDENCE
+        return None
+
+    def distinguishes(self, language: str) -> bool:
+        """False for a language the detector confuses with an unseeded close relative"""
+        return not UNSEEDED_RELATIVES.get(language)
+
+    def _by_markers(self, text: str, markers: List[Tuple[str, str, str]], default: str) -> Tuple[str, float]:
+        for language, unique, _ in markers:
+            if any(letter in text for letter in unique):
+                return language, 1.0
+        for language, _, shared in markers:
+            if any(letter in text for letter in shared):
+                return language, SHARED_SCRIPT_CONFIDENCE
+        return default, SHARED_SCRIPT_CONFIDENCE
+
+    def _classify_latin(self, text: str) -> Optional[Tuple[str, float]]:
+        grams = _grams(text)
+        if not grams:
+            return None
+        scores = {
+            language: sum(profile.get(gram, self._unseen[language]) for gram in grams)
+            for language, profile in self._profiles.items()
+        }
+        best = max(scores, key=scores.get)
+        posterior = 1 / sum(math.exp(score - scores[best]) for score in scores.values())
+        return best, posterior
+
+
+def is_passthrough(text: str) -> bool:
+    """True for text that reads the same in every language: numbers, URLs, emails, emoji and symbols"""
+    tokens = text.split()
+    return all(
+        PASSTHROUGH_TOKEN.fullmatch(token) or not any(ch.isalpha() for ch in token)
+        for token in tokens
+    )
+
+
+language_detector = LanguageDetector()
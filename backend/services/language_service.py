@@ -1,8 +1,56 @@
 from services.gemini_service import gemini_service
+from services.cache_service import StaleWhileRevalidateCache, make_cache_key, parse_json_response
+from services.translation_memory import translation_memory
+from services.language_detection import language_detector, is_passthrough
 from models.language import TranslationResponse, LanguageLearningResponse, LanguagePhraseCategory
+from config import settings
+from typing import Dict, Any, List, Optional, Set, Tuple
+import asyncio
 import json
 
+# Rough token cost of a string (about four characters per token) plus per-item JSON overhead
+CHARS_PER_TOKEN = 4
+ITEM_TOKEN_OVERHEAD = 8
+# Concurrent single calls used to fill ids a packed response dropped
+MAX_SINGLE_RETRIES = 4
+# Source language values that ask for detection
+AUTO_DETECT = {"auto", "auto detect", "auto-detect", "detect", "detect language"}
+# Strings gemini_service.translate_text returns instead of raising
+TRANSLATION_ERRORS = ("Translation error:", "Translation service unavailable")
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + ITEM_TOKEN_OVERHEAD
+
+
+def pack_batches(texts: List[str], max_tokens: int, max_items: int) -> List[List[str]]:
+    """Split texts into batches that stay under a token estimate and item count"""
+    batches: List[List[str]] = []
+    current: List[str] = []
+    tokens = 0
+    for text in texts:
+        cost = estimate_tokens(text)
+        if current and (tokens + cost > max_tokens or len(current) >= max_items):
+            batches.append(current)
+            current, tokens = [], 0
+        current.append(text)
+        tokens += cost
+    if current:
+        batches.append(current)
+    return batches
+
 class LanguageService:
+
+    def __init__(self):
+        # Phrase packs rarely change: serve stale entries while refreshing in the background
+        self._phrase_cache = StaleWhileRevalidateCache(
+            "language_phrases", settings.cache_ttl_seconds, settings.cache_max_stale_seconds, settings.cache_max_entries
+        )
+        # Micro-batching state per language pair: open windows (text -> waiting future)
+        # and the number of model calls currently in flight
+        self._windows: Dict[str, Dict[str, asyncio.Future]] = {}
+        self._inflight: Dict[str, int] = {}
+        self._flush_tasks: Set[asyncio.Task] = set()
     
     async def translate_text(
         self, 
@@ -12,7 +60,11 @@ class LanguageService:
     ) -> TranslationResponse:
         """Translate text using Gemini AI"""
         
-        translated = await gemini_service.translate_text(text, source_language, target_language)
+        source_language, translated = self._prepass(text, source_language, target_language)
+        if translated is None:
+            translated = translation_memory.lookup(text, source_language, target_language)
+        if translated is None:
+            translated = await self._translate_windowed(text, source_language, target_language)
         
         return TranslationResponse(
             original_text=text,
@@ -21,8 +73,197 @@ class LanguageService:
             target_language=target_language
         )
     
+    async def translate_batch(
+        self,
+        texts: List[str],
+        source_language: str,
+        target_language: str
+    ) -> List[TranslationResponse]:
+        """Translate many strings with as few model calls as possible, in request order"""
+        translations: Dict[str, str] = {}
+        sources: Dict[str, str] = {}
+        # Texts still needing the model, grouped by (possibly detected) source language
+        missing: Dict[str, List[str]] = {}
+        for text in texts:
+            if text in sources:
+                continue
+            source, translated = self._prepass(text, source_language, target_language)
+            sources[text] = source
+            if translated is None:
+                translated = translation_memory.lookup(text, source, target_language)
+            if translated is None:
+                missing.setdefault(source, []).append(text)
+            else:
+                translations[text] = translated
+
+        results = await asyncio.gather(*(
+            self._run_pair(make_cache_key(source, target_language), group, source, target_language)
+            for source, group in missing.items()
+        ))
+        for result in results:
+            translations.update(result)
+
+        return [
+            TranslationResponse(
+                original_text=text,
+                translated_text=translations[text],
+                source_language=sources[text],
+                target_language=target_language
+            )
+            for text in texts
+        ]
+
+    def _prepass(self, text: str, source_language: str, target_language: str) -> Tuple[str, Optional[str]]:
+        """Resolve an "auto" source and return (source_language, text) when no translation is needed.
+
+        Numbers, URLs, emails and emoji pass through unchanged, as does text
+        already written in the target language.
+        """
+        if is_passthrough(text):
+            return source_language, text
+        detected = language_detector.detect(text)
+        confident = (
+            detected is not None
+            and detected[1] >= settings.language_detect_min_confidence
+            and language_detector.distinguishes(detected[0])
+        )
+        if confident and source_language.strip().lower() in AUTO_DETECT:
+            source_language = detected[0]
+        if source_language.strip().lower() == target_language.strip().lower():
+            return source_language, text
+        if confident and detected[0] == target_language:
+            return source_language, text
+        return source_language, None
+
+    async def _translate_windowed(self, text: str, source_language: str, target_language: str) -> str:
+        """Translate through the micro-batching window of the language pair.
+
+        With nothing in flight for the pair the request is sent at once, so a
+        lone caller never waits. Otherwise it joins a window that is flushed
+        after translation_batch_window_ms as one packed call.
+        """
+        pair = make_cache_key(source_language, target_language)
+        window = self._windows.get(pair)
+        if window is None and not self._inflight.get(pair):
+            return (await self._run_pair(pair, [text], source_language, target_language))[text]
+
+        if window is None:
+            window = self._windows[pair] = {}
+            task = asyncio.create_task(self._flush_window(pair, source_language, target_language))
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+        future = window.get(text)
+        if future is None:
+            future = window[text] = asyncio.get_running_loop().create_future()
+        # Shielded so one cancelled caller doesn't fail others waiting on the same text
+        return await asyncio.shield(future)
+
+    async def _flush_window(self, pair: str, source_language: str, target_language: str) -> None:
+        await asyncio.sleep(settings.translation_batch_window_ms / 1000)
+        window = self._windows.pop(pair)
+        try:
+            results = await self._run_pair(pair, list(window), source_language, target_language)
+            for text, future in window.items():
+                if not future.done():
+                    future.set_result(results[text])
+        except Exception as e:
+            for future in window.values():
+                if not future.done():
+                    future.set_exception(e)
+
+    async def _run_pair(self, pair: str, texts: List[str], source_language: str, target_language: str) -> Dict[str, str]:
+        """Translate texts for one language pair, tracking the call as in flight"""
+        self._inflight[pair] = self._inflight.get(pair, 0) + 1
+        try:
+            if len(texts) == 1:
+                return {texts[0]: await self._translate_single(texts[0], source_language, target_language)}
+            batches = pack_batches(texts, settings.translation_batch_max_tokens, settings.translation_batch_max_items)
+            results = await asyncio.gather(*(
+                self._translate_packed(batch, source_language, target_language) for batch in batches
+            ))
+            return {text: translated for result in results for text, translated in result.items()}
+        finally:
+            self._inflight[pair] -= 1
+            if not self._inflight[pair]:
+                del self._inflight[pair]
+
+    async def _translate_single(self, text: str, source_language: str, target_language: str) -> str:
+        # Similar remembered sentences guide the model; they are never served as the answer
+        examples = [
+            (source, translation)
+            for source, translation, _ in translation_memory.similar(text, source_language, target_language)
+        ]
+        translated = await gemini_service.translate_text(text, source_language, target_language, examples)
+        if not translated.startswith(TRANSLATION_ERRORS):
+            translation_memory.add(text, translated, source_language, target_language)
+        return translated
+
+    async def _translate_packed(self, texts: List[str], source_language: str, target_language: str) -> Dict[str, str]:
+        """Translate one packed batch in a single call.
+
+        Raises if the whole pack fails (gemini returns error text rather than
+        raising, so an outage shows up as unparseable output); only ids that a
+        parsed response dropped are retried one by one, a few at a time.
+        """
+        # Ids are positions in the batch, so each answer maps back to exactly one input
+        items = {f"t{index}": text for index, text in enumerate(texts)}
+        translated: Dict[str, str] = {}
+        data = await self._generate_packed(items, source_language, target_language)
+        for item_id, text in items.items():
+            value = data.get(item_id)
+            if isinstance(value, str) and value.strip():
+                translated[text] = value.strip()
+                translation_memory.add(text, translated[text], source_language, target_language)
+
+        leftovers = [text for text in texts if text not in translated]
+        semaphore = asyncio.Semaphore(MAX_SINGLE_RETRIES)
+
+        async def retry(text: str) -> str:
+            async with semaphore:
+                return await self._translate_single(text, source_language, target_language)
+
+        singles = await asyncio.gather(*(retry(text) for text in leftovers))
+        translated.update(zip(leftovers, singles))
+        return translated
+
+    async def _generate_packed(self, items: Dict[str, str], source_language: str, target_language: str) -> Dict[str, Any]:
+        examples: Dict[str, str] = {}
+        for text in items.values():
+            for source, translation, _ in translation_memory.similar(text, source_language, target_language, limit=1):
+                examples[source] = translation
+        reference = ""
+        if examples:
+            reference = f"""Earlier translations of similar sentences, for consistent wording only (they are not the answers):
+{json.dumps(examples, ensure_ascii=False)}
+
+"""
+
+        prompt = f"""{reference}Translate each value in the following JSON object from {source_language} to {target_language}.
+Keep every key unchanged and return only a JSON object mapping each key to its translation, nothing else.
+
+{json.dumps(items, ensure_ascii=False)}"""
+
+        response = await gemini_service.generate_response(prompt)
+        data = parse_json_response(response)
+        if not isinstance(data, dict):
+            raise ValueError("Batch translation response is not a JSON object")
+        return data
+
     async def get_basic_phrases(self, country: str, language: str) -> LanguageLearningResponse:
         """Get essential daily-use phrases for a language"""
+
+        try:
+            data = await self._phrase_cache.get_or_revalidate(
+                make_cache_key(country, language),
+                lambda: self._generate_phrases(country, language)
+            )
+            return LanguageLearningResponse(**data)
+        except Exception as e:
+            print(f"Error generating language phrases: {e}")
+            return self._create_fallback_phrases(language, country)
+
+    async def _generate_phrases(self, country: str, language: str) -> Dict[str, Any]:
+        """Generate the phrase pack with Gemini; raises if the response cannot be parsed"""
         
         prompt = f"""Generate essential daily-use phrases for someone learning {language} for travel to {country}.
 
@@ -52,26 +293,10 @@ Format as JSON:
 
 Include phonetic pronunciation to help learners."""
 
-        try:
-            response = await gemini_service.generate_response(prompt)
-            
-            # Parse JSON
-            response_text = response.strip()
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-            
-            try:
-                data = json.loads(response_text)
-                return LanguageLearningResponse(**data)
-            except json.JSONDecodeError:
-                return self._create_fallback_phrases(language, country)
-                
-        except Exception as e:
-            print(f"Error generating language phrases: {e}")
-            return self._create_fallback_phrases(language, country)
-    
+        response = await gemini_service.generate_response(prompt)
+        data = parse_json_response(response)
+        return LanguageLearningResponse(**data).model_dump()
+
     def _create_fallback_phrases(self, language: str, country: str) -> LanguageLearningResponse:
         """Create fallback phrase list"""
         return LanguageLearningResponse(
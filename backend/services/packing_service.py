@@ -1,8 +1,17 @@
 from services.gemini_service import gemini_service
+from services.cache_service import TTLCache, make_cache_key, parse_json_response, merge_items, stay_length_bucket
 from models.packing import PackingList, PackingCategory
-import json
+from config import settings
+from typing import Dict, Any, List
+import asyncio
 
 class PackingService:
+
+    def __init__(self):
+        # Destination+purpose core is shared by every home country;
+        # items to bring from home are cached per country pair.
+        self._core_cache = TTLCache("packing_core", settings.cache_ttl_seconds, settings.cache_max_entries)
+        self._delta_cache = TTLCache("packing_delta", settings.cache_ttl_seconds, settings.cache_max_entries)
     
     async def generate_packing_list(
         self,
@@ -12,15 +21,33 @@ class PackingService:
         purpose: str = "general"
     ) -> PackingList:
         """Generate smart packing list based on countries and purpose"""
+
+        stay_length = stay_length_bucket(duration_days)
+        try:
+            core, delta = await asyncio.gather(
+                self._core_cache.get_or_create(
+                    make_cache_key(destination_country, purpose, stay_length),
+                    lambda: self._generate_core(destination_country, stay_length, purpose)
+                ),
+                self._get_delta(home_country, destination_country)
+            )
+            return PackingList(**self._merge_list(core, delta, home_country, destination_country))
+        except Exception as e:
+            print(f"Error generating packing list: {e}")
+            return self._create_fallback_list(home_country, destination_country)
+
+    async def _generate_core(self, destination_country: str, stay_length: str, purpose: str) -> Dict[str, Any]:
+        """Generate the destination+purpose packing list (independent of home country)"""
         
-        prompt = f"""Generate a smart packing list for someone relocating from {home_country} to {destination_country} for {duration_days} days.
+        prompt = f"""Generate a smart packing list for someone relocating to {destination_country} for a stay of {stay_length}.
 Purpose: {purpose}
 
 Focus on items that are:
 1. Essential but may not be easily available in {destination_country}
-2. Specific to {home_country} culture/needs
-3. Climate-appropriate
-4. Purpose-specific
+2. Climate-appropriate
+3. Purpose-specific
+
+Items specific to the traveller's home country are added separately, so keep the list valid for anyone.
 
 Organize into categories:
 - Medicines & Health
@@ -35,8 +62,6 @@ For each category, mark priority as: essential, recommended, or optional
 
 Format as JSON:
 {{
-    "home_country": "{home_country}",
-    "destination_country": "{destination_country}",
     "categories": [
         {{
             "category": "Medicines & Health",
@@ -45,30 +70,66 @@ Format as JSON:
         }}
     ],
     "general_tips": ["tip 1", "tip 2"]
-}}
+}}"""
 
-Be specific about items from {home_country} that may not be available in {destination_country}."""
+        response = await gemini_service.generate_response(prompt)
+        data = parse_json_response(response)
+        data = {"categories": data["categories"], "general_tips": data.get("general_tips", [])}
+        PackingList(home_country="", destination_country=destination_country, **data)
+        return data
 
+    async def _get_delta(self, home_country: str, destination_country: str) -> Dict[str, Any]:
+        """Get items to bring from home; an empty delta is returned on failure"""
         try:
-            response = await gemini_service.generate_response(prompt)
-            
-            # Parse JSON
-            response_text = response.strip()
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-            
-            try:
-                data = json.loads(response_text)
-                return PackingList(**data)
-            except json.JSONDecodeError:
-                return self._create_fallback_list(home_country, destination_country)
-                
+            return await self._delta_cache.get_or_create(
+                make_cache_key(home_country, destination_country),
+                lambda: self._generate_delta(home_country, destination_country)
+            )
         except Exception as e:
-            print(f"Error generating packing list: {e}")
-            return self._create_fallback_list(home_country, destination_country)
-    
+            print(f"Error generating packing delta: {e}")
+            return {}
+
+    async def _generate_delta(self, home_country: str, destination_country: str) -> Dict[str, Any]:
+        """Generate items from the home country that are hard to find in the destination"""
+
+        prompt = f"""Someone from {home_country} is relocating to {destination_country}.
+List ONLY items from {home_country} (foods, spices, medicines, cultural or religious items, adapters) that are hard to find or expensive in {destination_country}.
+
+Format as JSON:
+{{
+    "categories": [
+        {{
+            "category": "Food Items & Spices",
+            "items": ["item 1", "item 2"],
+            "priority": "recommended"
+        }}
+    ],
+    "general_tips": ["tip specific to travellers from {home_country}"]
+}}
+
+Use only these category names: Medicines & Health, Food Items & Spices, Electronics & Adapters, Cultural & Religious Items.
+Keep it short: at most 4 items per category and 2 tips."""
+
+        response = await gemini_service.generate_response(prompt)
+        data = parse_json_response(response)
+        categories = [PackingCategory(**category).model_dump() for category in data.get("categories", [])]
+        return {"categories": categories, "general_tips": [str(tip) for tip in data.get("general_tips", []) if tip]}
+
+    def _merge_list(self, core: Dict[str, Any], delta: Dict[str, Any], home_country: str, destination_country: str) -> Dict[str, Any]:
+        """Merge the home-country delta into the shared destination core"""
+        categories = {category["category"].lower().strip(): category for category in core["categories"]}
+        for extra in delta.get("categories", []):
+            existing = categories.get(extra["category"].lower().strip())
+            if existing is None:
+                core["categories"].append(extra)
+                categories[extra["category"].lower().strip()] = extra
+            else:
+                existing["items"] = merge_items(existing["items"], extra["items"])
+        core["general_tips"] = merge_items(core.get("general_tips", []), delta.get("general_tips", []))
+        core["home_country"] = home_country
+        core["destination_country"] = destination_country
+        return core
+
     def _create_fallback_list(self, home: str, dest: str) -> PackingList:
         """Create fallback packing list"""
         return PackingList(
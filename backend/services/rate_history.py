@@ -0,0 +1,151 @@
+import datetime
+import json
+import os
+import struct
+import numpy as np
+from config import settings
+from typing import Dict, List, Optional
+
+# File layout (all little-endian):
+#   header block (HEADER_SIZE bytes): MAGIC | version (uint16) | capacity (uint32) |
+#       appended row count (uint64) | currency list length (uint32) | currency list JSON
+#   dates column:  int32[capacity]             days since 1970-01-01
+#   rate columns:  float64[currencies, capacity] units of each currency per 1 USD
+# Rows form a ring of ``capacity`` days, so the file never grows after creation;
+# once full, each new day overwrites the oldest one.
+MAGIC = b"VVRATE"
+FORMAT_VERSION = 1
+HEADER_SIZE = 4096
+_HEADER = struct.Struct("<6sHIQI")
+_COUNT = struct.Struct("<Q")
+_COUNT_OFFSET = struct.calcsize("<6sHI")
+_EPOCH = datetime.date(1970, 1, 1)
+
+
+def _day_number(day: datetime.date) -> int:
+    return (day - _EPOCH).days
+
+
+class RateHistory:
+    """Append-only, memory-mapped daily USD exchange-rate history stored by column"""
+
+    def __init__(self, path: str, capacity: int):
+        self.path = path
+        self.capacity = capacity
+        self.currencies: List[str] = []
+        self._columns: Dict[str, int] = {}
+        self._count = 0
+        self._header: Optional[np.memmap] = None
+        self._dates: Optional[np.memmap] = None
+        self._rates: Optional[np.memmap] = None
+
+    @property
+    def opened(self) -> bool:
+        return self._rates is not None
+
+    def _open(self, currencies: Optional[List[str]] = None) -> bool:
+        """Map the existing file, or create it when currencies for the columns are given"""
+        if self.opened:
+            return True
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                block = f.read(HEADER_SIZE)
+            magic, version, capacity, count, length = _HEADER.unpack_from(block, 0)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"unsupported rate history format {magic!r} v{version}")
+            self.capacity = capacity
+            self._count = count
+            self.currencies = json.loads(block[_HEADER.size:_HEADER.size + length])
+        elif currencies:
+            self._create(sorted(currencies))
+        else:
+            return False
+
+        self._columns = {code: index for index, code in enumerate(self.currencies)}
+        self._header = np.memmap(self.path, dtype=np.uint8, mode="r+", shape=(HEADER_SIZE,))
+        self._dates = np.memmap(self.path, dtype="<i4", mode="r+", offset=HEADER_SIZE, shape=(self.capacity,))
+        self._rates = np.memmap(
+            self.path, dtype="<f8", mode="r+",
+            offset=HEADER_SIZE + 4 * self.capacity,
+            shape=(len(self.currencies), self.capacity)
+        )
+        return True
+
+    def _create(self, currencies: List[str]) -> None:
+        names = json.dumps(currencies, separators=(",", ":")).encode("utf-8")
+        if _HEADER.size + len(names) > HEADER_SIZE:
+            raise ValueError("too many currencies for the rate history header")
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, self.capacity, 0, len(names)) + names)
+            f.truncate(HEADER_SIZE + (4 + 8 * len(currencies)) * self.capacity)
+        os.replace(tmp_path, self.path)
+        self.currencies = currencies
+        self._count = 0
+
+    def _slot(self, row: int) -> int:
+        return row % self.capacity
+
+    def record(self, rates: Dict[str, float], day: Optional[datetime.date] = None) -> None:
+        """Store one day's USD rates; recording the same day again updates that row"""
+        rates = {**rates, "USD": 1.0}
+        if not self._open(list(rates.keys())):
+            return
+        day_number = _day_number(day or datetime.date.today())
+        if self._count and self._dates[self._slot(self._count - 1)] == day_number:
+            slot = self._slot(self._count - 1)
+        elif self._count and self._dates[self._slot(self._count - 1)] > day_number:
+            # History only moves forward
+            return
+        else:
+            slot = self._slot(self._count)
+            self._count += 1
+
+        column = np.full(len(self.currencies), np.nan)
+        for code, rate in rates.items():
+            index = self._columns.get(code)
+            if index is not None:
+                column[index] = rate
+        self._rates[:, slot] = column
+        self._dates[slot] = day_number
+        # Publish the new row count only after the row itself is written
+        self._header[_COUNT_OFFSET:_COUNT_OFFSET + _COUNT.size] = np.frombuffer(_COUNT.pack(self._count), dtype=np.uint8)
+        self._rates.flush()
+        self._dates.flush()
+        self._header.flush()
+
+    def series(self, base: str, target: str, days: int) -> Optional[Dict[str, object]]:
+        """Daily base->target rates for the last ``days`` recorded days, with summary statistics"""
+        if not self._open():
+            return None
+        base_index = self._columns.get(base)
+        target_index = self._columns.get(target)
+        if base_index is None or target_index is None or not self._count:
+            return None
+
+        rows = min(self._count, self.capacity, max(days, 1))
+        slots = (np.arange(self._count - rows, self._count)) % self.capacity
+        values = self._rates[target_index, slots] / self._rates[base_index, slots]
+        valid = ~np.isnan(values)
+        if not valid.any():
+            return None
+        dates = self._dates[slots][valid]
+        values = values[valid]
+
+        return {
+            "dates": [(_EPOCH + datetime.timedelta(days=int(day))).isoformat() for day in dates],
+            "rates": np.round(values, 6).tolist(),
+            "mean_rate": round(float(values.mean()), 6),
+            "min_rate": round(float(values.min()), 6),
+            "max_rate": round(float(values.max()), 6),
+            "change_percent": round(float((values[-1] - values[0]) / values[0] * 100), 4)
+        }
+
+    def close(self) -> None:
+        self._header = None
+        self._dates = None
+        self._rates = None
+
+
+rate_history = RateHistory(settings.rate_history_path, settings.rate_history_days)
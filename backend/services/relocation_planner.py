@@ -1,24 +1,98 @@
 from services.gemini_service import gemini_service
+from services.cache_service import TTLCache, make_cache_key, parse_json_response, merge_items
 from models.relocation import RelocationPlan, VisaRecommendation
-from typing import Dict, Any
-import json
+from config import settings
+from typing import Dict, Any, List, Tuple
+import asyncio
+
+DRAFT = "draft"
+REFINED = "refined"
 
 class RelocationPlannerService:
+
+    def __init__(self):
+        # Destination+purpose core is shared by every home country;
+        # the small home-country delta is cached per pair.
+        self._core_cache = TTLCache("relocation_core", settings.cache_ttl_seconds, settings.cache_max_entries)
+        self._draft_cache = TTLCache("relocation_core_draft", settings.cache_ttl_seconds, settings.cache_max_entries)
+        self._delta_cache = TTLCache("relocation_delta", settings.cache_ttl_seconds, settings.cache_max_entries)
     
     async def generate_relocation_plan(
         self, 
         home_country: str, 
         destination_country: str, 
-        purpose: str
+        purpose: str,
+        strict: bool = False
     ) -> RelocationPlan:
-        """Generate comprehensive relocation plan using AI"""
+        """Generate comprehensive relocation plan using AI.
+
+        With ``strict`` a failed generation raises instead of returning the
+        fallback plan, so background jobs end FAILED and are retried.
+        """
+
+        try:
+            core, delta = await asyncio.gather(
+                self._get_core(destination_country, purpose, refined=True),
+                self._get_delta(home_country, destination_country, purpose, strict)
+            )
+            return RelocationPlan(**self._merge_plan(core[0], delta))
+        except Exception as e:
+            print(f"Error generating relocation plan: {e}")
+            if strict:
+                raise
+            return self._create_fallback_plan(str(e), home_country, destination_country, purpose)
+
+    async def generate_draft_plan(
+        self,
+        home_country: str,
+        destination_country: str,
+        purpose: str
+    ) -> Tuple[RelocationPlan, str]:
+        """Return the refined plan if cached, otherwise a fast Flash draft, with its quality"""
+
+        try:
+            (core, quality), delta = await asyncio.gather(
+                self._get_core(destination_country, purpose, refined=False),
+                self._get_delta(home_country, destination_country, purpose)
+            )
+            return RelocationPlan(**self._merge_plan(core, delta)), quality
+        except Exception as e:
+            print(f"Error generating draft relocation plan: {e}")
+            return self._create_fallback_plan(str(e), home_country, destination_country, purpose), DRAFT
+
+    async def _get_core(self, destination_country: str, purpose: str, refined: bool) -> Tuple[Dict[str, Any], str]:
+        """Get the shared core, preferring a refined (Pro) entry over a draft (Flash) one"""
+        key = make_cache_key(destination_country, purpose)
+        core = self._core_cache.get(key)
+        if core is not None:
+            return core, REFINED
+
+        if refined:
+            core = await self._core_cache.get_or_create(
+                key, lambda: self._generate_core(destination_country, purpose, use_pro=True)
+            )
+            # Later readers get the refined entry; the draft is no longer needed
+            self._draft_cache.delete(key)
+            return core, REFINED
+
+        core = await self._draft_cache.get_or_create(
+            key, lambda: asyncio.wait_for(
+                self._generate_core(destination_country, purpose, use_pro=False),
+                settings.draft_timeout_seconds
+            )
+        )
+        return core, DRAFT
+
+    async def _generate_core(self, destination_country: str, purpose: str, use_pro: bool = True) -> Dict[str, Any]:
+        """Generate the destination+purpose part of the plan (independent of home country)"""
         
         prompt = f"""You are an expert immigration consultant. Generate a detailed relocation plan for:
 
-Home Country: {home_country}
 Destination Country: {destination_country}
 Purpose: {purpose}
 
+The plan must apply to any international applicant; nationality-specific details are added separately.
+
 Provide a comprehensive response in the following JSON format:
 {{
     "visa_recommendations": [
@@ -36,30 +110,57 @@ Provide a comprehensive response in the following JSON format:
     "country_specific_rules": ["rule 1", "rule 2"]
 }}
 
-Be specific to the countries and purpose mentioned. Include practical, actionable advice."""
+Be specific to the destination country and purpose mentioned. Include practical, actionable advice."""
 
+        response = await gemini_service.generate_response(prompt, use_pro=use_pro)
+        data = parse_json_response(response)
+        RelocationPlan(**data)
+        return data
+
+    async def _get_delta(self, home_country: str, destination_country: str, purpose: str,
+                         strict: bool = False) -> Dict[str, Any]:
+        """Get home-country-specific additions; an empty delta is returned on failure unless strict"""
         try:
-            response = await gemini_service.generate_response(prompt, use_pro=True)
-            
-            # Try to parse JSON from response
-            # Gemini sometimes wraps JSON in markdown code blocks
-            response_text = response.strip()
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-            
-            try:
-                data = json.loads(response_text)
-                return RelocationPlan(**data)
-            except json.JSONDecodeError:
-                # Fallback: create structured response from text
-                return self._create_fallback_plan(response, home_country, destination_country, purpose)
-                
+            return await self._delta_cache.get_or_create(
+                make_cache_key(home_country, destination_country, purpose),
+                lambda: self._generate_delta(home_country, destination_country, purpose)
+            )
         except Exception as e:
-            print(f"Error generating relocation plan: {e}")
-            return self._create_fallback_plan(str(e), home_country, destination_country, purpose)
-    
+            print(f"Error generating relocation delta: {e}")
+            if strict:
+                raise
+            return {}
+
+    async def _generate_delta(self, home_country: str, destination_country: str, purpose: str) -> Dict[str, Any]:
+        """Generate the small home-country-specific part of the plan"""
+
+        prompt = f"""You are an expert immigration consultant. A citizen of {home_country} is relocating to {destination_country} for {purpose}.
+
+List ONLY what is specific to citizens of {home_country}. Do not repeat general {destination_country} requirements.
+
+Provide the response in the following JSON format:
+{{
+    "additional_documents": ["document only citizens of {home_country} need"],
+    "nationality_specific_rules": ["rule or exemption for citizens of {home_country}"],
+    "common_mistakes": ["mistake applicants from {home_country} often make"]
+}}
+
+Keep each list to at most 3 short items. Use empty lists when nothing specific applies."""
+
+        response = await gemini_service.generate_response(prompt)
+        data = parse_json_response(response)
+        return {
+            key: [str(item) for item in data.get(key, []) if item]
+            for key in ("additional_documents", "nationality_specific_rules", "common_mistakes")
+        }
+
+    def _merge_plan(self, core: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge the home-country delta into the shared destination core"""
+        core["document_checklist"] = merge_items(core.get("document_checklist", []), delta.get("additional_documents", []))
+        core["country_specific_rules"] = merge_items(core.get("country_specific_rules", []), delta.get("nationality_specific_rules", []))
+        core["common_mistakes"] = merge_items(core.get("common_mistakes", []), delta.get("common_mistakes", []))
+        return core
+
     def _create_fallback_plan(self, response_text: str, home: str, dest: str, purpose: str) -> RelocationPlan:
         """Create a fallback plan when JSON parsing fails"""
         return RelocationPlan(
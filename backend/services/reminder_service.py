@@ -0,0 +1,268 @@
+from config import settings
+from typing import Any, Dict, Iterable, List, Optional
+import asyncio
+import heapq
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import requests
+
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+MAX_ATTEMPTS = 3
+RETRY_DELAY_SECONDS = 60
+
+
+class FileSink:
+    """Appends each delivered reminder as a JSON line to a local file"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    async def deliver(self, reminder: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self._append, json.dumps(reminder))
+
+    def _append(self, line: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class WebhookSink:
+    """POSTs each reminder as JSON to a webhook URL"""
+
+    def __init__(self, url: str):
+        self.url = url
+
+    async def deliver(self, reminder: Dict[str, Any]) -> None:
+        response = await asyncio.to_thread(requests.post, self.url, json=reminder, timeout=10)
+        response.raise_for_status()
+
+
+class ReminderStore:
+    """SQLite persistence for reminders; all calls are serialized on one connection"""
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS reminders (
+                    id TEXT PRIMARY KEY,
+                    task_id TEXT NOT NULL,
+                    fire_at REAL NOT NULL,
+                    reminder_type TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    sent_at REAL
+                )"""
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_reminders_pending ON reminders (status, fire_at)")
+
+    def insert_many(self, rows: List[Dict[str, Any]]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO reminders (id, task_id, fire_at, reminder_type, payload, status, attempts, created_at) "
+                "VALUES (:id, :task_id, :fire_at, :reminder_type, :payload, :status, :attempts, :created_at)",
+                [{**row, "payload": json.dumps(row["payload"])} for row in rows]
+            )
+
+    def update(self, reminder_id: str, **fields: Any) -> None:
+        columns = ", ".join(f"{name} = :{name}" for name in fields)
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE reminders SET {columns} WHERE id = :id", {**fields, "id": reminder_id})
+
+    def get(self, reminder_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, task_id, fire_at, reminder_type, payload, status, attempts, created_at, sent_at "
+                "FROM reminders WHERE id = ?", (reminder_id,)
+            ).fetchone()
+        return self._row(row) if row else None
+
+    def pending(self) -> List[tuple]:
+        """(fire_at, id) for every pending reminder"""
+        with self._lock:
+            return self._conn.execute("SELECT fire_at, id FROM reminders WHERE status = ?", (PENDING,)).fetchall()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _row(self, row: tuple) -> Dict[str, Any]:
+        keys = ("id", "task_id", "fire_at", "reminder_type", "payload", "status", "attempts", "created_at", "sent_at")
+        record = dict(zip(keys, row))
+        record["payload"] = json.loads(record["payload"])
+        return record
+
+
+class ReminderService:
+    """In-process reminder engine.
+
+    Pending reminders live in a min-heap of (fire_at, seq, id) backed by
+    SQLite, so scheduling is O(log n) and the queue is rebuilt on restart.
+    A single dispatcher task sleeps until the earliest reminder is due and is
+    only woken early when a new reminder becomes the earliest one. Cancelled
+    reminders are dropped lazily when they reach the top of the heap.
+    """
+
+    def __init__(self, store: Optional[ReminderStore] = None, sink=None):
+        self._store = store
+        self._sink = sink
+        self._heap: List[tuple] = []
+        self._seq = 0
+        self._cancelled = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._start_lock = asyncio.Lock()
+
+    @property
+    def started(self) -> bool:
+        return self._dispatcher is not None and not self._dispatcher.done()
+
+    async def start(self) -> None:
+        """Open the store, recover pending reminders and start the dispatcher"""
+        if self.started:
+            return
+        async with self._start_lock:
+            if not self.started:
+                await self._recover()
+
+    async def _recover(self) -> None:
+        if self._store is None:
+            self._store = await asyncio.to_thread(ReminderStore, settings.reminder_db_path)
+        if self._sink is None:
+            self._sink = self._default_sink()
+        pending = await asyncio.to_thread(self._store.pending)
+        self._heap = []
+        for fire_at, reminder_id in pending:
+            self._heap.append((fire_at, self._next_seq(), reminder_id))
+        heapq.heapify(self._heap)
+        self._wakeup = asyncio.Event()
+        self._dispatcher = asyncio.create_task(self._dispatch())
+        print(f"[OK] Reminder engine recovered {len(self._heap)} pending reminders")
+
+    async def stop(self) -> None:
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+
+    async def schedule(self, task_id: str, fire_at: float, reminder_type: str = "email",
+                       payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Persist and queue one reminder"""
+        return (await self.schedule_many([{
+            "task_id": task_id, "fire_at": fire_at, "reminder_type": reminder_type, "payload": payload or {}
+        }]))[0]
+
+    async def schedule_many(self, reminders: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Persist and queue many reminders in one transaction"""
+        await self.start()
+        now = time.time()
+        rows = [{
+            "id": uuid.uuid4().hex,
+            "task_id": str(reminder["task_id"]),
+            "fire_at": float(reminder["fire_at"]),
+            "reminder_type": reminder.get("reminder_type", "email"),
+            "payload": reminder.get("payload") or {},
+            "status": PENDING,
+            "attempts": 0,
+            "created_at": now
+        } for reminder in reminders]
+        await asyncio.to_thread(self._store.insert_many, rows)
+
+        earliest = self._heap[0][0] if self._heap else None
+        for row in rows:
+            heapq.heappush(self._heap, (row["fire_at"], self._next_seq(), row["id"]))
+        if rows and (earliest is None or self._heap[0][0] < earliest):
+            # Only a new head changes when the dispatcher must wake up
+            self._wakeup.set()
+        return [{**row, "sent_at": None} for row in rows]
+
+    async def cancel(self, reminder_id: str) -> bool:
+        await self.start()
+        reminder = await asyncio.to_thread(self._store.get, reminder_id)
+        if reminder is None or reminder["status"] != PENDING:
+            return False
+        self._cancelled.add(reminder_id)
+        await asyncio.to_thread(self._store.update, reminder_id, status=CANCELLED)
+        return True
+
+    async def get(self, reminder_id: str) -> Optional[Dict[str, Any]]:
+        await self.start()
+        return await asyncio.to_thread(self._store.get, reminder_id)
+
+    def pending_count(self) -> int:
+        return len(self._heap) - len(self._cancelled)
+
+    async def _dispatch(self) -> None:
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            # Everything already due is sent in one pass
+            now = time.time()
+            while self._heap and self._heap[0][0] <= now:
+                _, _, reminder_id = heapq.heappop(self._heap)
+                if reminder_id in self._cancelled:
+                    self._cancelled.discard(reminder_id)
+                    continue
+                await self._fire(reminder_id)
+
+    async def _fire(self, reminder_id: str) -> None:
+        reminder = await asyncio.to_thread(self._store.get, reminder_id)
+        if reminder is None or reminder["status"] != PENDING:
+            return
+        attempts = reminder["attempts"] + 1
+        try:
+            await self._sink.deliver({
+                "id": reminder["id"],
+                "task_id": reminder["task_id"],
+                "reminder_type": reminder["reminder_type"],
+                "fire_at": reminder["fire_at"],
+                "payload": reminder["payload"]
+            })
+            await asyncio.to_thread(self._store.update, reminder_id, status=SENT, attempts=attempts, sent_at=time.time())
+        except Exception as e:
+            print(f"Reminder {reminder_id} delivery failed (attempt {attempts}): {e}")
+            if attempts >= MAX_ATTEMPTS:
+                await asyncio.to_thread(self._store.update, reminder_id, status=FAILED, attempts=attempts)
+                return
+            retry_at = time.time() + RETRY_DELAY_SECONDS * attempts
+            await asyncio.to_thread(self._store.update, reminder_id, attempts=attempts, fire_at=retry_at)
+            heapq.heappush(self._heap, (retry_at, self._next_seq(), reminder_id))
+
+    def _next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
+    def _default_sink(self):
+        if settings.reminder_sink == "webhook" and settings.reminder_webhook_url:
+            return WebhookSink(settings.reminder_webhook_url)
+        return FileSink(settings.reminder_sink_path)
+
+
+reminder_service = ReminderService()
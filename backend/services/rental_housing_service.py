@@ -1,8 +1,15 @@
 from services.gemini_service import gemini_service
+from services.cache_service import StaleWhileRevalidateCache, make_cache_key, parse_json_response
 from models.rental_housing import RentalHousingResponse
-import json
+from config import settings
+from typing import Dict, Any
 
 class RentalHousingService:
+
+    def __init__(self):
+        self._cache = StaleWhileRevalidateCache(
+            "rental_guide", settings.cache_ttl_seconds, settings.cache_max_stale_seconds, settings.cache_max_entries
+        )
     
     async def get_rental_guide(
         self,
@@ -10,6 +17,19 @@ class RentalHousingService:
         city: str = None
     ) -> RentalHousingResponse:
         """Get rental housing guidance for a country"""
+
+        try:
+            data = await self._cache.get_or_revalidate(
+                make_cache_key(destination_country, city),
+                lambda: self._generate_guide(destination_country, city)
+            )
+            return RentalHousingResponse(**data)
+        except Exception as e:
+            print(f"Error getting rental guide: {e}")
+            return self._create_fallback_guide(destination_country)
+
+    async def _generate_guide(self, destination_country: str, city: str = None) -> Dict[str, Any]:
+        """Generate the rental guide with Gemini; raises if the response cannot be parsed"""
         
         location = f"{city}, {destination_country}" if city else destination_country
         
@@ -50,22 +70,10 @@ Provide response in JSON format:
 
 Provide at least 4-5 different rental options in various price ranges and areas. Be specific to {destination_country}'s rental market, laws, and common practices."""
 
-        try:
-            response = await gemini_service.generate_response(prompt)
-            response_text = response.strip()
-            
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-            
-            data = json.loads(response_text)
-            return RentalHousingResponse(**data)
-            
-        except Exception as e:
-            print(f"Error getting rental guide: {e}")
-            return self._create_fallback_guide(destination_country)
-    
+        response = await gemini_service.generate_response(prompt)
+        data = parse_json_response(response)
+        return RentalHousingResponse(**data).model_dump()
+
     def _create_fallback_guide(self, country: str) -> RentalHousingResponse:
         """Create fallback rental guide"""
         return RentalHousingResponse(
@@ -0,0 +1,120 @@
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# File layout:
+#   MAGIC | format version (uint16) | header length (uint32) | header JSON | payload
+# The header holds metadata plus an index of key -> [offset, length] into the
+# payload, where each record is a zlib-compressed compact JSON document.
+MAGIC = b"VVSNAP"
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct("<6sHI")
+
+
+def write_snapshot(path: str, entries: Iterable[Tuple[str, Any]], content_version: str = "") -> int:
+    """Write entries to a snapshot file atomically and return the number of records"""
+    index: Dict[str, list] = {}
+    chunks = []
+    offset = 0
+    for key, value in entries:
+        blob = zlib.compress(json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8"), 9)
+        index[key] = [offset, len(blob)]
+        chunks.append(blob)
+        offset += len(blob)
+
+    header = json.dumps({
+        "created_at": time.time(),
+        "content_version": content_version,
+        "index": index
+    }, separators=(",", ":")).encode("utf-8")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+        f.write(header)
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp_path, path)
+    return len(index)
+
+
+class SnapshotStore:
+    """Read-only, memory-mapped view of a precomputed snapshot.
+
+    Only the header index is parsed at load time; individual records are
+    decompressed and decoded on demand straight from the mapping.
+    """
+
+    def __init__(self):
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._index: Dict[str, list] = {}
+        self._payload_start = 0
+        self.created_at: float = 0.0
+        self.content_version: str = ""
+        self.path: Optional[str] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._mmap is not None
+
+    def load(self, path: str) -> bool:
+        """Map a snapshot file; returns False (and stays empty) if it is missing or invalid"""
+        self.close()
+        if not path or not os.path.exists(path):
+            return False
+        try:
+            self._file = open(path, "rb")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, header_length = _PREAMBLE.unpack_from(self._mmap, 0)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"unsupported snapshot format {magic!r} v{version}")
+            header_start = _PREAMBLE.size
+            header = json.loads(self._mmap[header_start:header_start + header_length])
+            self._index = header["index"]
+            self.created_at = header["created_at"]
+            self.content_version = header.get("content_version", "")
+            self._payload_start = header_start + header_length
+            self.path = path
+            print(f"[OK] Loaded snapshot {path} with {len(self._index)} records (version {self.content_version or 'n/a'})")
+            return True
+        except Exception as e:
+            print(f"[WARNING] Could not load snapshot {path}: {e}")
+            self.close()
+            return False
+
+    def get(self, key: str) -> Optional[Any]:
+        """Decode a single record, or None if the key is not in the snapshot"""
+        if self._mmap is None:
+            return None
+        location = self._index.get(key)
+        if location is None:
+            return None
+        offset, length = location
+        start = self._payload_start + offset
+        return json.loads(zlib.decompress(self._mmap[start:start + length]))
+
+    def keys(self):
+        return self._index.keys()
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._mmap = None
+        self._index = {}
+        self.path = None
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+snapshot_store = SnapshotStore()
@@ -1,68 +1,222 @@
 from services.gemini_service import gemini_service
+from services.cache_service import TTLCache, make_cache_key, parse_json_response, merge_items
 from models.survival_plan import SurvivalPlanResponse, WeekPlan
-import json
+from config import settings
+from typing import Dict, Any, List, Tuple
+import asyncio
+
+DRAFT = "draft"
+REFINED = "refined"
+
+# (week number, theme, priority) shared by every block prompt
+WEEK_OUTLINE = [
+    (1, "Registration, SIM & Banking", "critical"),
+    (2, "Workplace/University Adaptation", "important"),
+    (3, "Cultural Integration", "important"),
+    (4, "Financial Stabilization", "recommended"),
+]
+PLAN_BLOCKS = ["week_1", "week_2", "week_3", "week_4", "overview"]
 
 class SurvivalPlanService:
+
+    def __init__(self):
+        self._core_cache = TTLCache("survival_core", settings.cache_ttl_seconds, settings.cache_max_entries)
+        self._draft_cache = TTLCache("survival_core_draft", settings.cache_ttl_seconds, settings.cache_max_entries)
+        self._delta_cache = TTLCache("survival_delta", settings.cache_ttl_seconds, settings.cache_max_entries)
     
     async def generate_survival_plan(
         self, 
         home_country: str, 
         destination_country: str, 
-        purpose: str
+        purpose: str,
+        strict: bool = False
     ) -> SurvivalPlanResponse:
-        """Generate 30-day survival plan using AI"""
-        
-        prompt = f"""You are an expert relocation consultant. Create a detailed 30-day survival plan for someone moving from {home_country} to {destination_country} for {purpose}.
+        """Generate 30-day survival plan using AI.
+
+        With ``strict`` a failed block or delta raises instead of being filled
+        from the fallback plan, so background jobs end FAILED and are retried.
+        """
+
+        try:
+            (core, quality), delta = await asyncio.gather(
+                self._get_core(destination_country, purpose, refined=True),
+                self._get_delta(home_country, destination_country, strict)
+            )
+            # With refined=True a block is only below REFINED when it fell back
+            if strict and quality != REFINED:
+                raise ValueError("Survival plan fell back for at least one block")
+            return SurvivalPlanResponse(**self._merge_plan(core, delta))
+        except Exception as e:
+            print(f"Error generating survival plan: {e}")
+            if strict:
+                raise
+            return self._create_fallback_plan(destination_country, purpose)
+
+    async def generate_draft_plan(
+        self,
+        home_country: str,
+        destination_country: str,
+        purpose: str
+    ) -> Tuple[SurvivalPlanResponse, str]:
+        """Return the refined plan if cached, otherwise a fast Flash draft, with its quality"""
+
+        try:
+            (core, quality), delta = await asyncio.gather(
+                self._get_core(destination_country, purpose, refined=False),
+                self._get_delta(home_country, destination_country)
+            )
+            return SurvivalPlanResponse(**self._merge_plan(core, delta)), quality
+        except Exception as e:
+            print(f"Error generating draft survival plan: {e}")
+            return self._create_fallback_plan(destination_country, purpose), DRAFT
+
+    async def _get_core(self, destination_country: str, purpose: str, refined: bool) -> Tuple[Dict[str, Any], str]:
+        """Assemble the shared core from independently generated and cached blocks.
+
+        Each week and the overview/contacts block is generated concurrently; a
+        block that fails is filled from the fallback plan (and not cached) so only
+        that block is regenerated on the next request.
+        """
+        results = await asyncio.gather(
+            *(self._get_block(destination_country, purpose, block, refined) for block in PLAN_BLOCKS),
+            return_exceptions=True
+        )
+
+        core: Dict[str, Any] = {}
+        quality = REFINED
+        fallback = None
+        for block, result in zip(PLAN_BLOCKS, results):
+            if isinstance(result, BaseException):
+                print(f"Error generating survival plan block {block}: {result}")
+                if fallback is None:
+                    fallback = self._create_fallback_plan(destination_country, purpose).model_dump()
+                core.update(self._block_fields(block, fallback))
+                quality = DRAFT
+            else:
+                data, block_quality = result
+                core.update(data)
+                if block_quality == DRAFT:
+                    quality = DRAFT
+        return core, quality
+
+    def _block_fields(self, block: str, plan: Dict[str, Any]) -> Dict[str, Any]:
+        """Select the fields of a full plan that belong to one block"""
+        if block == "overview":
+            return {"overview": plan["overview"], "emergency_contacts": plan["emergency_contacts"]}
+        return {block: plan[block]}
+
+    async def _get_block(self, destination_country: str, purpose: str, block: str, refined: bool) -> Tuple[Dict[str, Any], str]:
+        """Get one block, preferring a refined (Pro) entry over a draft (Flash) one"""
+        key = make_cache_key(destination_country, purpose, block)
+        data = self._core_cache.get(key)
+        if data is not None:
+            return data, REFINED
+
+        if refined:
+            data = await self._core_cache.get_or_create(
+                key, lambda: self._generate_block(destination_country, purpose, block, use_pro=True)
+            )
+            # Later readers get the refined entry; the draft is no longer needed
+            self._draft_cache.delete(key)
+            return data, REFINED
+
+        data = await self._draft_cache.get_or_create(
+            key, lambda: asyncio.wait_for(
+                self._generate_block(destination_country, purpose, block, use_pro=False),
+                settings.draft_timeout_seconds
+            )
+        )
+        return data, DRAFT
 
-Provide a comprehensive response in the following JSON format:
+    def _plan_context(self, destination_country: str, purpose: str) -> str:
+        """Shared context given to every block so the weeks don't overlap"""
+        outline = "\n".join(
+            f"- Week {number}: {title} (priority: {priority})" for number, title, priority in WEEK_OUTLINE
+        )
+        return f"""You are an expert relocation consultant building a 30-day survival plan for someone moving to {destination_country} for {purpose}.
+The plan must apply to any newcomer; home-country-specific tasks are added separately.
+
+The plan is organised as:
+{outline}"""
+
+    async def _generate_block(self, destination_country: str, purpose: str, block: str, use_pro: bool = True) -> Dict[str, Any]:
+        """Generate a single week or the overview/contacts block"""
+
+        if block == "overview":
+            prompt = f"""Write ONLY the overview and the emergency contacts for this plan.
+
+Provide the response in the following JSON format:
 {{
-    "week_1": {{
-        "week_number": 1,
-        "title": "Registration, SIM & Banking",
-        "tasks": ["task 1", "task 2", "task 3"],
-        "priority": "critical"
-    }},
-    "week_2": {{
-        "week_number": 2,
-        "title": "Workplace/University Adaptation",
-        "tasks": ["task 1", "task 2", "task 3"],
-        "priority": "important"
-    }},
-    "week_3": {{
-        "week_number": 3,
-        "title": "Cultural Integration",
-        "tasks": ["task 1", "task 2", "task 3"],
-        "priority": "important"
-    }},
-    "week_4": {{
-        "week_number": 4,
-        "title": "Financial Stabilization",
-        "tasks": ["task 1", "task 2", "task 3"],
-        "priority": "recommended"
-    }},
     "overview": "Brief overview of the 30-day plan",
     "emergency_contacts": ["Emergency number 1", "Emergency number 2"]
 }}
 
-Be specific to {destination_country}. Include practical, actionable tasks for each week."""
+Use real emergency numbers and services for {destination_country}."""
+        else:
+            number, title, priority = WEEK_OUTLINE[int(block.split("_")[1]) - 1]
+            prompt = f"""Write ONLY week {number} ("{title}"). Do not include tasks that belong to the other weeks.
+
+Provide the response in the following JSON format:
+{{
+    "week_number": {number},
+    "title": "{title}",
+    "tasks": ["task 1", "task 2", "task 3", "task 4", "task 5"],
+    "priority": "{priority}"
+}}
+
+Be specific to {destination_country}. Include practical, actionable tasks."""
 
+        response = await gemini_service.generate_response(prompt, context=self._plan_context(destination_country, purpose), use_pro=use_pro)
+        data = parse_json_response(response)
+        if block == "overview":
+            return {"overview": str(data["overview"]), "emergency_contacts": [str(item) for item in data["emergency_contacts"]]}
+        return {block: WeekPlan(**data).model_dump()}
+
+    async def _get_delta(self, home_country: str, destination_country: str, strict: bool = False) -> Dict[str, Any]:
+        """Get home-country-specific additions; an empty delta is returned on failure unless strict"""
         try:
-            response = await gemini_service.generate_response(prompt, use_pro=True)
-            response_text = response.strip()
-            
-            # Parse JSON from response
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-            
-            data = json.loads(response_text)
-            return SurvivalPlanResponse(**data)
-            
+            return await self._delta_cache.get_or_create(
+                make_cache_key(home_country, destination_country),
+                lambda: self._generate_delta(home_country, destination_country)
+            )
         except Exception as e:
-            print(f"Error generating survival plan: {e}")
-            return self._create_fallback_plan(destination_country, purpose)
-    
+            print(f"Error generating survival plan delta: {e}")
+            if strict:
+                raise
+            return {}
+
+    async def _generate_delta(self, home_country: str, destination_country: str) -> Dict[str, Any]:
+        """Generate the small home-country-specific part of the plan"""
+
+        prompt = f"""You are an expert relocation consultant. Someone from {home_country} has just moved to {destination_country}.
+
+List ONLY first-month tasks that are specific to people from {home_country} (embassy/consulate registration, diaspora communities, home-country banking or tax obligations).
+
+Provide the response in the following JSON format:
+{{
+    "week_1_tasks": ["task"],
+    "week_2_tasks": ["task"],
+    "week_3_tasks": ["task"],
+    "week_4_tasks": ["task"],
+    "emergency_contacts": ["{home_country} embassy or consulate in {destination_country} with phone number"]
+}}
+
+Keep each list to at most 2 short items. Use empty lists when nothing specific applies."""
+
+        response = await gemini_service.generate_response(prompt)
+        data = parse_json_response(response)
+        return {
+            key: [str(item) for item in data.get(key, []) if item]
+            for key in ("week_1_tasks", "week_2_tasks", "week_3_tasks", "week_4_tasks", "emergency_contacts")
+        }
+
+    def _merge_plan(self, core: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge the home-country delta into the shared destination core"""
+        for week in ("week_1", "week_2", "week_3", "week_4"):
+            core[week]["tasks"] = merge_items(core[week].get("tasks", []), delta.get(f"{week}_tasks", []))
+        core["emergency_contacts"] = merge_items(core.get("emergency_contacts", []), delta.get("emergency_contacts", []))
+        return core
+
     def _create_fallback_plan(self, destination: str, purpose: str) -> SurvivalPlanResponse:
         """Create a fallback plan when AI fails"""
         return SurvivalPlanResponse(
@@ -0,0 +1,289 @@
+from services.gemini_service import gemini_service
+from services.cache_service import StaleWhileRevalidateCache, make_cache_key, parse_json_response
+from config import settings
+from collections import deque
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+# (name, fewest days before departure, focus) - a task belongs to the first
+# phase whose threshold its start date meets
+PHASES = [
+    ("Planning", 61, "Research requirements, start long-lead applications and set the budget"),
+    ("Preparation", 15, "Complete applications, book travel and housing, organise finances and health"),
+    ("Final Weeks", 1, "Pack, ship belongings, close local accounts and say goodbye"),
+    ("Departure", None, "Travel day essentials and documents"),
+]
+
+FALLBACK_GRAPH = {
+    "tasks": [
+        {"id": "research", "title": "Research visa requirements", "description": "Check the visa type, documents and processing times for your destination.", "priority": "high", "category": "visa", "durationDays": 7, "dependencies": [], "dueDaysBeforeDeparture": 0, "milestone": False},
+        {"id": "documents", "title": "Gather documents", "description": "Passport, certificates, translations and photos needed for the application.", "priority": "high", "category": "documents", "durationDays": 14, "dependencies": ["research"], "dueDaysBeforeDeparture": 0, "milestone": False},
+        {"id": "visa", "title": "Apply for visa", "description": "Submit the application and attend any appointment.", "priority": "high", "category": "visa", "durationDays": 30, "dependencies": ["documents"], "dueDaysBeforeDeparture": 14, "milestone": True},
+        {"id": "health", "title": "Arrange health insurance and vaccinations", "description": "Get travel/health insurance and any required vaccinations.", "priority": "medium", "category": "health", "durationDays": 14, "dependencies": ["research"], "dueDaysBeforeDeparture": 7, "milestone": False},
+        {"id": "flight", "title": "Book flight", "description": "Book your flight once the visa is approved.", "priority": "high", "category": "logistics", "durationDays": 2, "dependencies": ["visa"], "dueDaysBeforeDeparture": 7, "milestone": True},
+        {"id": "housing", "title": "Arrange initial accommodation", "description": "Book temporary housing for your first weeks.", "priority": "high", "category": "housing", "durationDays": 7, "dependencies": ["visa"], "dueDaysBeforeDeparture": 3, "milestone": False},
+        {"id": "finance", "title": "Prepare finances", "description": "Notify your bank, order a travel card and some local currency.", "priority": "medium", "category": "finance", "durationDays": 5, "dependencies": [], "dueDaysBeforeDeparture": 3, "milestone": False},
+        {"id": "packing", "title": "Pack and ship belongings", "description": "Pack essentials and arrange shipping for larger items.", "priority": "medium", "category": "logistics", "durationDays": 7, "dependencies": ["flight"], "dueDaysBeforeDeparture": 1, "milestone": False},
+        {"id": "goodbye", "title": "Say goodbye and close local commitments", "description": "Cancel subscriptions, hand over your home and see friends and family.", "priority": "low", "category": "personal", "durationDays": 5, "dependencies": [], "dueDaysBeforeDeparture": 1, "milestone": False},
+        {"id": "departure", "title": "Departure day", "description": "Carry passport, visa and key documents in your hand luggage.", "priority": "high", "category": "logistics", "durationDays": 0, "dependencies": ["packing", "housing", "finance", "health", "goodbye"], "dueDaysBeforeDeparture": 0, "milestone": True},
+    ],
+    "tips": [
+        "Start with the tasks marked critical; they have no slack.",
+        "Keep digital copies of every document you submit.",
+    ],
+}
+
+
+def topological_order(tasks: List[Dict[str, Any]]) -> Tuple[List[str], List[str]]:
+    """Kahn's algorithm over task ids; returns (order, ids whose cyclic dependencies were dropped)"""
+    ids = [task["id"] for task in tasks]
+    known = set(ids)
+    deps = {task["id"]: [dep for dep in task["dependencies"] if dep in known and dep != task["id"]] for task in tasks}
+    indegree = {task_id: len(deps[task_id]) for task_id in ids}
+    successors: Dict[str, List[str]] = {task_id: [] for task_id in ids}
+    for task_id in ids:
+        for dep in deps[task_id]:
+            successors[dep].append(task_id)
+
+    queue = deque(task_id for task_id in ids if indegree[task_id] == 0)
+    order = []
+    while queue:
+        task_id = queue.popleft()
+        order.append(task_id)
+        for successor in successors[task_id]:
+            indegree[successor] -= 1
+            if indegree[successor] == 0:
+                queue.append(successor)
+
+    # Anything left is on a cycle; keep it, in original order, without those dependencies
+    cyclic = [task_id for task_id in ids if indegree[task_id] > 0]
+    return order + cyclic, cyclic
+
+
+def schedule_timeline(graph: Dict[str, Any], departure: Optional[date], today: date) -> Dict[str, Any]:
+    """Place a task graph on the calendar.
+
+    Tasks are scheduled backwards from the departure date as late as their
+    deadlines and successors allow, and forwards from today as early as their
+    dependencies allow. The difference is each task's slack; tasks with the
+    least slack form the critical path. Without a departure date, the earliest
+    feasible departure is used.
+    """
+    tasks = {task["id"]: task for task in graph["tasks"]}
+    order, cyclic = topological_order(graph["tasks"])
+    deps = {
+        task_id: [dep for dep in tasks[task_id]["dependencies"] if dep in tasks and dep != task_id and task_id not in cyclic]
+        for task_id in order
+    }
+    successors: Dict[str, List[str]] = {task_id: [] for task_id in order}
+    for task_id in order:
+        for dep in deps[task_id]:
+            successors[dep].append(task_id)
+
+    # Forward pass from today
+    earliest_start: Dict[str, date] = {}
+    earliest_finish: Dict[str, date] = {}
+    for task_id in order:
+        start = max([today] + [earliest_finish[dep] for dep in deps[task_id]])
+        earliest_start[task_id] = start
+        earliest_finish[task_id] = start + timedelta(days=tasks[task_id]["durationDays"])
+
+    flexible = departure is None
+    if flexible:
+        departure = max(
+            [today] + [earliest_finish[task_id] + timedelta(days=tasks[task_id]["dueDaysBeforeDeparture"]) for task_id in order]
+        )
+
+    # Backward pass from departure
+    latest_start: Dict[str, date] = {}
+    latest_finish: Dict[str, date] = {}
+    for task_id in reversed(order):
+        finish = min(
+            [departure - timedelta(days=tasks[task_id]["dueDaysBeforeDeparture"])]
+            + [latest_start[successor] for successor in successors[task_id]]
+        )
+        latest_finish[task_id] = finish
+        latest_start[task_id] = finish - timedelta(days=tasks[task_id]["durationDays"])
+
+    slack = {task_id: (latest_start[task_id] - earliest_start[task_id]).days for task_id in order}
+    min_slack = min(slack.values()) if slack else 0
+    critical_path = [task_id for task_id in order if slack[task_id] == min_slack]
+
+    scheduled = []
+    for task_id in order:
+        task = tasks[task_id]
+        start = max(latest_start[task_id], today)
+        scheduled.append({
+            "id": task_id,
+            "title": task["title"],
+            "description": task["description"],
+            "date": start.isoformat(),
+            "dueDate": latest_finish[task_id].isoformat(),
+            "earliestStart": earliest_start[task_id].isoformat(),
+            "priority": task["priority"],
+            "category": task["category"],
+            "estimatedDuration": f"{task['durationDays']} day{'s' if task['durationDays'] != 1 else ''}",
+            "durationDays": task["durationDays"],
+            "dependencies": deps[task_id],
+            "slackDays": slack[task_id],
+            "critical": task_id in critical_path,
+            "late": latest_start[task_id] < today,
+            "phase": _phase_for(start, departure),
+            "completed": False,
+            "type": "system"
+        })
+    scheduled.sort(key=lambda task: (task["date"], task["dueDate"]))
+
+    warnings = []
+    if min_slack < 0:
+        warnings.append(
+            f"The critical path needs {-min_slack} more day(s) than are left before departure; "
+            "consider moving the departure date or expediting critical tasks."
+        )
+    if cyclic:
+        warnings.append("Some task dependencies were circular and have been ignored.")
+
+    return {
+        "departureDate": departure.isoformat(),
+        "flexibleDeparture": flexible,
+        "tasks": scheduled,
+        "criticalPath": critical_path,
+        "milestones": _milestones(scheduled, tasks, departure),
+        "phases": _phases(scheduled),
+        "tips": list(graph.get("tips", [])),
+        "warnings": warnings
+    }
+
+
+def _phase_for(start: date, departure: date) -> str:
+    days_before = (departure - start).days
+    for name, threshold, _ in PHASES:
+        if threshold is None or days_before >= threshold:
+            return name
+    return PHASES[-1][0]
+
+
+def _phases(scheduled: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    phases = []
+    for name, _, focus in PHASES:
+        members = [task for task in scheduled if task["phase"] == name]
+        if members:
+            phases.append({
+                "name": name,
+                "startDate": min(task["date"] for task in members),
+                "endDate": max(task["dueDate"] for task in members),
+                "focus": focus
+            })
+    return phases
+
+
+def _milestones(scheduled: List[Dict[str, Any]], tasks: Dict[str, Dict[str, Any]], departure: date) -> List[Dict[str, str]]:
+    milestones = [
+        {"name": task["title"], "date": task["dueDate"], "importance": "critical" if task["critical"] else "important"}
+        for task in scheduled if tasks[task["id"]].get("milestone")
+    ]
+    milestones.append({"name": "Departure", "date": departure.isoformat(), "importance": "critical"})
+    return sorted(milestones, key=lambda milestone: milestone["date"])
+
+
+class TimelineService:
+
+    def __init__(self):
+        # The task graph does not depend on dates, so any departure date reuses it
+        self._graph_cache = StaleWhileRevalidateCache(
+            "timeline_graph", settings.cache_ttl_seconds, settings.cache_max_stale_seconds, settings.cache_max_entries
+        )
+
+    async def get_timeline(
+        self,
+        destination: str,
+        departure: Optional[date],
+        visa_type: Optional[str],
+        relocation_type: Optional[str],
+        today: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """Relocation timeline scheduled locally from a cached task graph"""
+        try:
+            graph = await self._graph_cache.get_or_revalidate(
+                make_cache_key(destination, visa_type, relocation_type),
+                lambda: self._generate_graph(destination, visa_type, relocation_type)
+            )
+        except Exception as e:
+            print(f"Error generating timeline task graph: {e}")
+            graph = FALLBACK_GRAPH
+        return schedule_timeline(graph, departure, today or date.today())
+
+    async def _generate_graph(self, destination: str, visa_type: Optional[str], relocation_type: Optional[str]) -> Dict[str, Any]:
+        """Ask the model for tasks, durations and dependencies only; dates are computed locally"""
+        prompt = f"""
+    As a relocation planning expert, list the tasks for someone relocating to {destination}.
+
+    Visa Type: {visa_type or 'Not specified'}
+    Relocation Type: {relocation_type or 'general'}
+
+    Do NOT assign calendar dates. Provide a JSON response with:
+    {{
+        "tasks": [
+            {{
+                "id": "short_unique_id",
+                "title": "task title",
+                "description": "detailed description",
+                "priority": "high/medium/low",
+                "category": "visa/housing/finance/health/logistics/etc",
+                "durationDays": 14,
+                "dependencies": ["ids of tasks that must finish before this one starts"],
+                "dueDaysBeforeDeparture": 0,
+                "milestone": false
+            }}
+        ],
+        "tips": [
+            "Timeline management tips"
+        ]
+    }}
+
+    Create 15-20 tasks covering:
+    - Visa application process
+    - Flight booking
+    - Accommodation arrangements
+    - Financial preparations (bank, insurance)
+    - Health requirements (vaccinations, health insurance)
+    - Document preparation
+    - Packing and shipping
+    - Saying goodbye
+    - Final preparations
+    - Departure day tasks
+
+    durationDays is the realistic time the task takes including waiting (use real visa processing times for {destination}).
+    dueDaysBeforeDeparture is how many days before departure the task must be finished (0 = by departure day).
+    Mark the 3-5 most important checkpoints as milestone: true.
+    """
+
+        response = await gemini_service.generate_response(prompt)
+        return self._validate_graph(parse_json_response(response))
+
+    def _validate_graph(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalize ids and numbers so the scheduler can trust the graph"""
+        tasks = []
+        seen = set()
+        for index, task in enumerate(data["tasks"]):
+            task_id = str(task.get("id") or index)
+            if task_id in seen:
+                task_id = f"{task_id}_{index}"
+            seen.add(task_id)
+            tasks.append({
+                "id": task_id,
+                "title": str(task["title"]),
+                "description": str(task.get("description", "")),
+                "priority": str(task.get("priority", "medium")).lower(),
+                "category": str(task.get("category", "general")),
+                "durationDays": max(0, int(task.get("durationDays", 1))),
+                "dependencies": [str(dep) for dep in task.get("dependencies", [])],
+                "dueDaysBeforeDeparture": max(0, int(task.get("dueDaysBeforeDeparture", 0))),
+                "milestone": bool(task.get("milestone", False))
+            })
+        if not tasks:
+            raise ValueError("Timeline task graph is empty")
+        return {"tasks": tasks, "tips": [str(tip) for tip in data.get("tips", [])]}
+
+
+timeline_service = TimelineService()
@@ -0,0 +1,198 @@
+from config import settings
+from services.cache_service import make_cache_key
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+import asyncio
+import math
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+
+NGRAM = 3
+
+
+def normalize(text: str) -> str:
+    """Exact-match form of a text: NFKC with whitespace collapsed.
+
+    Case is kept: "May" and "may" can translate differently.
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def char_ngrams(normalized: str) -> FrozenSet[str]:
+    """Case-folded character trigrams of a normalized text, padded so short texts still have some"""
+    padded = f" {normalized.casefold()} "
+    if len(padded) <= NGRAM:
+        return frozenset([padded])
+    return frozenset(padded[i:i + NGRAM] for i in range(len(padded) - NGRAM + 1))
+
+
+class TranslationMemory:
+    """Per language pair translation memory with exact and fuzzy lookup.
+
+    Exact hits are a dict lookup on the normalized text and can be served as
+    the translation. Fuzzy hits use an inverted trigram index with Jaccard
+    similarity (prefix filtering on the rarest query grams keeps candidate
+    sets small); they belong to a different sentence, so they are only
+    returned as reference examples for the model, never as a translation.
+    Entries live in memory and are persisted to SQLite in batches off the
+    event loop.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None,
+                 threshold: Optional[float] = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._loaded = False
+        # entry id -> (pair, normalized text, translation, grams), oldest first
+        self._entries: "OrderedDict[int, Tuple[str, str, str, FrozenSet[str]]]" = OrderedDict()
+        self._exact: Dict[Tuple[str, str], int] = {}
+        self._index: Dict[str, Dict[str, Set[int]]] = {}
+        self._next_id = 0
+        # Rows waiting to be written and the task writing them
+        self._pending: List[Tuple[str, str, str, float]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def load(self) -> None:
+        """Open the store and index every persisted entry"""
+        if self._loaded:
+            return
+        self.path = self.path or settings.translation_memory_path
+        self.max_entries = self.max_entries or settings.translation_memory_max_entries
+        self.threshold = self.threshold or settings.translation_memory_fuzzy_threshold
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # WAL with synchronous=NORMAL skips the fsync per commit
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS translation_memory (
+                    pair TEXT NOT NULL,
+                    normalized TEXT NOT NULL,
+                    translation TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (pair, normalized)
+                )"""
+            )
+            rows = self._conn.execute(
+                "SELECT pair, normalized, translation FROM translation_memory ORDER BY updated_at"
+            ).fetchall()
+        for pair, normalized, translation in rows:
+            self._insert(pair, normalized, translation)
+        self._loaded = True
+        print(f"[OK] Translation memory loaded {len(self._entries)} entries")
+
+    def lookup(self, text: str, source_language: str, target_language: str) -> Optional[str]:
+        """Return the stored translation of exactly this text, if any"""
+        self.load()
+        entry_id = self._exact.get((make_cache_key(source_language, target_language), normalize(text)))
+        if entry_id is None:
+            return None
+        self._entries.move_to_end(entry_id)
+        return self._entries[entry_id][2]
+
+    def similar(self, text: str, source_language: str, target_language: str,
+                limit: int = 3) -> List[Tuple[str, str, float]]:
+        """(source text, translation, similarity) of the closest other entries above the threshold"""
+        self.load()
+        return self._fuzzy(make_cache_key(source_language, target_language), normalize(text), limit)
+
+    def add(self, text: str, translation: str, source_language: str, target_language: str) -> None:
+        """Remember a translation; it is written to disk shortly after, off the event loop"""
+        self.load()
+        pair = make_cache_key(source_language, target_language)
+        normalized = normalize(text)
+        if not normalized:
+            return
+        self._insert(pair, normalized, translation)
+        self._pending.append((pair, normalized, translation, time.time()))
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(self._take_pending())
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self.flush())
+
+    async def flush(self) -> None:
+        """Write every pending row in one transaction"""
+        while self._pending:
+            await asyncio.to_thread(self._write, self._take_pending())
+
+    def _take_pending(self) -> List[Tuple[str, str, str, float]]:
+        rows, self._pending = self._pending, []
+        return rows
+
+    def _write(self, rows: List[Tuple[str, str, str, float]]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translation_memory (pair, normalized, translation, updated_at) VALUES (?, ?, ?, ?)",
+                rows
+            )
+
+    def _fuzzy(self, pair: str, normalized: str, limit: int) -> List[Tuple[str, str, float]]:
+        index = self._index.get(pair)
+        if not index:
+            return []
+        grams = char_ngrams(normalized)
+        # A match with Jaccard >= t shares at least ceil(t * |grams|) grams, so it
+        # must contain one of the (|grams| - that + 1) rarest ones
+        required = math.ceil(self.threshold * len(grams))
+        probes = sorted(grams, key=lambda gram: len(index.get(gram, ())))[:len(grams) - required + 1]
+        candidates: Set[int] = set()
+        for gram in probes:
+            candidates.update(index.get(gram, ()))
+
+        matches = []
+        for entry_id in candidates:
+            _, entry_text, translation, entry_grams = self._entries[entry_id]
+            if entry_text == normalized:
+                continue
+            if not self.threshold * len(grams) <= len(entry_grams) <= len(grams) / self.threshold:
+                continue
+            shared = len(grams & entry_grams)
+            score = shared / (len(grams) + len(entry_grams) - shared)
+            if score >= self.threshold:
+                matches.append((entry_text, translation, score))
+        matches.sort(key=lambda match: match[2], reverse=True)
+        return matches[:limit]
+
+    def _insert(self, pair: str, normalized: str, translation: str) -> None:
+        existing = self._exact.get((pair, normalized))
+        if existing is not None:
+            self._remove(existing)
+        entry_id = self._next_id
+        self._next_id += 1
+        grams = char_ngrams(normalized)
+        self._entries[entry_id] = (pair, normalized, translation, grams)
+        self._exact[(pair, normalized)] = entry_id
+        index = self._index.setdefault(pair, {})
+        for gram in grams:
+            index.setdefault(gram, set()).add(entry_id)
+        while len(self._entries) > self.max_entries:
+            # Least recently used entries leave the in-memory index but stay on disk
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, entry_id: int) -> None:
+        pair, normalized, _, grams = self._entries.pop(entry_id)
+        del self._exact[(pair, normalized)]
+        index = self._index[pair]
+        for gram in grams:
+            postings = index.get(gram)
+            if postings is not None:
+                postings.discard(entry_id)
+                if not postings:
+                    del index[gram]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+translation_memory = TranslationMemory()
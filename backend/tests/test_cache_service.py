@@ -0,0 +1,101 @@
+import asyncio
+import time
+
+import pytest
+
+from services.cache_service import (
+    StaleWhileRevalidateCache, TTLCache, make_cache_key, merge_items, parse_json_response, stay_length_bucket
+)
+
+
+def test_get_or_create_runs_factory_once_for_concurrent_callers():
+    cache = TTLCache("test", ttl_seconds=60)
+    calls = []
+
+    async def factory():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"value": 1}
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_create("key", factory) for _ in range(10)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert results == [{"value": 1}] * 10
+
+
+def test_get_or_create_does_not_cache_failures():
+    cache = TTLCache("test", ttl_seconds=60)
+
+    async def failing():
+        raise ValueError("model down")
+
+    async def working():
+        return {"value": 2}
+
+    async def main():
+        with pytest.raises(ValueError):
+            await cache.get_or_create("key", failing)
+        return await cache.get_or_create("key", working)
+
+    assert asyncio.run(main()) == {"value": 2}
+
+
+def test_returned_values_are_copies():
+    cache = TTLCache("test", ttl_seconds=60)
+    cache.set("key", {"items": [1]})
+    cache.get("key")["items"].append(2)
+    assert cache.get("key") == {"items": [1]}
+
+
+def test_stale_entry_is_served_and_refreshed_once():
+    cache = StaleWhileRevalidateCache("test", ttl_seconds=10, max_stale_seconds=100)
+    cache.set("key", {"version": 1}, stored_at=time.time() - 20)
+    calls = []
+
+    async def factory():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"version": 2}
+
+    async def main():
+        served = await asyncio.gather(*(cache.get_or_revalidate("key", factory) for _ in range(5)))
+        await asyncio.sleep(0.05)
+        return served, await cache.get_or_revalidate("key", factory)
+
+    served, refreshed = asyncio.run(main())
+    assert served == [{"version": 1}] * 5
+    assert refreshed == {"version": 2}
+    assert len(calls) == 1
+
+
+def test_entries_past_max_stale_are_misses():
+    cache = StaleWhileRevalidateCache("test", ttl_seconds=10, max_stale_seconds=10)
+    cache.set("key", {"version": 1}, stored_at=time.time() - 30)
+
+    async def factory():
+        return {"version": 2}
+
+    assert asyncio.run(cache.get_or_revalidate("key", factory)) == {"version": 2}
+
+
+def test_make_cache_key_normalizes_case_and_whitespace():
+    assert make_cache_key(" New  York ", "Work", None) == make_cache_key("new york", "work", None)
+
+
+def test_parse_json_response_strips_code_fences():
+    assert parse_json_response('```json\n{"a": 1}\n```') == {"a": 1}
+    assert parse_json_response('```\n{"a": 1}\n```') == {"a": 1}
+    assert parse_json_response('{"a": 1}') == {"a": 1}
+
+
+def test_merge_items_skips_case_insensitive_duplicates():
+    assert merge_items(["Passport", "Photos"], ["passport ", "Visa"]) == ["Passport", "Photos", "Visa"]
+
+
+def test_stay_length_bucket():
+    assert stay_length_bucket(7) == "up to 2 weeks"
+    assert stay_length_bucket(30) == stay_length_bucket(90) == "2 weeks to 3 months"
+    assert stay_length_bucket(200) == "3 to 12 months"
+    assert stay_length_bucket(400) == "more than a year"
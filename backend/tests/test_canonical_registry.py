@@ -0,0 +1,19 @@
+from services.canonical_registry import canonical_registry
+
+
+def test_countries_and_languages_resolve_aliases_and_typos():
+    assert canonical_registry.country("usa") == "United States"
+    assert canonical_registry.country("Germnay") == "Germany"
+    assert canonical_registry.language("español") == "Spanish"
+
+
+def test_currency_from_code_name_or_exact_country():
+    assert canonical_registry.currency("usd") == "USD"
+    assert canonical_registry.currency("Swiss franc") == "CHF"
+    assert canonical_registry.currency("France") == "EUR"
+    assert canonical_registry.currency("japan") == "JPY"
+
+
+def test_currency_does_not_fuzzy_match_countries():
+    assert canonical_registry.currency("franc") == "FRANC"
+    assert canonical_registry.currency("Frnace") == "FRNACE"
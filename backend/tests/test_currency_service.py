@@ -0,0 +1,75 @@
+import asyncio
+import time
+
+import pytest
+
+import services.currency_service as currency_module
+from services.cache_service import make_cache_key, stay_length_bucket
+from services.currency_service import CurrencyService
+
+ADVICE = {
+    "cash_vs_card_advice": "Cards are widely accepted.",
+    "atm_availability": "ATMs are common.",
+    "exchange_tips": "Use bank ATMs.",
+    "local_money_habits": "Tipping is not expected.",
+    "estimated_daily_budget": "About $100/day"
+}
+
+
+class SlowRatesApi:
+
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+
+    def get(self, url, timeout):
+        self.calls += 1
+        time.sleep(0.3)
+        if self.fail:
+            raise ConnectionError("rates API down")
+        return self
+
+    def json(self):
+        return {"rates": {"USD": 1.0, "JPY": 150.0}}
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = CurrencyService()
+    monkeypatch.setattr(service, "_record_history", lambda base, rates: None)
+    service._advice_cache.set(make_cache_key("Japan", stay_length_bucket(10)), ADVICE)
+    return service
+
+
+def test_cached_money_advice_does_not_wait_for_rates(monkeypatch, service):
+    api = SlowRatesApi()
+    monkeypatch.setattr(currency_module, "requests", api)
+
+    async def main():
+        started = time.perf_counter()
+        first = await service.get_money_advice("Japan", 10)
+        elapsed = time.perf_counter() - started
+        await asyncio.sleep(0.4)
+        second = await service.get_money_advice("Japan", 10)
+        return first, elapsed, second
+
+    first, elapsed, second = asyncio.run(main())
+    assert elapsed < 0.1
+    assert first.cash_vs_card_advice == ADVICE["cash_vs_card_advice"]
+    assert "JPY" not in first.estimated_daily_budget
+    assert "JPY" in second.estimated_daily_budget
+    assert api.calls == 1
+
+
+def test_failed_rate_fetches_fail_fast_for_a_while(monkeypatch, service):
+    api = SlowRatesApi(fail=True)
+    monkeypatch.setattr(currency_module, "requests", api)
+
+    async def main():
+        for _ in range(3):
+            with pytest.raises(Exception):
+                await service.get_rates("USD")
+        await service.get_money_advice("Japan", 10)
+
+    asyncio.run(main())
+    assert api.calls == 1
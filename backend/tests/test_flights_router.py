@@ -0,0 +1,51 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers import flights
+from services.flight_service import flight_service
+
+TIPS = {"tips": [{"title": "Book early", "description": "Prices rise closer to departure", "savings": "10%"}]}
+
+
+def _client(monkeypatch):
+    async def get_booking_tips(destination, travel_type="relocation"):
+        return dict(TIPS, destination=destination)
+
+    monkeypatch.setattr(flight_service, "get_booking_tips", get_booking_tips)
+    app = FastAPI()
+    app.include_router(flights.router)
+    return TestClient(app)
+
+
+def test_get_coupons_revalidates_with_etag(monkeypatch):
+    with _client(monkeypatch) as client:
+        response = client.get("/api/flights/coupons", params={"destination": "Japan"})
+        assert response.status_code == 200
+        assert response.json()["data"]["coupons"]
+        etag = response.headers["etag"]
+        assert "max-age" in response.headers["cache-control"]
+
+        cached = client.get("/api/flights/coupons", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+
+
+def test_get_booking_tips_revalidates_with_etag(monkeypatch):
+    with _client(monkeypatch) as client:
+        response = client.get("/api/flights/booking-tips", params={"destination": "japan"})
+        assert response.status_code == 200
+        assert response.json()["data"]["destination"] == "Japan"
+        etag = response.headers["etag"]
+        cached = client.get(
+            "/api/flights/booking-tips", params={"destination": "japan"}, headers={"If-None-Match": etag}
+        )
+        assert cached.status_code == 304
+
+
+def test_post_routes_have_no_conditional_caching(monkeypatch):
+    with _client(monkeypatch) as client:
+        coupons = client.post("/api/flights/coupons", json={"destination": "Japan"})
+        tips = client.post("/api/flights/booking-tips", json={"destination": "Japan"}, headers={"If-None-Match": "*"})
+        for response in (coupons, tips):
+            assert response.status_code == 200
+            assert "etag" not in response.headers
+            assert response.json()["data"]
@@ -0,0 +1,58 @@
+from datetime import date
+
+from services.holiday_service import easter_sunday, holiday_service, japanese_equinox, nth_weekday
+
+
+def test_easter_sunday():
+    assert easter_sunday(2024) == date(2024, 3, 31)
+    assert easter_sunday(2025) == date(2025, 4, 20)
+    assert easter_sunday(2027) == date(2027, 3, 28)
+
+
+def test_nth_weekday():
+    # Thanksgiving: fourth Thursday of November; Memorial Day: last Monday of May
+    assert nth_weekday(2027, 11, 3, 4) == date(2027, 11, 25)
+    assert nth_weekday(2027, 5, 0, -1) == date(2027, 5, 31)
+
+
+def test_japanese_equinox():
+    assert japanese_equinox(2025, "spring") == date(2025, 3, 20)
+    assert japanese_equinox(2025, "autumn") == date(2025, 9, 23)
+
+
+def test_us_weekend_holidays_are_observed_on_the_nearest_weekday():
+    holidays = {holiday["name"]: holiday["date"] for holiday in holiday_service.holidays_for_year("United States", 2027)}
+    assert holidays["Independence Day (observed)"] == "2027-07-05"
+    assert holidays["Christmas Day (observed)"] == "2027-12-24"
+    assert holidays["Thanksgiving Day"] == "2027-11-25"
+
+
+def test_uk_substitute_days_do_not_collide():
+    holidays = {holiday["name"]: holiday["date"] for holiday in holiday_service.holidays_for_year("United Kingdom", 2027)}
+    assert holidays["Good Friday"] == "2027-03-26"
+    assert holidays["Christmas Day (observed)"] == "2027-12-27"
+    assert holidays["Boxing Day (observed)"] == "2027-12-28"
+
+
+def test_holidays_between_spans_years_and_country_aliases():
+    assert holiday_service.supports("USA")
+    assert not holiday_service.supports("Atlantis")
+    holidays = holiday_service.holidays_between("USA", date(2026, 12, 20), date(2027, 1, 5))
+    assert [holiday["date"] for holiday in holidays] == ["2026-12-25", "2027-01-01"]
+
+
+def test_st_brigids_day_is_february_first_only_on_a_friday():
+    def brigid(year):
+        return [h["date"] for h in holiday_service.holidays_for_year("Ireland", year) if h["name"] == "St Brigid's Day"]
+
+    assert brigid(2030) == ["2030-02-01"]
+    assert brigid(2026) == ["2026-02-02"]
+    assert brigid(2027) == ["2027-02-01"]
+
+
+def test_new_years_day_observed_in_the_previous_year():
+    holidays = holiday_service.holidays_between("USA", date(2021, 12, 1), date(2021, 12, 31))
+    assert ("New Year's Day (observed)", "2021-12-31") in [(h["name"], h["date"]) for h in holidays]
+    assert [h["name"] for h in holiday_service.holidays_for_year("USA", 2022)][:2] == [
+        "New Year's Day", "Martin Luther King Jr. Day"
+    ]
@@ -0,0 +1,41 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers import calendar
+from services.calendar_service import calendar_service
+from services.ics_export import escape_text, fold_line
+
+
+def test_escape_text():
+    assert escape_text("a,b;c\\d\ne") == r"a\,b\;c\\d\ne"
+
+
+def test_fold_line_limits_octets_without_splitting_characters():
+    line = "SUMMARY:" + "ü" * 100
+    folded = fold_line(line)
+    parts = folded[:-2].split("\r\n ")
+    assert all(len(part.encode("utf-8")) <= 75 for part in parts)
+    assert "".join(parts) == line
+    assert fold_line("SHORT:line") == "SHORT:line\r\n"
+
+
+def test_export_sends_etag_and_honours_if_none_match():
+    app = FastAPI()
+    app.include_router(calendar.router)
+    events_id = calendar_service.save("events", {
+        "holidays": [{"name": "New Year's Day", "date": "2027-01-01", "impact": "Offices closed"}]
+    })
+
+    with TestClient(app) as client:
+        response = client.get("/api/calendar/export.ics", params={"eventsId": events_id})
+        assert response.status_code == 200
+        assert "BEGIN:VEVENT" in response.text
+        assert "DTSTART;VALUE=DATE:20270101" in response.text
+        etag = response.headers["etag"]
+
+        cached = client.get("/api/calendar/export.ics", params={"eventsId": events_id}, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag
+
+        missing = client.get("/api/calendar/export.ics", params={"eventsId": "unknown"})
+        assert missing.status_code == 404
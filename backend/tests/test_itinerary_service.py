@@ -0,0 +1,45 @@
+import asyncio
+
+from services.itinerary_service import ItineraryService, itinerary_service
+
+
+def test_template_key_separates_same_named_cities():
+    france = itinerary_service._template_key("France", "Paris", 3, "relaxed", ["food", "Art"])
+    texas = itinerary_service._template_key("United States", "Paris", 3, "relaxed", ["food", "Art"])
+    assert france != texas
+    assert france == itinerary_service._template_key("france", "paris", 3, "Relaxed", ["art", "food"])
+
+
+def _day(day_number, location, cost):
+    activity = {"time": "10:00", "task": "Visit", "location": location, "rating": 4.5, "description": ""}
+    return {"day_number": day_number, "activities": [activity], "estimated_cost": cost, "tips": []}
+
+
+def test_concurrent_day_regenerations_keep_both_changes(monkeypatch):
+    service = ItineraryService()
+    params = {
+        "destination_country": "France", "city": "Paris", "duration_days": 2, "total_budget": 1000.0,
+        "travel_style": "relaxed", "interests": ["art"]
+    }
+    itinerary_id = service._save(params, {
+        "daily_plans": [_day(1, "Louvre", 100.0), _day(2, "Orsay", 100.0)],
+        "budget_breakdown": {"accommodation": 500, "food": 100, "transport": 50, "attractions": 50, "buffer": 100},
+        "total_estimated_cost": 800.0,
+        "cost_justification": "",
+        "money_saving_tips": []
+    })
+
+    async def generate_shard(context, city, day_numbers, exclude, semaphore, extra=""):
+        await asyncio.sleep(0.01)
+        return [_day(day_numbers[0], f"New place {day_numbers[0]}", 150.0)]
+
+    monkeypatch.setattr(service, "_generate_shard", generate_shard)
+
+    async def main():
+        await asyncio.gather(service.regenerate_day(itinerary_id, 1), service.regenerate_day(itinerary_id, 2))
+
+    asyncio.run(main())
+    itinerary = service.get_itinerary(itinerary_id)
+    assert [day.activities[0].location for day in itinerary.daily_plans] == ["New place 1", "New place 2"]
+    assert itinerary.total_estimated_cost == 900.0
+    assert service._locks == {}
@@ -0,0 +1,20 @@
+import asyncio
+
+from services.job_service import DONE, RUNNING, Job
+
+
+def test_wait_for_change_does_not_miss_updates_between_waits():
+    async def main():
+        job = Job("plan", {}, "key")
+        version = job.version
+        # The update lands before the waiter starts waiting
+        job.update(RUNNING)
+        missed = await job.wait_for_change(version, timeout=0.01)
+
+        version = job.version
+        asyncio.get_running_loop().call_later(0.01, job.update, DONE, {"plan": 1})
+        woken = await job.wait_for_change(version, timeout=1)
+        timed_out = await job.wait_for_change(job.version, timeout=0.01)
+        return missed, woken, timed_out, job.finished
+
+    assert asyncio.run(main()) == (True, True, False, True)
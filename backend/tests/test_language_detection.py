@@ -0,0 +1,46 @@
+from services.language_detection import is_passthrough, language_detector
+
+
+def test_latin_languages():
+    assert language_detector.detect("Where is the train station?")[0] == "English"
+    assert language_detector.detect("¿Dónde está la estación de tren?")[0] == "Spanish"
+    assert language_detector.detect("Wo ist der Bahnhof, bitte?")[0] == "German"
+    assert language_detector.detect("Où est la gare, s'il vous plaît ?")[0] == "French"
+
+
+def test_short_text_has_low_confidence():
+    assert language_detector.detect("Hello")[1] < 0.98
+
+
+def test_scripts():
+    assert language_detector.detect("こんにちは") == ("Japanese", 1.0)
+    assert language_detector.detect("안녕하세요") == ("Korean", 1.0)
+    assert language_detector.detect("Я їду до Києва") == ("Ukrainian", 1.0)
+    assert language_detector.detect("Привет") == ("Russian", 0.6)
+    assert language_detector.detect("12345") is None
+
+
+def test_shared_marker_letters_are_only_a_guess():
+    # Kazakh "і", Mongolian "ы" and Persian letters also used in Pashto
+    assert language_detector.detect("Бүгін ауа райы жылы") == ("Ukrainian", 0.6)
+    assert language_detector.detect("Галт тэрэгний буудал хаана байдаг вэ?") == ("Russian", 0.6)
+    assert language_detector.detect("پیسې چیرته دي") == ("Pashto", 1.0)
+    assert language_detector.detect("ایستگاه قطار کجاست؟") == ("Persian (Farsi)", 0.6)
+    assert language_detector.detect("Пойыз вокзалы қайда?") == ("Kazakh", 1.0)
+
+
+def test_languages_with_unseeded_relatives_are_not_distinguished():
+    # Norwegian scores as Swedish and Malay as Indonesian
+    assert language_detector.detect("Jeg vil gjerne ha en billett til flyplassen")[0] == "Swedish"
+    assert language_detector.detect("Saya mahu tiket ke lapangan terbang")[0] == "Indonesian"
+    for language in ("Swedish", "Indonesian", "Polish", "Spanish", "Dutch", "Finnish"):
+        assert not language_detector.distinguishes(language)
+    assert language_detector.distinguishes("English")
+    assert language_detector.distinguishes("Japanese")
+
+
+def test_passthrough():
+    assert is_passthrough("42 €")
+    assert is_passthrough("https://example.com/visa?id=1")
+    assert is_passthrough("(me@example.com)")
+    assert not is_passthrough("Email me@example.com")
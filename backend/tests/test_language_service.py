@@ -0,0 +1,119 @@
+import asyncio
+import json
+
+import pytest
+
+import services.language_service as language_module
+from services.gemini_service import gemini_service
+from services.language_service import LanguageService, estimate_tokens, pack_batches
+from services.translation_memory import TranslationMemory
+
+
+@pytest.fixture
+def memory(tmp_path, monkeypatch):
+    memory = TranslationMemory(str(tmp_path / "memory.db"), max_entries=1000, threshold=0.6)
+    monkeypatch.setattr(language_module, "translation_memory", memory)
+    return memory
+
+
+@pytest.fixture
+def model(monkeypatch):
+    """Fake Gemini: records single and packed calls; ``drop`` ids are left out of packed answers"""
+    calls = {"single": [], "packed": [], "drop": set(), "fail_packed": False}
+
+    async def translate_text(text, source_lang, target_lang, examples=None):
+        calls["single"].append((text, examples))
+        await asyncio.sleep(0.02)
+        return f"ES {text}"
+
+    async def generate_response(prompt, *args, **kwargs):
+        items = json.loads(prompt.rsplit("\n", 1)[1])
+        calls["packed"].append(items)
+        await asyncio.sleep(0.02)
+        if calls["fail_packed"]:
+            return "Error generating response: quota exceeded"
+        return json.dumps({key: f"ES {text}" for key, text in items.items() if key not in calls["drop"]})
+
+    monkeypatch.setattr(gemini_service, "translate_text", translate_text)
+    monkeypatch.setattr(gemini_service, "generate_response", generate_response)
+    return calls
+
+
+def test_pack_batches_respects_token_and_item_limits():
+    texts = [f"sentence number {i}" for i in range(10)]
+    batches = pack_batches(texts, max_tokens=estimate_tokens(texts[0]) * 3, max_items=50)
+    assert [len(batch) for batch in batches] == [3, 3, 3, 1]
+    assert [text for batch in batches for text in batch] == texts
+    assert [len(batch) for batch in pack_batches(texts, max_tokens=10_000, max_items=4)] == [4, 4, 2]
+
+
+def test_batch_retries_only_dropped_ids(memory, model):
+    model["drop"] = {"t1"}
+    texts = ["Good morning", "Where is the pharmacy?", "Thank you very much"]
+    responses = asyncio.run(LanguageService().translate_batch(texts, "English", "Spanish"))
+    assert [response.translated_text for response in responses] == [f"ES {text}" for text in texts]
+    assert [text for text, _ in model["single"]] == ["Where is the pharmacy?"]
+
+
+def test_batch_fails_instead_of_fanning_out_when_the_pack_fails(memory, model):
+    model["fail_packed"] = True
+    texts = ["Good morning", "Where is the pharmacy?", "Thank you very much"]
+    with pytest.raises(ValueError):
+        asyncio.run(LanguageService().translate_batch(texts, "English", "Spanish"))
+    assert model["single"] == []
+
+
+def test_lone_request_is_sent_at_once_and_concurrent_ones_are_batched(memory, model):
+    service = LanguageService()
+
+    async def main():
+        first = asyncio.create_task(service.translate_text("Where can I buy a bus ticket?", "English", "Spanish"))
+        await asyncio.sleep(0)
+        rest = await asyncio.gather(*(
+            service.translate_text(f"Please bring suitcase number {i}", "English", "Spanish") for i in range(20)
+        ))
+        return await first, rest
+
+    first, rest = asyncio.run(main())
+    assert first.translated_text == "ES Where can I buy a bus ticket?"
+    assert [response.translated_text for response in rest] == [f"ES Please bring suitcase number {i}" for i in range(20)]
+    assert len(model["single"]) == 1
+    assert len(model["packed"]) == 1
+
+
+@pytest.mark.parametrize("remembered, text", [
+    ("I need 3 tickets", "I need 2 tickets"),
+    ("The museum is open on Monday", "The museum is not open on Monday"),
+])
+def test_fuzzy_memory_hits_are_examples_not_answers(memory, model, remembered, text):
+    memory.add(remembered, f"remembered translation of {remembered}", "English", "Spanish")
+    response = asyncio.run(LanguageService().translate_text(text, "English", "Spanish"))
+    assert response.translated_text == f"ES {text}"
+    assert model["single"] == [(text, [(remembered, f"remembered translation of {remembered}")])]
+
+
+def test_exact_memory_hits_skip_the_model(memory, model):
+    memory.add("I need 3 tickets", "Necesito 3 boletos", "English", "Spanish")
+    response = asyncio.run(LanguageService().translate_text("I need 3 tickets", "English", "Spanish"))
+    assert response.translated_text == "Necesito 3 boletos"
+    assert model["single"] == [] and model["packed"] == []
+
+
+def test_passthrough_and_target_language_text_skip_the_model(memory, model):
+    service = LanguageService()
+    assert asyncio.run(service.translate_text("https://example.com", "English", "Spanish")).translated_text == "https://example.com"
+    assert asyncio.run(service.translate_text("Where is the train station?", "auto", "English")).translated_text == "Where is the train station?"
+    assert model["single"] == [] and model["packed"] == []
+
+
+@pytest.mark.parametrize("text,target", [
+    ("Jeg vil gjerne ha en billett til flyplassen", "Swedish"),
+    ("Saya mahu tiket ke lapangan terbang", "Indonesian"),
+    ("Chtěl bych jízdenku na letiště a potřebuji lékaře", "Polish"),
+    ("Бүгін ауа райы жылы", "Ukrainian"),
+])
+def test_text_in_a_close_relative_of_the_target_is_translated(memory, model, text, target):
+    response = asyncio.run(LanguageService().translate_text(text, "auto", target))
+    assert response.translated_text == f"ES {text}"
+    assert response.source_language == "auto"
+    assert [call[0] for call in model["single"]] == [text]
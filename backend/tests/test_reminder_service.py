@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+from services.reminder_service import CANCELLED, PENDING, SENT, ReminderService, ReminderStore
+
+
+class RecordingSink:
+
+    def __init__(self):
+        self.delivered = []
+
+    async def deliver(self, reminder):
+        self.delivered.append(reminder["task_id"])
+
+
+def test_due_reminders_fire_in_order_and_cancelled_ones_do_not(tmp_path):
+    sink = RecordingSink()
+
+    async def main():
+        service = ReminderService(ReminderStore(str(tmp_path / "reminders.db")), sink)
+        now = time.time()
+        later = await service.schedule("later", now + 0.1)
+        await service.schedule("first", now - 1)
+        cancelled = await service.schedule("cancelled", now + 0.05)
+        assert await service.cancel(cancelled["id"])
+        await asyncio.sleep(0.3)
+        status = (await service.get(later["id"]))["status"], (await service.get(cancelled["id"]))["status"]
+        await service.stop()
+        return status
+
+    assert asyncio.run(main()) == (SENT, CANCELLED)
+    assert sink.delivered == ["first", "later"]
+
+
+def test_pending_reminders_are_recovered_after_restart(tmp_path):
+    path = str(tmp_path / "reminders.db")
+
+    async def schedule():
+        service = ReminderService(ReminderStore(path), RecordingSink())
+        far = time.time() + 3600
+        reminders = await service.schedule_many([{"task_id": f"task-{i}", "fire_at": far + i} for i in range(5)])
+        await service.cancel(reminders[0]["id"])
+        await service.stop()
+        return reminders
+
+    async def restart(reminder_id):
+        service = ReminderService(ReminderStore(path), RecordingSink())
+        await service.start()
+        count, status = service.pending_count(), (await service.get(reminder_id))["status"]
+        await service.stop()
+        return count, status
+
+    reminders = asyncio.run(schedule())
+    assert asyncio.run(restart(reminders[1]["id"])) == (4, PENDING)
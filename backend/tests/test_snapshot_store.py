@@ -0,0 +1,46 @@
+import asyncio
+
+from services.cache_service import StaleWhileRevalidateCache
+from services.snapshot_store import MAGIC, SnapshotStore, snapshot_store, write_snapshot
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    entries = [("guide:japan", {"country": "Japan", "tips": ["Bow"]}), ("guide:peru", {"country": "Perú"})]
+    assert write_snapshot(path, entries, content_version="v1") == 2
+
+    with open(path, "rb") as f:
+        assert f.read(len(MAGIC)) == MAGIC
+
+    store = SnapshotStore()
+    assert store.load(path)
+    assert store.content_version == "v1"
+    assert len(store) == 2
+    assert store.get("guide:japan") == {"country": "Japan", "tips": ["Bow"]}
+    assert store.get("guide:peru") == {"country": "Perú"}
+    assert store.get("guide:missing") is None
+    store.close()
+
+
+def test_invalid_file_is_not_loaded(tmp_path):
+    path = tmp_path / "snapshot.bin"
+    path.write_bytes(b"not a snapshot")
+    store = SnapshotStore()
+    assert not store.load(str(path))
+    assert not store.loaded
+    assert not store.load(str(tmp_path / "missing.bin"))
+
+
+def test_cache_miss_is_seeded_from_snapshot(tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    write_snapshot(path, [("guides:japan", {"country": "Japan"})])
+    cache = StaleWhileRevalidateCache("guides", ttl_seconds=60, max_stale_seconds=60)
+
+    async def factory():
+        raise AssertionError("the snapshot record should be used")
+
+    assert snapshot_store.load(path)
+    try:
+        assert asyncio.run(cache.get_or_revalidate("japan", factory)) == {"country": "Japan"}
+    finally:
+        snapshot_store.close()
@@ -0,0 +1,59 @@
+from datetime import date, timedelta
+
+from services.timeline_service import schedule_timeline, topological_order
+
+
+def _task(task_id, duration, dependencies=(), due=0):
+    return {
+        "id": task_id, "title": task_id, "description": "", "priority": "high", "category": "visa",
+        "durationDays": duration, "dependencies": list(dependencies), "dueDaysBeforeDeparture": due,
+        "milestone": False
+    }
+
+
+def test_topological_order_puts_dependencies_first():
+    tasks = [_task("flight", 1, ["visa"]), _task("visa", 30, ["documents"]), _task("documents", 10)]
+    order, cyclic = topological_order(tasks)
+    assert order == ["documents", "visa", "flight"]
+    assert cyclic == []
+
+
+def test_topological_order_keeps_cyclic_tasks():
+    tasks = [_task("a", 1, ["b"]), _task("b", 1, ["a"]), _task("c", 1)]
+    order, cyclic = topological_order(tasks)
+    assert order == ["c", "a", "b"]
+    assert cyclic == ["a", "b"]
+
+
+def test_critical_path_and_slack():
+    today = date(2027, 1, 1)
+    graph = {"tasks": [
+        _task("documents", 10),
+        _task("visa", 30, ["documents"]),
+        _task("finance", 5),
+        _task("departure", 0, ["visa", "finance"]),
+    ]}
+    timeline = schedule_timeline(graph, today + timedelta(days=50), today)
+    tasks = {task["id"]: task for task in timeline["tasks"]}
+
+    assert timeline["criticalPath"] == ["documents", "visa", "departure"]
+    assert tasks["documents"]["slackDays"] == 10
+    assert tasks["finance"]["slackDays"] == 45
+    assert tasks["visa"]["dueDate"] == "2027-02-20"
+    assert timeline["warnings"] == []
+
+
+def test_infeasible_departure_warns():
+    today = date(2027, 1, 1)
+    graph = {"tasks": [_task("documents", 10), _task("visa", 30, ["documents"])]}
+    timeline = schedule_timeline(graph, today + timedelta(days=20), today)
+    assert timeline["tasks"][0]["late"]
+    assert "20 more day(s)" in timeline["warnings"][0]
+
+
+def test_flexible_departure_uses_earliest_finish():
+    today = date(2027, 1, 1)
+    graph = {"tasks": [_task("documents", 10), _task("visa", 30, ["documents"], due=7)]}
+    timeline = schedule_timeline(graph, None, today)
+    assert timeline["flexibleDeparture"]
+    assert timeline["departureDate"] == "2027-02-17"
@@ -0,0 +1,47 @@
+import asyncio
+
+from services.translation_memory import TranslationMemory, normalize
+
+
+def _memory(tmp_path, threshold=0.6):
+    return TranslationMemory(str(tmp_path / "memory.db"), max_entries=1000, threshold=threshold)
+
+
+def test_exact_lookup_ignores_whitespace_but_keeps_case(tmp_path):
+    memory = _memory(tmp_path)
+    memory.add("May", "Mayo", "English", "Spanish")
+    memory.add("may", "puede", "English", "Spanish")
+    assert memory.lookup("  May ", "english", "spanish") == "Mayo"
+    assert memory.lookup("may", "English", "Spanish") == "puede"
+    assert memory.lookup("May", "English", "French") is None
+    assert normalize("Où  est") == "Où est"
+
+
+def test_fuzzy_matches_are_never_exact_hits(tmp_path):
+    memory = _memory(tmp_path)
+    memory.add("I need 3 tickets", "Necesito 3 boletos", "English", "Spanish")
+    memory.add("The museum is open on Monday", "El museo abre el lunes", "English", "Spanish")
+
+    assert memory.lookup("I need 2 tickets", "English", "Spanish") is None
+    assert memory.lookup("The museum is not open on Monday", "English", "Spanish") is None
+    similar = memory.similar("I need 2 tickets", "English", "Spanish")
+    assert [(source, translation) for source, translation, _ in similar] == [("I need 3 tickets", "Necesito 3 boletos")]
+
+
+def test_similar_respects_threshold_and_skips_the_text_itself(tmp_path):
+    memory = _memory(tmp_path, threshold=0.9)
+    memory.add("I need 3 tickets", "Necesito 3 boletos", "English", "Spanish")
+    assert memory.similar("I need 2 tickets", "English", "Spanish") == []
+    assert memory.similar("I need 3 tickets", "English", "Spanish") == []
+
+
+def test_writes_are_flushed_off_the_loop_and_reloaded(tmp_path):
+    async def main():
+        memory = _memory(tmp_path)
+        memory.add("Good morning", "Buenos días", "English", "Spanish")
+        await memory.flush()
+
+    asyncio.run(main())
+    reloaded = _memory(tmp_path)
+    assert reloaded.lookup("Good morning", "English", "Spanish") == "Buenos días"
+    assert len(reloaded) == 1
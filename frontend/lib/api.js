@@ -207,12 +207,12 @@ export const getFlightDeals = async (params) => {
 };
 
 export const getFlightCoupons = async (params) => {
-    const response = await api.post('/api/flights/coupons', params);
+    const response = await api.get('/api/flights/coupons', { params });
     return response;
 };
 
 export const getBookingTips = async (params) => {
-    const response = await api.post('/api/flights/booking-tips', params);
+    const response = await api.get('/api/flights/booking-tips', { params });
     return response;
 };
 